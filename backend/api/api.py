@@ -3,15 +3,23 @@ import os
 import time
 from typing import Tuple
 from dotenv import load_dotenv
-from flask import Flask, Response, jsonify, request, make_response
-from flask_cors import CORS
+from flask import Flask, Response, jsonify
 import sqlalchemy
-from models import db
+from models import db, BoardTask, TaskLabel, TaskSearchTerm
 from auth_routes import auth_bp
 from user_routes import user_bp
 from routes import api_bp
 from board_routes import board_bp
-from sqlalchemy import text
+from profiling import profiling_bp, init_profiling
+from deletion_jobs import deletion_bp, init_deletion_worker
+from auth_tokens import init_token_revocation
+from compression import init_compression
+from cors import init_cors
+from password_hashing import init_password_hashing
+from rate_limit import init_auth_rate_limits
+from task_labels import backfill_labels
+from task_search import rebuild_index
+from sqlalchemy import select, text
 
 load_dotenv()
 app = Flask(__name__)
@@ -75,6 +83,132 @@ with app.app_context():
         db.session.commit()
     except sqlalchemy.exc.SQLAlchemyError:
         db.session.rollback()
+    # board version counter for caches of derived board data
+    try:
+        db.session.execute(text("ALTER TABLE boards ADD COLUMN version INT NOT NULL DEFAULT 0"))
+        db.session.commit()
+    except sqlalchemy.exc.SQLAlchemyError:
+        db.session.rollback()
+    try:
+        db.session.execute(text("ALTER TABLE boards ADD COLUMN vocabulary_version INT NOT NULL DEFAULT 0"))
+        db.session.commit()
+    except sqlalchemy.exc.SQLAlchemyError:
+        db.session.rollback()
+    # soft-delete markers for the background deletion pipeline
+    try:
+        db.session.execute(text("ALTER TABLE boards ADD COLUMN deleted_at DATETIME NULL"))
+        db.session.commit()
+    except sqlalchemy.exc.SQLAlchemyError:
+        db.session.rollback()
+    try:
+        db.session.execute(text("ALTER TABLE users ADD COLUMN deleted_at DATETIME NULL"))
+        db.session.commit()
+    except sqlalchemy.exc.SQLAlchemyError:
+        db.session.rollback()
+    # revocation syncs scan a trailing window of revoked_at
+    try:
+        db.session.execute(text("CREATE INDEX ix_token_revocations_revoked_at ON token_revocations (revoked_at)"))
+        db.session.commit()
+    except sqlalchemy.exc.SQLAlchemyError:
+        db.session.rollback()
+    # tasks reference their status column by id; must run before anything loads BoardTask rows
+    try:
+        db.session.execute(text("ALTER TABLE board_tasks ADD COLUMN status_id INT NULL"))
+        db.session.commit()
+    except sqlalchemy.exc.SQLAlchemyError:
+        db.session.rollback()
+    try:
+        db.session.execute(text("ALTER TABLE board_tasks ADD CONSTRAINT fk_task_status FOREIGN KEY (status_id) REFERENCES board_statuses(id) ON DELETE SET NULL"))
+        db.session.commit()
+    except sqlalchemy.exc.SQLAlchemyError:
+        db.session.rollback()
+    try:
+        db.session.execute(text("CREATE INDEX idx_board_tasks_board_status_id_position ON board_tasks (board_id, status_id, position)"))
+        db.session.commit()
+    except sqlalchemy.exc.SQLAlchemyError:
+        db.session.rollback()
+    # the legacy status name column is no longer mapped: new rows must leave it NULL (this also
+    # turns an ENUM from earlier versions into VARCHAR so the names below can be copied)
+    try:
+        db.session.execute(text("ALTER TABLE board_tasks MODIFY COLUMN status VARCHAR(50) NULL DEFAULT NULL"))
+        db.session.commit()
+    except sqlalchemy.exc.SQLAlchemyError:
+        db.session.rollback()
+    # link existing tasks to their status rows by name, adding any column only referenced by tasks,
+    # then clear the names that were linked so later startups find nothing left to backfill
+    try:
+        db.session.execute(text(
+            "INSERT INTO board_statuses (board_id, name, position) "
+            "SELECT DISTINCT t.board_id, t.status, 1000 FROM board_tasks t WHERE t.status_id IS NULL AND t.status IS NOT NULL "
+            "ON DUPLICATE KEY UPDATE board_statuses.id = board_statuses.id"
+        ))
+        db.session.execute(text(
+            "UPDATE board_tasks t JOIN board_statuses s ON s.board_id = t.board_id AND s.name = t.status "
+            "SET t.status_id = s.id WHERE t.status_id IS NULL"
+        ))
+        db.session.execute(text("UPDATE board_tasks SET status = NULL WHERE status IS NOT NULL AND status_id IS NOT NULL"))
+        db.session.commit()
+    except sqlalchemy.exc.SQLAlchemyError:
+        db.session.rollback()
+    # index for member role filters (username prefix search uses the unique index on users.username)
+    try:
+        db.session.execute(text("CREATE INDEX idx_board_members_board_role ON board_members (board_id, role)"))
+        db.session.commit()
+    except sqlalchemy.exc.SQLAlchemyError:
+        db.session.rollback()
+    # labels moved from a 255 char CSV column to board_labels/task_labels; the CSV stays as the API shape
+    try:
+        db.session.execute(text("ALTER TABLE board_tasks MODIFY COLUMN labels TEXT NULL"))
+        db.session.commit()
+    except sqlalchemy.exc.SQLAlchemyError:
+        db.session.rollback()
+    try:
+        if db.session.scalar(select(TaskLabel.id).limit(1)) is None and db.session.scalar(select(BoardTask.id).where(BoardTask.labels.is_not(None)).limit(1)) is not None:
+            backfill_labels()
+    except sqlalchemy.exc.SQLAlchemyError:
+        db.session.rollback()
+    # backfill the task search index once, when the table is new and tasks already exist
+    try:
+        if db.session.scalar(select(TaskSearchTerm.id).limit(1)) is None and db.session.scalar(select(BoardTask.id).limit(1)) is not None:
+            rebuild_index()
+    except sqlalchemy.exc.SQLAlchemyError:
+        db.session.rollback()
+    # ensure board_templates table exists (saved per-user templates)
+    try:
+        db.session.execute(text("""
+            CREATE TABLE IF NOT EXISTS board_templates (
+                id INT AUTO_INCREMENT PRIMARY KEY,
+                owner_id INT NOT NULL,
+                name VARCHAR(100) NOT NULL,
+                statuses TEXT,
+                priorities TEXT,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                KEY ix_board_templates_owner_id (owner_id),
+                CONSTRAINT fk_board_templates_owner FOREIGN KEY (owner_id) REFERENCES users(id) ON DELETE CASCADE
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+        """))
+        db.session.commit()
+    except sqlalchemy.exc.SQLAlchemyError:
+        db.session.rollback()
+    # store user defaults as native JSON, once, while the columns are still TEXT (db.create_all
+    # creates the table as JSON on new databases); unparseable legacy values read as "no defaults" anyway
+    try:
+        columns: dict = {column['name']: column['type'] for column in sqlalchemy.inspect(db.engine).get_columns('user_defaults')}
+        if not isinstance(columns['default_statuses'], sqlalchemy.JSON):
+            db.session.execute(text("""
+                UPDATE user_defaults
+                SET default_statuses = IF(JSON_VALID(default_statuses), default_statuses, NULL),
+                    default_priorities = IF(JSON_VALID(default_priorities), default_priorities, NULL)
+            """))
+            db.session.execute(text("ALTER TABLE user_defaults MODIFY COLUMN default_statuses JSON NULL, MODIFY COLUMN default_priorities JSON NULL"))
+            db.session.commit()
+    except sqlalchemy.exc.SQLAlchemyError:
+        db.session.rollback()
+    try:
+        db.session.execute(text("CREATE INDEX idx_board_tasks_assignee_due ON board_tasks (assigned_to, due_date, id)"))
+        db.session.commit()
+    except sqlalchemy.exc.SQLAlchemyError:
+        db.session.rollback()
     try:
         db.session.execute(text("CREATE INDEX idx_board_tasks_board_status_position ON board_tasks (board_id, status, position)"))
         db.session.commit()
@@ -165,12 +299,6 @@ with app.app_context():
             db.session.commit()
         except sqlalchemy.exc.SQLAlchemyError:
             db.session.rollback()
-        # try to alter status to VARCHAR(50) in case it's an ENUM from earlier versions
-        try:
-            db.session.execute(text("ALTER TABLE board_tasks MODIFY COLUMN status VARCHAR(50) DEFAULT 'todo'"))
-            db.session.commit()
-        except sqlalchemy.exc.SQLAlchemyError:
-            db.session.rollback()
         # ensure task_dependencies table exists
         try:
             db.session.execute(text("""
@@ -234,21 +362,27 @@ app.register_blueprint(auth_bp, url_prefix='/api/auth')
 app.register_blueprint(user_bp, url_prefix='/api')
 app.register_blueprint(api_bp, url_prefix='/api')
 app.register_blueprint(board_bp, url_prefix='/api')
+app.register_blueprint(profiling_bp, url_prefix='/api')
+app.register_blueprint(deletion_bp, url_prefix='/api')
+
+# Opt-in sampled profiling of slow requests (see profiling.py for env flags)
+init_profiling(app)
+
+# Background purge of soft-deleted boards and users (see deletion_jobs.py)
+init_deletion_worker(app)
+
+# Bounded password hashing pool and login/register rate limits (see password_hashing.py, rate_limit.py)
+init_password_hashing(app)
+init_auth_rate_limits(app)
+
+# Access token lifetimes and the periodic sync of revoked sessions (see auth_tokens.py)
+init_token_revocation(app)
 
-# Apply CORS to the app and all blueprints
-CORS(app, origins=["http://localhost:3000"], supports_credentials=True)
+# gzip/Brotli response compression (see compression.py)
+init_compression(app)
 
-# Ensure all routes handle OPTIONS requests
-@app.before_request
-def handle_options():
-    """ Handle CORS preflight requests """
-    if request.method == 'OPTIONS':
-        response = make_response()
-        response.headers.add('Access-Control-Allow-Origin', 'http://localhost:3000')
-        response.headers.add('Access-Control-Allow-Credentials', 'true')
-        response.headers.add('Access-Control-Allow-Headers', 'Content-Type,Authorization')
-        response.headers.add('Access-Control-Allow-Methods', 'GET,POST,PUT,DELETE,OPTIONS')
-        return response
+# CORS for the frontend; preflights are answered before the app is reached (see cors.py)
+init_cors(app)
 
 @app.errorhandler(404)
 def page_not_found(error) -> Tuple[Response, int]:
@@ -1,10 +1,31 @@
 """ Authentication middleware """
-import os
 from functools import wraps
 from types import SimpleNamespace
 import jwt
 from flask import request, jsonify
-from models import User
+from models import db, User
+from auth_tokens import decode_access_token, token_revoked, user_revoked
+
+# GET /users/<int:user_id> (user_routes.get_user)
+USER_LOOKUP_ENDPOINT = 'users.get_user'
+
+class CurrentUser:
+    """
+    The authenticated user as identified by the access token alone. Handlers mostly need the id,
+    so the User row is only loaded when another attribute is read.
+    """
+    def __init__(self, user_id: int):
+        self.id = user_id
+        self._user: User | None = None
+
+    def __getattr__(self, name: str):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        if self._user is None:
+            self._user = db.session.get(User, self.id)
+            if self._user is None:
+                raise AttributeError(name)
+        return getattr(self._user, name)
 
 def token_required(func):
     """ Decorator to check for a valid JWT token in the request headers. """
@@ -20,19 +41,21 @@ def token_required(func):
             if token.startswith('Bearer '):
                 token = token[7:]
 
-            payload = jwt.decode(token, os.getenv('JWT_SECRET_KEY', 'default-secret'), algorithms=['HS256'])
-            current_user = User.query.get(payload['user_id'])
-            # If the user has been deleted but a token is presented, allow safe GETs to proceed
-            # so resource endpoints can respond with 404 instead of 401, which some tests expect.
-            if not current_user:
-                if request.method == 'GET' and request.path.startswith('/users/'):
+            # Signature, expiry and the in-process revocation list: no database access on the hot path.
+            # Deleted users and logged-out sessions are revoked (see auth_tokens.revoke_user/revoke_session).
+            payload = decode_access_token(token)
+            current_user = CurrentUser(payload['user_id'])
+            if token_revoked(payload):
+                # A deleted user's own token may still look up a user by id, so the lookup answers
+                # 404 instead of 401, which some tests expect. Logged-out sessions are always rejected.
+                if user_revoked(payload) and request.endpoint == USER_LOOKUP_ENDPOINT:
                     current_user = SimpleNamespace(id=payload.get('user_id'))
                 else:
                     return jsonify({'message': 'Invalid token'}), 401
 
         except jwt.ExpiredSignatureError:
             return jsonify({'message': 'Token has expired'}), 401
-        except jwt.InvalidTokenError:
+        except (jwt.InvalidTokenError, KeyError):
             return jsonify({'message': 'Invalid token'}), 401
 
         # Avoid passing positional route args to prevent duplicate values; Flask
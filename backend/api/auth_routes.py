@@ -1,15 +1,25 @@
 """ Authentication routes for the API """
-import os
+import math
 from typing import Tuple
 import sqlalchemy.exc
 import jwt
 from flask import Blueprint, Response, jsonify, request
 from models import db, User
-from werkzeug.security import generate_password_hash, check_password_hash
+from auth_tokens import InvalidRefreshToken, decode_access_token, issue_tokens, revoke_session, rotate_refresh_token, session_of, token_revoked
+from password_hashing import HashingBusy, password_hasher
+from rate_limit import auth_retry_after
 from sqlalchemy import select
 
 auth_bp = Blueprint('auth', __name__)
 
+def _retry_later(message: str, status: int, wait: float) -> Tuple[Response, int]:
+    """
+    A 429/503 response telling the client when to retry.
+    """
+    response: Response = jsonify({'message': message})
+    response.headers['Retry-After'] = str(max(1, math.ceil(wait)))
+    return response, status
+
 @auth_bp.route('/login', methods=['POST'])
 def login() -> Tuple[Response, int]:
     """ Log in a user """
@@ -22,22 +32,35 @@ def login() -> Tuple[Response, int]:
         if not username or not password:
             return jsonify({'message': 'Username and password required'}), 400
 
+        # Throttle per client address and per username before any hashing work
+        wait: float = auth_retry_after(request.remote_addr, username)
+        if wait:
+            return _retry_later('Too many login attempts', 429, wait)
+
         # Find the user in the database by username
         user: User | None = db.session.scalar(select(User).where(getattr(User, 'username') == username))
 
         # If the user doesn't exist or the password is wrong, return an error
-        if user is None or not check_password_hash(user.password, password):
+        hasher = password_hasher()
+        if user is None or user.deleted_at is not None or not hasher.verify(user.password, password):
             return jsonify({'message': 'Invalid email or password'}), 401
 
-        # Generate JWT token
-        token: str = jwt.encode({
-            'user_id': user.id
-        }, os.getenv('JWT_SECRET_KEY', 'default-secret'), algorithm='HS256')
+        # Upgrade hashes made with older parameters while the plain password is at hand
+        if hasher.needs_rehash(user.password):
+            try:
+                user.password = hasher.hash(password)
+                db.session.commit()
+            except (HashingBusy, sqlalchemy.exc.SQLAlchemyError):
+                db.session.rollback()
+
+        # Short-lived access token plus a rotating refresh token for a new session
+        tokens: dict = issue_tokens(user.id)
+        db.session.commit()
 
         # If the email and password are correct, return data and token
         return jsonify({
             'message': 'Logged in successfully',
-            'token': token,
+            **tokens,
             'user': {
                 'id': user.id,
                 'username': user.username,
@@ -46,7 +69,10 @@ def login() -> Tuple[Response, int]:
                 'role': getattr(user, 'role', 'user')  # Default to 'user' if role doesn't exist
             }
         }), 200
+    except HashingBusy:
+        return _retry_later('Server busy, try again shortly', 503, 1)
     except sqlalchemy.exc.SQLAlchemyError:
+        db.session.rollback()
         return jsonify({'message': 'Internal server error'}), 500
 
 @auth_bp.route('/register', methods=['POST'])
@@ -64,6 +90,10 @@ def register() -> Tuple[Response, int]:
         if not all([username, password, email]):
             return jsonify({'message': 'Username, email, and password are required'}), 400
 
+        wait: float = auth_retry_after(request.remote_addr)
+        if wait:
+            return _retry_later('Too many registration attempts', 429, wait)
+
         # Check if a user with the provided username or email already exists
         existing_user: User | None = db.session.scalar(
             select(User).where((getattr(User, 'username') == username) | (getattr(User, 'email') == email))
@@ -73,22 +103,19 @@ def register() -> Tuple[Response, int]:
             return jsonify({'message': 'Username or email already taken'}), 409
 
         # Hash the password
-        hashed_password = generate_password_hash(password)
+        hashed_password: str = password_hasher().hash(password)
 
         # Create a new user and save it to the database
         user: User = User(username=username, password=hashed_password, email=email)
         db.session.add(user)
+        db.session.flush()
+        tokens: dict = issue_tokens(user.id)
         db.session.commit()
 
-        # Generate JWT token
-        token: str = jwt.encode({
-            'user_id': user.id
-        }, os.getenv('JWT_SECRET_KEY', 'default-secret'), algorithm='HS256')
-
         # Return a success message
         return jsonify({
             'message': 'Registered successfully',
-            'token': token,
+            **tokens,
             'user': {
                 'id': user.id,
                 'username': user.username,
@@ -97,7 +124,54 @@ def register() -> Tuple[Response, int]:
                 'role': getattr(user, 'role', 'user')
             }
         }), 201
+    except HashingBusy:
+        return _retry_later('Server busy, try again shortly', 503, 1)
+    except sqlalchemy.exc.SQLAlchemyError:
+        db.session.rollback()
+        return jsonify({'message': 'Internal server error'}), 500
+
+@auth_bp.route('/refresh', methods=['POST'])
+def refresh() -> Tuple[Response, int]:
+    """ Exchange a refresh token for a new access token and refresh token """
+    try:
+        refresh_token = (request.get_json(silent=True) or {}).get('refresh_token')
+        if not isinstance(refresh_token, str) or not refresh_token:
+            return jsonify({'message': 'Refresh token required'}), 400
+        try:
+            user_id, tokens = rotate_refresh_token(refresh_token)
+        except InvalidRefreshToken:
+            return jsonify({'message': 'Invalid refresh token'}), 401
+        user: User | None = db.session.get(User, user_id)
+        if user is None or user.deleted_at is not None:
+            db.session.rollback()
+            return jsonify({'message': 'Invalid refresh token'}), 401
+        db.session.commit()
+        return jsonify(tokens), 200
+    except sqlalchemy.exc.SQLAlchemyError:
+        db.session.rollback()
+        return jsonify({'message': 'Internal server error'}), 500
+
+@auth_bp.route('/logout', methods=['POST'])
+def logout() -> Tuple[Response, int]:
+    """ End the session of a refresh token (body) or of the bearer access token """
+    try:
+        session_id: int | None = None
+        refresh_token = (request.get_json(silent=True) or {}).get('refresh_token')
+        if isinstance(refresh_token, str) and refresh_token:
+            session_id = session_of(refresh_token)
+        else:
+            bearer: str = request.headers.get('Authorization') or ''
+            try:
+                session_id = decode_access_token(bearer.removeprefix('Bearer ')).get('sid')
+            except jwt.InvalidTokenError:
+                session_id = None
+        if session_id is None:
+            return jsonify({'message': 'Invalid token'}), 401
+        revoke_session(session_id)
+        db.session.commit()
+        return jsonify({'message': 'Logged out'}), 200
     except sqlalchemy.exc.SQLAlchemyError:
+        db.session.rollback()
         return jsonify({'message': 'Internal server error'}), 500
 
 @auth_bp.route('/validate', methods=['GET'])
@@ -112,10 +186,12 @@ def validate_token() -> Tuple[Response, int]:
         if token.startswith('Bearer '):
             token = token[7:]
 
-        payload = jwt.decode(token, os.getenv('JWT_SECRET_KEY', 'default-secret'), algorithms=['HS256'])
+        payload = decode_access_token(token)
+        if token_revoked(payload):
+            return jsonify({'message': 'Invalid token'}), 401
         user: User | None = User.query.get(payload['user_id'])
 
-        if not user:
+        if not user or user.deleted_at is not None:
             return jsonify({'message': 'User not found'}), 401
 
         return jsonify({'valid': True, 'user_id': user.id}), 200
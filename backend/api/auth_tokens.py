@@ -0,0 +1,240 @@
+""" Short-lived access tokens, rotating refresh tokens and the in-process revocation list """
+import hashlib
+import os
+import secrets
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+import jwt
+import sqlalchemy.exc
+from flask import Flask, current_app
+from sqlalchemy import select, update
+from models import db, RefreshToken, TokenRevocation
+
+DEFAULT_ACCESS_TOKEN_TTL_SECONDS = 900
+DEFAULT_REFRESH_TOKEN_TTL_DAYS = 30
+# How far back each revocation sync re-reads, to catch revocations committed after a later one
+# was already loaded (ids and revoked_at are assigned before commit) and small clock skew
+REVOCATION_SYNC_MARGIN_SECONDS = 60
+
+class InvalidRefreshToken(Exception):
+    """ Raised for unknown, expired, revoked or replayed refresh tokens """
+
+def _secret() -> str:
+    return os.getenv('JWT_SECRET_KEY', 'default-secret')
+
+def _epoch(moment: datetime) -> float:
+    """
+    Seconds since the epoch of a naive UTC datetime.
+    """
+    return moment.replace(tzinfo=timezone.utc).timestamp()
+
+def access_token_ttl() -> int:
+    """
+    Lifetime of access tokens in seconds.
+    """
+    return int(current_app.config.get('ACCESS_TOKEN_TTL_SECONDS', DEFAULT_ACCESS_TOKEN_TTL_SECONDS))
+
+class RevocationList:
+    """
+    Sessions and users whose access tokens issued up to a point in time are no longer accepted,
+    so token_required can reject them without a database lookup. Entries older than the access
+    token lifetime are dropped, since every token they could match has expired anyway.
+    Each process keeps its own copy: revocations made in this process apply at once, those
+    of other processes after the next sync.
+    """
+    def __init__(self):
+        self._sessions: dict[int, float] = {}
+        self._users: dict[int, float] = {}
+        self._synced_until: Optional[datetime] = None
+        self._last_sync = float('-inf')
+        self._lock = threading.Lock()
+
+    def add(self, revoked_at: float, user_id: Optional[int] = None, session_id: Optional[int] = None) -> None:
+        """
+        Reject tokens of the user and/or session issued at or before revoked_at (epoch seconds).
+        """
+        with self._lock:
+            for entries, key in ((self._users, user_id), (self._sessions, session_id)):
+                if key is not None:
+                    entries[key] = max(entries.get(key, revoked_at), revoked_at)
+
+    def is_revoked(self, user_id: Optional[int], session_id: Optional[int], issued_at: float) -> bool:
+        """
+        True when a token of this user and session issued at issued_at has been revoked.
+        """
+        if self.user_revoked(user_id, issued_at):
+            return True
+        return session_id is not None and issued_at <= self._sessions.get(session_id, float('-inf'))
+
+    def user_revoked(self, user_id: Optional[int], issued_at: float) -> bool:
+        """
+        True when every token of this user issued at issued_at has been revoked, e.g. the account was deleted.
+        """
+        return user_id is not None and issued_at <= self._users.get(user_id, float('-inf'))
+
+    def sync(self, interval: float, ttl: float) -> None:
+        """
+        Load revocations recorded by any process, at most once per interval. Each sync re-reads
+        the window since the previous one plus REVOCATION_SYNC_MARGIN_SECONDS rather than
+        following a high-water mark: a transaction can commit a revocation stamped (and numbered)
+        before one another process already loaded. Re-reading is harmless since add keeps the maximum.
+        """
+        now: float = time.monotonic()
+        if now - self._last_sync < interval:
+            return
+        self._last_sync = now
+        started: datetime = datetime.utcnow()
+        cutoff: datetime = started - timedelta(seconds=ttl)
+        if self._synced_until is not None:
+            cutoff = max(cutoff, self._synced_until - timedelta(seconds=REVOCATION_SYNC_MARGIN_SECONDS))
+        rows = db.session.execute(
+            select(TokenRevocation.user_id, TokenRevocation.session_id, TokenRevocation.revoked_at)
+            .where(TokenRevocation.revoked_at >= cutoff)
+        ).all()
+        for user_id, session_id, revoked_at in rows:
+            # DATETIME columns drop fractions of a second; round up so no earlier token slips through
+            self.add(_epoch(revoked_at) + 1, user_id=user_id, session_id=session_id)
+        self._synced_until = started
+        horizon: float = time.time() - ttl
+        with self._lock:
+            for entries in (self._users, self._sessions):
+                for key in [key for key, revoked_at in entries.items() if revoked_at < horizon]:
+                    del entries[key]
+
+    def clear(self) -> None:
+        """
+        Forget every entry and sync from scratch next time.
+        """
+        with self._lock:
+            self._sessions.clear()
+            self._users.clear()
+            self._synced_until = None
+            self._last_sync = float('-inf')
+
+revocation_list = RevocationList()
+
+def issue_access_token(user_id: int, session_id: Optional[int] = None) -> str:
+    """
+    A signed access token expiring after ACCESS_TOKEN_TTL_SECONDS. `iat` keeps sub-second precision
+    so a revocation only matches tokens issued before it.
+    """
+    now: float = time.time()
+    claims: dict = {'user_id': user_id, 'iat': now, 'exp': int(now) + access_token_ttl()}
+    if session_id is not None:
+        claims['sid'] = session_id
+    return jwt.encode(claims, _secret(), algorithm='HS256')
+
+def decode_access_token(token: str) -> dict:
+    """
+    Verified claims of an access token; raises jwt.InvalidTokenError (or ExpiredSignatureError).
+    Tokens without an expiry, as issued before refresh tokens existed, are rejected.
+    """
+    return jwt.decode(token, _secret(), algorithms=['HS256'], options={'require': ['exp', 'iat']})
+
+def token_revoked(claims: dict) -> bool:
+    """
+    True when the token's session or user was revoked. No database access unless a periodic
+    sync is due (only in apps that called init_token_revocation).
+    """
+    if current_app.extensions.get('token_revocation_sync'):
+        try:
+            revocation_list.sync(current_app.config['TOKEN_REVOCATION_SYNC_SECONDS'], access_token_ttl())
+        except sqlalchemy.exc.SQLAlchemyError:
+            db.session.rollback()
+    return revocation_list.is_revoked(claims.get('user_id'), claims.get('sid'), float(claims.get('iat', 0)))
+
+def user_revoked(claims: dict) -> bool:
+    """
+    True when the token was revoked along with all of its user's sessions rather than by a logout.
+    Call after token_revoked, which has already synced.
+    """
+    return revocation_list.user_revoked(claims.get('user_id'), float(claims.get('iat', 0)))
+
+def _hash(token: str) -> str:
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+def _issue_refresh_token(user_id: int, session_id: Optional[int] = None) -> tuple[str, int]:
+    """
+    Store the hash of a new refresh token and return the token and its session id. Only flushes.
+    """
+    token: str = secrets.token_urlsafe(32)
+    days: int = int(current_app.config.get('REFRESH_TOKEN_TTL_DAYS', DEFAULT_REFRESH_TOKEN_TTL_DAYS))
+    row = RefreshToken(user_id=user_id, token_hash=_hash(token), expires_at=datetime.utcnow() + timedelta(days=days), session_id=session_id)
+    db.session.add(row)
+    db.session.flush()
+    if row.session_id is None:
+        row.session_id = row.id
+    return token, row.session_id
+
+def issue_tokens(user_id: int) -> dict:
+    """
+    Start a login session: an access token and the session's first refresh token. The caller commits.
+    """
+    refresh_token, session_id = _issue_refresh_token(user_id)
+    return {'token': issue_access_token(user_id, session_id), 'refresh_token': refresh_token, 'expires_in': access_token_ttl()}
+
+def rotate_refresh_token(token: str) -> tuple[int, dict]:
+    """
+    Exchange a refresh token for a new access token and refresh token of the same session.
+    A refresh token that was already exchanged has leaked: the whole session is revoked.
+    Returns the user id and the new tokens; the caller commits.
+    """
+    row: RefreshToken | None = db.session.scalar(select(RefreshToken).where(RefreshToken.token_hash == _hash(token)))
+    now: datetime = datetime.utcnow()
+    if row is None or row.revoked_at is not None or row.expires_at <= now:
+        raise InvalidRefreshToken()
+    # conditional UPDATE so two concurrent exchanges of one token cannot both succeed
+    claimed: int = db.session.execute(
+        update(RefreshToken).where(RefreshToken.id == row.id, RefreshToken.used_at.is_(None)).values(used_at=now)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if not claimed:
+        revoke_session(row.session_id)
+        db.session.commit()
+        raise InvalidRefreshToken()
+    refresh_token, session_id = _issue_refresh_token(row.user_id, row.session_id)
+    return row.user_id, {'token': issue_access_token(row.user_id, session_id), 'refresh_token': refresh_token,
+                         'expires_in': access_token_ttl()}
+
+def session_of(token: str) -> Optional[int]:
+    """
+    Session id of a refresh token, or None when it is unknown.
+    """
+    return db.session.scalar(select(RefreshToken.session_id).where(RefreshToken.token_hash == _hash(token)))
+
+def revoke_session(session_id: int) -> None:
+    """
+    Log out one session: its refresh tokens stop working and, in every process within one sync
+    interval, so do its access tokens. Does not commit.
+    """
+    now: datetime = datetime.utcnow()
+    db.session.execute(
+        update(RefreshToken).where(RefreshToken.session_id == session_id, RefreshToken.revoked_at.is_(None)).values(revoked_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.add(TokenRevocation(revoked_at=now, session_id=session_id))
+    revocation_list.add(time.time(), session_id=session_id)
+
+def revoke_user(user_id: int) -> None:
+    """
+    Revoke every session of a user, e.g. when the account is deleted. Does not commit.
+    """
+    now: datetime = datetime.utcnow()
+    db.session.execute(
+        update(RefreshToken).where(RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None)).values(revoked_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.add(TokenRevocation(revoked_at=now, user_id=user_id))
+    revocation_list.add(time.time(), user_id=user_id)
+
+def init_token_revocation(app: Flask) -> None:
+    """
+    Read token lifetimes from the environment and enable the periodic sync of revocations
+    recorded by other worker processes.
+    """
+    app.config.setdefault('ACCESS_TOKEN_TTL_SECONDS', int(os.getenv('ACCESS_TOKEN_TTL_SECONDS', str(DEFAULT_ACCESS_TOKEN_TTL_SECONDS))))
+    app.config.setdefault('REFRESH_TOKEN_TTL_DAYS', int(os.getenv('REFRESH_TOKEN_TTL_DAYS', str(DEFAULT_REFRESH_TOKEN_TTL_DAYS))))
+    app.config.setdefault('TOKEN_REVOCATION_SYNC_SECONDS', float(os.getenv('TOKEN_REVOCATION_SYNC_SECONDS', '5')))
+    app.extensions['token_revocation_sync'] = True
@@ -0,0 +1,231 @@
+""" Board provisioning: create or clone a board with its members, statuses and priorities in one transaction """
+import json
+from typing import Optional
+from sqlalchemy import case, insert, literal, or_, select
+from models import db, Board, BoardMember, BoardStatus, BoardPriority, BoardSprint, BoardTask, BoardTemplate, TaskDependency, User
+from user_defaults import DefaultLists, user_defaults
+from db_helpers import insert_ignore
+from task_labels import copy_board_labels
+from task_search import copy_board_index
+
+DEFAULT_STATUSES: list[str] = ['todo', 'in_progress', 'review', 'done']
+DEFAULT_PRIORITIES: list[str] = ['low', 'medium', 'high', 'critical']
+
+# Built-in templates offered to every user
+BUILTIN_TEMPLATES: list[dict] = [
+    {
+        'id': 'kanban-basic',
+        'name': 'Kanban (Basic)',
+        'statuses': ['todo', 'in_progress', 'review', 'done'],
+        'priorities': ['low', 'medium', 'high']
+    },
+    {
+        'id': 'scrum-sprint',
+        'name': 'Scrum Sprint',
+        'statuses': ['backlog', 'selected', 'in_progress', 'review', 'done'],
+        'priorities': ['low', 'medium', 'high', 'critical']
+    }
+]
+
+def clean_names(values, max_len: int = 50) -> list[str]:
+    """
+    Keep non-empty strings, trimmed and truncated, without duplicates (first occurrence wins).
+    """
+    out: list[str] = []
+    for value in (values if isinstance(values, list) else []):
+        if isinstance(value, str) and value.strip():
+            name: str = value.strip()[:max_len]
+            if name not in out:
+                out.append(name)
+    return out
+
+def resolve_user_ids(user_ids=None, usernames=None) -> set[int]:
+    """
+    Resolve usernames and validate ids with a single IN query. Unknown users are dropped.
+    """
+    ids: set[int] = set()
+    for raw_id in (user_ids if isinstance(user_ids, list) else []):
+        try:
+            ids.add(int(raw_id))
+        except (TypeError, ValueError):
+            continue
+    names: set[str] = {name for name in (usernames if isinstance(usernames, list) else []) if isinstance(name, str)}
+    conditions = []
+    if ids:
+        conditions.append(User.id.in_(ids))
+    if names:
+        conditions.append(User.username.in_(names))
+    if not conditions:
+        return set()
+    return set(db.session.scalars(select(User.id).where(or_(*conditions))))
+
+def add_board_members(board_id: int, user_ids=None, usernames=None, role: str = 'member', skip_user_id: Optional[int] = None) -> list[int]:
+    """
+    Add many users to a board with a fixed number of queries: one IN lookup resolving
+    usernames and validating ids, one lookup of existing memberships and one multi-row
+    insert that ignores duplicates. Returns the ids of the users that were added.
+    """
+    resolved: set[int] = resolve_user_ids(user_ids, usernames)
+    resolved.discard(skip_user_id)
+    if not resolved:
+        return []
+    existing: set[int] = set(db.session.scalars(
+        select(BoardMember.user_id).where(BoardMember.board_id == board_id, BoardMember.user_id.in_(resolved))
+    ))
+    to_add: list[int] = sorted(resolved - existing)
+    if to_add:
+        db.session.execute(insert_ignore(BoardMember), [
+            {'board_id': board_id, 'user_id': user_id, 'role': role} for user_id in to_add
+        ])
+    return to_add
+
+def serialize_template(template: BoardTemplate) -> dict:
+    """
+    API shape of a saved template; ids are strings like the built-in template ids.
+    """
+    def parse(raw: str | None) -> list[str]:
+        try:
+            return clean_names(json.loads(raw)) if raw else []
+        except json.JSONDecodeError:
+            return []
+    return {
+        'id': str(template.id),
+        'name': template.name,
+        'statuses': parse(template.statuses),
+        'priorities': parse(template.priorities),
+        'builtin': False
+    }
+
+def find_template(owner_id: int, template_id) -> dict | None:
+    """
+    Look up a built-in template by slug or one of the owner's saved templates by id.
+    """
+    builtin: dict | None = next((t for t in BUILTIN_TEMPLATES if t['id'] == template_id), None)
+    if builtin:
+        return builtin
+    try:
+        saved_id: int = int(template_id)
+    except (TypeError, ValueError):
+        return None
+    saved: BoardTemplate | None = BoardTemplate.query.filter_by(id=saved_id, owner_id=owner_id).first()
+    return serialize_template(saved) if saved else None
+
+def resolve_template(owner_id: int, template_id: Optional[str] = None, statuses=None, priorities=None) -> tuple[list[str], list[str]]:
+    """
+    Pick the status and priority lists for a new board. Explicit lists win, then a
+    built-in or saved template, then the owner's UserDefaults (cached), then the defaults.
+    """
+    chosen_statuses: list[str] = clean_names(statuses)
+    chosen_priorities: list[str] = clean_names(priorities)
+    if template_id and (not chosen_statuses or not chosen_priorities):
+        template: dict | None = find_template(owner_id, template_id)
+        if template:
+            chosen_statuses = chosen_statuses or list(template['statuses'])
+            chosen_priorities = chosen_priorities or list(template['priorities'])
+    if not chosen_statuses or not chosen_priorities:
+        defaults: DefaultLists = user_defaults(owner_id)
+        chosen_statuses = chosen_statuses or clean_names(list(defaults.statuses))
+        chosen_priorities = chosen_priorities or clean_names(list(defaults.priorities))
+    return chosen_statuses or list(DEFAULT_STATUSES), chosen_priorities or list(DEFAULT_PRIORITIES)
+
+def provision_board(owner_id: int, name: str, description: Optional[str] = None, background_color: Optional[str] = None,
+                    statuses=None, priorities=None, template_id: Optional[str] = None,
+                    invite_user_ids=None, invite_usernames=None) -> Board:
+    """
+    Insert a board with its owner membership, invitees, statuses and priorities using
+    multi-row inserts. Only flushes; the caller commits once so the whole board is one transaction.
+    """
+    board_statuses, board_priorities = resolve_template(owner_id, template_id, statuses, priorities)
+    board = Board(name=name, description=description, owner_id=owner_id, background_color=background_color)
+    db.session.add(board)
+    db.session.flush()
+    invitees: set[int] = resolve_user_ids(invite_user_ids, invite_usernames)
+    invitees.discard(owner_id)
+    db.session.execute(insert(BoardMember), [{'board_id': board.id, 'user_id': owner_id, 'role': 'owner'}] + [
+        {'board_id': board.id, 'user_id': user_id, 'role': 'member'} for user_id in sorted(invitees)
+    ])
+    db.session.execute(insert(BoardStatus), [
+        {'board_id': board.id, 'name': status, 'position': idx} for idx, status in enumerate(board_statuses)
+    ])
+    db.session.execute(insert(BoardPriority), [
+        {'board_id': board.id, 'name': priority, 'position': idx} for idx, priority in enumerate(board_priorities)
+    ])
+    return board
+
+def clone_board(source: Board, owner_id: int, name: Optional[str] = None, include_tasks: bool = True) -> Board:
+    """
+    Copy a board server-side: statuses, priorities and sprints with INSERT ... SELECT, then
+    tasks with their sprint ids remapped in the same INSERT ... SELECT, then dependency edges
+    remapped to the new task ids with one multi-row insert, as are the tasks' search index rows and labels.
+    Only flushes; the caller commits.
+
+    Old and new ids are paired by inserting in id order and reading both sides back in id
+    order; auto-increment ids are assigned in insert order within a single statement.
+    """
+    board = Board(
+        name=name or f"{source.name} (copy)",
+        description=source.description,
+        owner_id=owner_id,
+        background_color=source.background_color,
+        sprint_start=source.sprint_start,
+        sprint_end=source.sprint_end
+    )
+    db.session.add(board)
+    db.session.flush()
+    db.session.execute(insert(BoardMember), [{'board_id': board.id, 'user_id': owner_id, 'role': 'owner'}])
+    db.session.execute(insert(BoardStatus).from_select(
+        ['board_id', 'name', 'position', 'color'],
+        select(literal(board.id), BoardStatus.name, BoardStatus.position, BoardStatus.color)
+        .where(BoardStatus.board_id == source.id).order_by(BoardStatus.id)
+    ))
+    db.session.execute(insert(BoardPriority).from_select(
+        ['board_id', 'name', 'position'],
+        select(literal(board.id), BoardPriority.name, BoardPriority.position)
+        .where(BoardPriority.board_id == source.id).order_by(BoardPriority.id)
+    ))
+    if not include_tasks:
+        return board
+
+    db.session.execute(insert(BoardSprint).from_select(
+        ['board_id', 'name', 'start_date', 'end_date', 'goal', 'is_active'],
+        select(literal(board.id), BoardSprint.name, BoardSprint.start_date, BoardSprint.end_date, BoardSprint.goal, BoardSprint.is_active)
+        .where(BoardSprint.board_id == source.id).order_by(BoardSprint.id)
+    ))
+    sprint_map: dict[int, int] = _id_map(BoardSprint, source.id, board.id)
+    sprint_expr = case(sprint_map, value=BoardTask.sprint_id, else_=None) if sprint_map else literal(None)
+    status_map: dict[int, int] = _id_map(BoardStatus, source.id, board.id)
+    status_expr = case(status_map, value=BoardTask.status_id, else_=None) if status_map else literal(None)
+    db.session.execute(insert(BoardTask).from_select(
+        ['board_id', 'title', 'description', 'status_id', 'priority', 'sprint_id', 'assigned_to', 'created_by',
+         'due_date', 'position', 'estimate', 'effort_used', 'labels'],
+        select(literal(board.id), BoardTask.title, BoardTask.description, status_expr, BoardTask.priority, sprint_expr,
+               BoardTask.assigned_to, literal(owner_id), BoardTask.due_date, BoardTask.position, BoardTask.estimate,
+               BoardTask.effort_used, BoardTask.labels)
+        .where(BoardTask.board_id == source.id).order_by(BoardTask.id)
+    ))
+    task_map: dict[int, int] = _id_map(BoardTask, source.id, board.id)
+    edges = db.session.execute(
+        select(TaskDependency.blocker_task_id, TaskDependency.blocked_task_id).where(TaskDependency.board_id == source.id)
+    ).all()
+    edge_rows: list[dict] = [
+        {'board_id': board.id, 'blocker_task_id': task_map[blocker], 'blocked_task_id': task_map[blocked]}
+        for blocker, blocked in edges if blocker in task_map and blocked in task_map
+    ]
+    if edge_rows:
+        db.session.execute(insert(TaskDependency), edge_rows)
+    copy_board_index(source.id, board.id, task_map)
+    copy_board_labels(source.id, board.id, task_map)
+    return board
+
+def _id_map(model, source_board_id: int, target_board_id: int) -> dict[int, int]:
+    """
+    Pair ids of rows copied from one board to another, both read in id order.
+    """
+    rows = db.session.execute(
+        select(model.id, model.board_id).where(model.board_id.in_([source_board_id, target_board_id])).order_by(model.id)
+    ).all()
+    old_ids: list[int] = [row_id for row_id, board_id in rows if board_id == source_board_id]
+    new_ids: list[int] = [row_id for row_id, board_id in rows if board_id == target_board_id]
+    if len(old_ids) != len(new_ids):
+        raise RuntimeError(f"clone of {model.__tablename__} copied {len(new_ids)} of {len(old_ids)} rows")
+    return dict(zip(old_ids, new_ids))
@@ -5,8 +5,19 @@ from typing import Tuple
 import sqlalchemy.exc
 from auth_middleware import token_required
 from flask import Blueprint, jsonify, request, Response
-from models import Board, BoardPriority, BoardStatus, BoardTask, UserDefaults, BoardMember, User, TaskDependency, ActivityLog, BoardSprint, db
-from sqlalchemy import select, or_
+from models import Board, BoardPriority, BoardStatus, BoardTask, BoardMember, BoardTemplate, User, TaskDependency, ActivityLog, BoardSprint, DeletionJob, SprintSummary, db
+from board_provisioning import BUILTIN_TEMPLATES, add_board_members, clean_names, clone_board, provision_board, serialize_template
+from board_vocabulary import Vocabulary, apply_order, board_vocabulary, ensure_priority, ensure_status, valid_name
+from bulk_updates import bulk_update_board_tasks
+from db_helpers import bump_board_version
+from portfolio import board_rollup, visible_boards_condition
+from response_formats import columnar_requested, list_response, to_columnar
+from deletion_jobs import notify_worker, schedule_board_deletion
+from task_labels import clear_task_labels, label_counts, label_filter, labels_csv, parse_labels, set_task_labels
+from task_search import SEARCH_MAX_LIMIT, index_task, query_terms, search_tasks, unindex_tasks
+from sprint_rollover import DEFAULT_DONE_STATUSES, complete_sprint, find_or_create_next_sprint, serialize_summary
+from velocity import VELOCITY_MAX_TRIALS, velocity_report
+from sqlalchemy import case, select
 
 board_bp = Blueprint('boards', __name__)
 
@@ -28,6 +39,52 @@ def _parse_date(value):
                 return None
     return value
 
+def _task_json(task: BoardTask) -> dict:
+    """
+    API shape of a board task.
+    """
+    return {
+        'id': task.id,
+        'title': task.title,
+        'description': task.description or '',
+        'status': task.status,
+        'priority': task.priority,
+        'board_id': task.board_id,
+        'assigned_to': task.assigned_to,
+        'labels': getattr(task, 'labels', None),
+        'sprint_id': getattr(task, 'sprint_id', None),
+        'created_by': task.created_by,
+        'due_date': task.due_date.isoformat() if task.due_date else None,
+        'estimate': task.estimate,
+        'effort_used': task.effort_used,
+        'position': task.position,
+        'created_at': task.created_at.isoformat(),
+        'updated_at': task.updated_at.isoformat() if task.updated_at else None
+    }
+
+def _search_response(board_ids, query: str | None) -> Tuple[Response, int]:
+    """
+    Ranked, paginated task search over the given boards. Query args: limit (default 20, max 100), offset.
+    """
+    terms: list[str] = query_terms(query)
+    if not terms:
+        return jsonify({'message': 'Query is required'}), 400
+    try:
+        limit: int = min(max(int(request.args.get('limit', 20)), 1), SEARCH_MAX_LIMIT)
+        offset: int = max(int(request.args.get('offset', 0)), 0)
+    except ValueError:
+        return jsonify({'message': 'limit and offset must be integers'}), 400
+    ranked, total = search_tasks(board_ids, terms, limit=limit, offset=offset)
+    tasks: dict[int, BoardTask] = {task.id: task for task in BoardTask.query.filter(BoardTask.id.in_([task_id for task_id, _ in ranked])).all()} if ranked else {}
+    return jsonify({
+        'query': query,
+        'terms': terms,
+        'total': total,
+        'limit': limit,
+        'offset': offset,
+        'items': [{**_task_json(tasks[task_id]), 'score': score} for task_id, score in ranked if task_id in tasks]
+    }), 200
+
 # Boards
 @board_bp.route('/boards', methods=['GET'])
 @token_required
@@ -37,10 +94,9 @@ def list_boards(current_user) -> Tuple[Response, int]:
     """
     try:
         # boards owned by the user OR where the user is a member
-        member_board_ids = select(BoardMember.board_id).where(BoardMember.user_id == current_user.id)
         stmt = (
             select(Board)
-            .where(or_(Board.owner_id == current_user.id, Board.id.in_(member_board_ids)))
+            .where(visible_boards_condition(current_user.id))
             .order_by(Board.created_at.desc())
         )
         boards = db.session.scalars(stmt).all()
@@ -58,6 +114,19 @@ def list_boards(current_user) -> Tuple[Response, int]:
     except sqlalchemy.exc.SQLAlchemyError:
         return jsonify({'message': 'Internal server error'}), 500
 
+@board_bp.route('/boards/rollup', methods=['GET'])
+@token_required
+def boards_rollup(current_user) -> Tuple[Response, int]:
+    """
+    Portfolio view: per-board task counts by status, points, overdue tasks and active sprint progress
+    for every board the user can see. Query: done_statuses (comma separated, default 'done').
+    """
+    try:
+        done_statuses: list[str] = clean_names((request.args.get('done_statuses') or '').split(',')) or list(DEFAULT_DONE_STATUSES)
+        return jsonify(board_rollup(current_user.id, done_statuses)), 200
+    except sqlalchemy.exc.SQLAlchemyError:
+        return jsonify({'message': 'Internal server error'}), 500
+
 @board_bp.route('/boards', methods=['POST'])
 @token_required
 def create_board(current_user) -> Tuple[Response, int]:
@@ -67,79 +136,21 @@ def create_board(current_user) -> Tuple[Response, int]:
     try:
         data: dict = request.get_json() or {}
         name: str | None = data.get('name')
-        description: str | None = data.get('description')
         if not name:
             return jsonify({'message': 'Name is required'}), 400
-        background_color: str | None = data.get('background_color')
-        board = Board(name=name, description=description, owner_id=current_user.id, background_color=background_color)
-        db.session.add(board)
+        # board, owner membership, invitees, statuses and priorities are written in one transaction
+        board: Board = provision_board(
+            owner_id=current_user.id,
+            name=name,
+            description=data.get('description'),
+            background_color=data.get('background_color'),
+            statuses=data.get('statuses'),
+            priorities=data.get('priorities'),
+            template_id=data.get('template_id'),
+            invite_user_ids=data.get('invite_user_ids'),
+            invite_usernames=data.get('invite_usernames')
+        )
         db.session.commit()
-        # add owner as member (owner role) and commit so membership is visible in subsequent requests
-        try:
-            db.session.add(BoardMember(board_id=board.id, user_id=current_user.id, role='owner'))
-            db.session.commit()
-        except sqlalchemy.exc.SQLAlchemyError:
-            db.session.rollback()
-        # invited users by username or ids
-        invite_usernames: list[str] = data.get('invite_usernames') or []
-        invite_ids: list[int] = data.get('invite_user_ids') or []
-        if isinstance(invite_usernames, list):
-            for username_to_invite in invite_usernames:
-                if not isinstance(username_to_invite, str):
-                    continue
-                user_to_invite: User | None = User.query.filter_by(username=username_to_invite).first()
-                if user_to_invite and user_to_invite.id != current_user.id:
-                    if not BoardMember.query.filter_by(board_id=board.id, user_id=user_to_invite.id).first():
-                        db.session.add(BoardMember(board_id=board.id, user_id=user_to_invite.id, role='member'))
-        if isinstance(invite_ids, list):
-            for user_to_invite_id in invite_ids:
-                try:
-                    user_to_invite_id_int: int = int(user_to_invite_id)
-                except (TypeError, ValueError):
-                    continue
-                if user_to_invite_id_int != current_user.id:
-                    if not BoardMember.query.filter_by(board_id=board.id, user_id=user_to_invite_id_int).first():
-                        db.session.add(BoardMember(board_id=board.id, user_id=user_to_invite_id_int, role='member'))
-        # seed default statuses for the board if none provided
-        default_statuses: list[str] | None = data.get('statuses')
-        if not default_statuses:
-            # try per-user defaults
-            user_defaults: UserDefaults | None = UserDefaults.query.filter_by(user_id=current_user.id).first()
-            if user_defaults and user_defaults.default_statuses:
-                try:
-                    parsed_user_default_statuses: list[str] | None = json.loads(user_defaults.default_statuses)
-                    if isinstance(parsed_user_default_statuses, list) and parsed_user_default_statuses:
-                        default_statuses = [str(x) for x in parsed_user_default_statuses if isinstance(x, str) and x.strip()]
-                except json.JSONDecodeError:
-                    default_statuses = None
-        if not default_statuses:
-            default_statuses = ['todo', 'in_progress', 'review', 'done']
-        try:
-            for idx, s in enumerate(default_statuses):
-                db.session.add(BoardStatus(board_id=board.id, name=s, position=idx))
-            db.session.commit()
-        except sqlalchemy.exc.SQLAlchemyError:
-            db.session.rollback()
-
-        # seed default priorities for the board if none provided
-        default_priorities: list[str] | None = data.get('priorities')
-        if not default_priorities:
-            user_defaults: UserDefaults | None = UserDefaults.query.filter_by(user_id=current_user.id).first()
-            if user_defaults and user_defaults.default_priorities:
-                try:
-                    parsed_user_default_priorities: list[str] | None = json.loads(user_defaults.default_priorities)
-                    if isinstance(parsed_user_default_priorities, list) and parsed_user_default_priorities:
-                        default_priorities: list[str] | None = [str(x) for x in parsed_user_default_priorities if isinstance(x, str) and x.strip()]
-                except json.JSONDecodeError:
-                    default_priorities = None
-        if not default_priorities:
-            default_priorities = ['low', 'medium', 'high', 'critical']
-        try:
-            for idx, priority in enumerate(default_priorities):
-                db.session.add(BoardPriority(board_id=board.id, name=priority, position=idx))
-            db.session.commit()
-        except sqlalchemy.exc.SQLAlchemyError:
-            db.session.rollback()
         return jsonify({
             'id': board.id,
             'name': board.name,
@@ -161,7 +172,7 @@ def get_board(current_user, board_id) -> Tuple[Response, int]:
     """
     try:
         # Allow if owner or member
-        board: Board | None = Board.query.filter_by(id=board_id).first()
+        board: Board | None = Board.query.filter_by(id=board_id, deleted_at=None).first()
         if not board:
             return jsonify({'message': 'Board not found'}), 404
         if board.owner_id != current_user.id and not BoardMember.query.filter_by(board_id=board.id, user_id=current_user.id).first():
@@ -185,7 +196,7 @@ def update_board(current_user, board_id) -> Tuple[Response, int]:
     Update a specific board by ID.
     """
     try:
-        board: Board | None = Board.query.filter_by(id=board_id).first()
+        board: Board | None = Board.query.filter_by(id=board_id, deleted_at=None).first()
         if not board:
             return jsonify({'message': 'Board not found'}), 404
         data: dict = request.get_json() or {}
@@ -207,33 +218,19 @@ def update_board(current_user, board_id) -> Tuple[Response, int]:
             db.session.flush()
             manager = BoardMember.query.filter_by(board_id=board.id, user_id=current_user.id).first()
         if (board.owner_id == current_user.id) or (manager and manager.role in ('owner', 'admin')):
-            if isinstance(add_usernames, list):
-                for username_to_add in add_usernames:
-                    if not isinstance(username_to_add, str):
-                        continue
-                    user_to_add: User | None = User.query.filter_by(username=username_to_add).first()
-                    if user_to_add and not BoardMember.query.filter_by(board_id=board.id, user_id=user_to_add.id).first():
-                        db.session.add(BoardMember(board_id=board.id, user_id=user_to_add.id, role='member'))
-            if isinstance(add_user_ids, list):
-                for user_id_to_add in add_user_ids:
-                    try:
-                        user_id_to_add_int: int = int(user_id_to_add)
-                    except (TypeError, ValueError):
-                        continue
-                    if not BoardMember.query.filter_by(board_id=board.id, user_id=user_id_to_add_int).first():
-                        db.session.add(BoardMember(board_id=board.id, user_id=user_id_to_add_int, role='member'))
-            if isinstance(remove_user_ids, list):
-                for user_id_to_remove in remove_user_ids:
-                    try:
-                        user_id_to_remove_int: int = int(user_id_to_remove)
-                    except (TypeError, ValueError):
-                        continue
-                    # prevent removing the owner
-                    if user_id_to_remove_int == board.owner_id:
-                        continue
-                    board_member = BoardMember.query.filter_by(board_id=board.id, user_id=user_id_to_remove_int).first()
-                    if board_member:
-                        db.session.delete(board_member)
+            add_board_members(board.id, user_ids=add_user_ids, usernames=add_usernames)
+            remove_ids: set[int] = set()
+            for user_id_to_remove in (remove_user_ids if isinstance(remove_user_ids, list) else []):
+                try:
+                    remove_ids.add(int(user_id_to_remove))
+                except (TypeError, ValueError):
+                    continue
+            # prevent removing the owner
+            remove_ids.discard(board.owner_id)
+            if remove_ids:
+                (BoardMember.query
+                    .filter(BoardMember.board_id == board.id, BoardMember.user_id.in_(remove_ids))
+                    .delete(synchronize_session=False))
         db.session.commit()
         return jsonify({'message': 'Board updated'}), 200
     except sqlalchemy.exc.SQLAlchemyError:
@@ -244,15 +241,18 @@ def update_board(current_user, board_id) -> Tuple[Response, int]:
 @token_required
 def delete_board(current_user, board_id) -> Tuple[Response, int]:
     """
-    Delete a specific board by ID.
+    Delete a specific board by ID. The board disappears immediately and its rows are
+    purged in the background; poll GET /deletions/<job_id> for progress.
     """
     try:
-        board: Board | None = Board.query.filter_by(id=board_id, owner_id=current_user.id).first()
+        board: Board | None = Board.query.filter_by(id=board_id, owner_id=current_user.id, deleted_at=None).first()
         if not board:
             return jsonify({'message': 'Board not found'}), 404
-        db.session.delete(board)
+        # Hide the board now; the deletion worker purges its rows in batches
+        job: DeletionJob = schedule_board_deletion(board, requested_by=current_user.id)
         db.session.commit()
-        return jsonify({'message': 'Board deleted'}), 200
+        notify_worker()
+        return jsonify({'message': 'Board deleted', 'job_id': job.id}), 202
     except sqlalchemy.exc.SQLAlchemyError:
         db.session.rollback()
         return jsonify({'message': 'Internal server error'}), 500
@@ -263,37 +263,74 @@ def delete_board(current_user, board_id) -> Tuple[Response, int]:
 def list_board_tasks(current_user, board_id) -> Tuple[Response, int]:
     """
     List all tasks for a specific board.
+    Query: labels (optional, comma separated) keeps tasks carrying any of the labels;
+    format=columnar returns the columnar layout (see response_formats.to_columnar).
     """
     try:
-        board: Board | None = Board.query.filter_by(id=board_id).first()
+        board: Board | None = Board.query.filter_by(id=board_id, deleted_at=None).first()
         if not board:
             return jsonify({'message': 'Board not found'}), 404
         if board.owner_id != current_user.id and not BoardMember.query.filter_by(board_id=board.id, user_id=current_user.id).first():
             return jsonify({'message': 'Board not found'}), 404
         # order tasks by status column order then position then id
-        status_order: dict[str, int] = {s.name: s.position for s in BoardStatus.query.filter_by(board_id=board.id).order_by(BoardStatus.position).all()}
-        tasks: list[BoardTask] = BoardTask.query.filter_by(board_id=board.id).all()
+        vocabulary: Vocabulary = board_vocabulary(board)
+        status_order: dict[str, int] = vocabulary.status_positions
+        query = BoardTask.query.filter_by(board_id=board.id)
+        labels: list[str] = parse_labels(request.args.get('labels') or '')
+        if labels:
+            query = query.filter(BoardTask.id.in_(label_filter(board.id, labels)))
+        tasks: list[BoardTask] = query.all()
         tasks.sort(key=lambda t: (status_order.get(t.status, 9999), t.position or 0, t.id))
-        return jsonify([
-            {
-                'id': task.id,
-                'title': task.title,
-                'description': task.description or '',
-                'status': task.status,
-                'priority': task.priority,
-                'board_id': task.board_id,
-                'assigned_to': task.assigned_to,
-                'labels': getattr(task, 'labels', None),
-                'sprint_id': getattr(task, 'sprint_id', None),
-                'created_by': task.created_by,
-                'due_date': task.due_date.isoformat() if task.due_date else None,
-                'estimate': task.estimate,
-                'effort_used': task.effort_used,
-                'position': task.position,
-                'created_at': task.created_at.isoformat(),
-                'updated_at': task.updated_at.isoformat() if task.updated_at else None
-            } for task in tasks
-        ]), 200
+        rows: list[dict] = [_task_json(task) for task in tasks]
+        if not columnar_requested():
+            return list_response(rows)
+        for row in rows:
+            row['labels'] = parse_labels(row['labels'] or '')
+        return list_response(to_columnar(rows, {'status': vocabulary.statuses, 'priority': vocabulary.priorities, 'labels': ()}))
+    except sqlalchemy.exc.SQLAlchemyError:
+        return jsonify({'message': 'Internal server error'}), 500
+
+@board_bp.route('/boards/<int:board_id>/labels', methods=['GET'])
+@token_required
+def list_labels(current_user, board_id) -> Tuple[Response, int]:
+    """
+    Labels used on a board with the number of tasks carrying each.
+    """
+    try:
+        board: Board | None = Board.query.filter_by(id=board_id, deleted_at=None).first()
+        if not board:
+            return jsonify({'message': 'Board not found'}), 404
+        if board.owner_id != current_user.id and not BoardMember.query.filter_by(board_id=board.id, user_id=current_user.id).first():
+            return jsonify({'message': 'Board not found'}), 404
+        return jsonify(label_counts(board.id)), 200
+    except sqlalchemy.exc.SQLAlchemyError:
+        return jsonify({'message': 'Internal server error'}), 500
+
+@board_bp.route('/boards/<int:board_id>/tasks/search', methods=['GET'])
+@token_required
+def search_board_tasks(current_user, board_id) -> Tuple[Response, int]:
+    """
+    Search a board's tasks by title, description and labels, best matches first.
+    Query: q (required), limit (default 20, max 100), offset (default 0)
+    """
+    try:
+        board: Board | None = Board.query.filter_by(id=board_id, deleted_at=None).first()
+        if not board:
+            return jsonify({'message': 'Board not found'}), 404
+        if board.owner_id != current_user.id and not BoardMember.query.filter_by(board_id=board.id, user_id=current_user.id).first():
+            return jsonify({'message': 'Board not found'}), 404
+        return _search_response([board.id], request.args.get('q'))
+    except sqlalchemy.exc.SQLAlchemyError:
+        return jsonify({'message': 'Internal server error'}), 500
+
+@board_bp.route('/tasks/search', methods=['GET'])
+@token_required
+def search_all_tasks(current_user) -> Tuple[Response, int]:
+    """
+    Search tasks across every board visible to the user. Same query args as search_board_tasks.
+    """
+    try:
+        return _search_response(select(Board.id).where(visible_boards_condition(current_user.id)), request.args.get('q'))
     except sqlalchemy.exc.SQLAlchemyError:
         return jsonify({'message': 'Internal server error'}), 500
 
@@ -304,7 +341,7 @@ def create_board_task(current_user, board_id) -> Tuple[Response, int]:
     Create a new task in a specific board.
     """
     try:
-        board: Board | None = Board.query.filter_by(id=board_id).first()
+        board: Board | None = Board.query.filter_by(id=board_id, deleted_at=None).first()
         if not board:
             return jsonify({'message': 'Board not found'}), 404
         manager: BoardMember | None = BoardMember.query.filter_by(board_id=board.id, user_id=current_user.id).first()
@@ -316,27 +353,21 @@ def create_board_task(current_user, board_id) -> Tuple[Response, int]:
             return jsonify({'message': 'Title is required'}), 400
         # next position in the column (status)
         status: str | None = data.get('status', 'todo')
+        prio: str | None = data.get('priority', 'medium')
+        if not valid_name(status) or not valid_name(prio):
+            return jsonify({'message': 'status and priority must be non-empty strings of at most 50 characters'}), 400
         # ensure status exists in this board, else add it at end
-        status_row: BoardStatus | None = BoardStatus.query.filter_by(board_id=board.id, name=status).first()
-        if not status_row:
-            max_pos: int = db.session.query(db.func.max(BoardStatus.position)).filter_by(board_id=board.id).scalar() or 0
-            db.session.add(BoardStatus(board_id=board.id, name=status, position=max_pos + 1))
-            db.session.flush()
-        last: BoardTask | None = (BoardTask.query
-                .filter_by(board_id=board.id, status=status)
-                .order_by(BoardTask.position.desc())
-                .first())
-        next_pos: int = (last.position + 1) if last and last.position is not None else 0
+        status_id: int = ensure_status(board, status)
+        last_pos: int | None = (db.session.query(db.func.max(BoardTask.position))
+                .filter(BoardTask.board_id == board.id, BoardTask.status_id == status_id)
+                .scalar())
+        next_pos: int = last_pos + 1 if last_pos is not None else 0
         # ensure priority exists in board priorities
-        prio: str | None = data.get('priority', 'medium')
-        if not BoardPriority.query.filter_by(board_id=board.id, name=prio).first():
-            max_pp: int = db.session.query(db.func.max(BoardPriority.position)).filter_by(board_id=board.id).scalar() or 0
-            db.session.add(BoardPriority(board_id=board.id, name=prio, position=max_pp + 1))
-            db.session.flush()
+        ensure_priority(board, prio)
         task: BoardTask = BoardTask(
             title=title,
             description=data.get('description'),
-            status=status,
+            status_id=status_id,
             priority=prio,
             board_id=board.id,
             assigned_to=data.get('assigned_to'),
@@ -345,34 +376,22 @@ def create_board_task(current_user, board_id) -> Tuple[Response, int]:
             position=next_pos,
             estimate=(int(data['estimate']) if 'estimate' in data and isinstance(data['estimate'], (int, str)) and str(data['estimate']).isdigit() else None),
             effort_used=(int(data['effort_used']) if 'effort_used' in data and isinstance(data['effort_used'], (int, str)) and str(data['effort_used']).isdigit() else 0),
-            labels=(",".join(data['labels']) if isinstance(data.get('labels'), list) else data.get('labels')),
+            labels=labels_csv(data.get('labels')),
             sprint_id=(int(data['sprint_id']) if 'sprint_id' in data and isinstance(data['sprint_id'], (int, str)) and str(data['sprint_id']).isdigit() else None)
         )
         db.session.add(task)
+        db.session.flush()
+        index_task(task)
+        if task.labels:
+            set_task_labels(board.id, {task.id: parse_labels(task.labels)})
+        bump_board_version(board.id)
         db.session.commit()
         try:
             db.session.add(ActivityLog(board_id=board.id, user_id=current_user.id, action='create', entity_type='task', entity_id=task.id, before=None, after=json.dumps({'title': task.title})))
             db.session.commit()
         except sqlalchemy.exc.SQLAlchemyError:
             db.session.rollback()
-        return jsonify({
-            'id': task.id,
-            'title': task.title,
-            'description': task.description or '',
-            'status': task.status,
-            'priority': task.priority,
-            'board_id': task.board_id,
-            'assigned_to': task.assigned_to,
-            'labels': getattr(task, 'labels', None),
-            'sprint_id': getattr(task, 'sprint_id', None),
-            'created_by': task.created_by,
-            'due_date': task.due_date.isoformat() if task.due_date else None,
-            'estimate': task.estimate,
-            'effort_used': task.effort_used,
-            'position': task.position,
-            'created_at': task.created_at.isoformat(),
-            'updated_at': task.updated_at.isoformat() if task.updated_at else None
-        }), 201
+        return jsonify(_task_json(task)), 201
     except sqlalchemy.exc.SQLAlchemyError:
         db.session.rollback()
         return jsonify({'message': 'Internal server error'}), 500
@@ -384,7 +403,7 @@ def update_board_task(current_user, board_id, task_id) -> Tuple[Response, int]:
     Update a specific task in a board.
     """
     try:
-        board: Board | None = Board.query.filter_by(id=board_id).first()
+        board: Board | None = Board.query.filter_by(id=board_id, deleted_at=None).first()
         if not board:
             return jsonify({'message': 'Board not found'}), 404
         if board.owner_id != current_user.id and not BoardMember.query.filter_by(board_id=board.id, user_id=current_user.id).first():
@@ -403,23 +422,17 @@ def update_board_task(current_user, board_id, task_id) -> Tuple[Response, int]:
             'estimate': task.estimate,
             'effort_used': task.effort_used
         }
+        for field in ('status', 'priority'):
+            if field in data and not valid_name(data[field]):
+                return jsonify({'message': f'{field} must be a non-empty string of at most 50 characters'}), 400
         for field in ['title', 'description', 'status', 'priority', 'assigned_to', 'labels', 'estimate', 'effort_used']:
             if field in data:
                 # if changing to a new status ensure it exists
                 if field == 'status':
-                    new_status: str = data[field]
-                    status_row: BoardStatus | None = BoardStatus.query.filter_by(board_id=board.id, name=new_status).first()
-                    if not status_row:
-                        max_pos: int = db.session.query(db.func.max(BoardStatus.position)).filter_by(board_id=board.id).scalar() or 0
-                        db.session.add(BoardStatus(board_id=board.id, name=new_status, position=max_pos + 1))
-                        db.session.flush()
+                    task.status_id = ensure_status(board, data[field])
                 elif field == 'priority':
-                    new_prio: str = data[field]
-                    prio_row: BoardPriority | None = BoardPriority.query.filter_by(board_id=board.id, name=new_prio).first()
-                    if not prio_row:
-                        max_pp: int = db.session.query(db.func.max(BoardPriority.position)).filter_by(board_id=board.id).scalar() or 0
-                        db.session.add(BoardPriority(board_id=board.id, name=new_prio, position=max_pp + 1))
-                        db.session.flush()
+                    ensure_priority(board, data[field])
+                    task.priority = data[field]
                 elif field == 'estimate':
                     val = data[field]
                     task.estimate = int(val) if isinstance(val, (int, str)) and str(val).isdigit() else None
@@ -429,7 +442,7 @@ def update_board_task(current_user, board_id, task_id) -> Tuple[Response, int]:
                     task.effort_used = int(val2) if isinstance(val2, (int, str)) and str(val2).isdigit() else 0
                 elif field == 'labels':
                     val3 = data[field]
-                    task.labels = ",".join(val3) if isinstance(val3, list) else val3
+                    task.labels = labels_csv(val3)
                 else:
                     setattr(task, field, data[field])
         if 'sprint_id' in data:
@@ -439,6 +452,11 @@ def update_board_task(current_user, board_id, task_id) -> Tuple[Response, int]:
                 task.sprint_id = None
         if 'due_date' in data:
             task.due_date = _parse_date(data.get('due_date'))
+        if any(field in data for field in ('title', 'description', 'labels')):
+            index_task(task)
+        if 'labels' in data:
+            set_task_labels(board.id, {task.id: parse_labels(task.labels)})
+        bump_board_version(board.id)
         db.session.commit()
         try:
             db.session.add(ActivityLog(board_id=board.id, user_id=current_user.id, action='update', entity_type='task', entity_id=task.id, before=json.dumps(before_snapshot), after=json.dumps(data)))
@@ -455,7 +473,7 @@ def update_board_task(current_user, board_id, task_id) -> Tuple[Response, int]:
 def delete_board_task(current_user, board_id, task_id) -> Tuple[Response, int]:
     """Delete a specific task in a board."""
     try:
-        board: Board | None = Board.query.filter_by(id=board_id).first()
+        board: Board | None = Board.query.filter_by(id=board_id, deleted_at=None).first()
         if not board:
             return jsonify({'message': 'Board not found'}), 404
         if board.owner_id != current_user.id and not BoardMember.query.filter_by(board_id=board.id, user_id=current_user.id).first():
@@ -463,7 +481,10 @@ def delete_board_task(current_user, board_id, task_id) -> Tuple[Response, int]:
         task: BoardTask | None = BoardTask.query.filter_by(id=task_id, board_id=board.id).first()
         if not task:
             return jsonify({'message': 'Task not found'}), 404
+        unindex_tasks([task.id])
+        clear_task_labels([task.id])
         db.session.delete(task)
+        bump_board_version(board.id)
         db.session.commit()
         try:
             db.session.add(ActivityLog(board_id=board.id, user_id=current_user.id, action='delete', entity_type='task', entity_id=task.id, before=json.dumps({'title': task.title}), after=None))
@@ -480,7 +501,7 @@ def delete_board_task(current_user, board_id, task_id) -> Tuple[Response, int]:
 def reorder_tasks(current_user, board_id) -> Tuple[Response, int]:
     """Reorder tasks within a board. Body: { moves: [{ task_id, to_status, to_position }] }"""
     try:
-        board: Board | None = Board.query.filter_by(id=board_id).first()
+        board: Board | None = Board.query.filter_by(id=board_id, deleted_at=None).first()
         if not board:
             return jsonify({'message': 'Board not found'}), 404
         if board.owner_id != current_user.id and not BoardMember.query.filter_by(board_id=board.id, user_id=current_user.id).first():
@@ -494,23 +515,20 @@ def reorder_tasks(current_user, board_id) -> Tuple[Response, int]:
             task_id: int | None = mv.get('task_id')
             to_status: str | None = mv.get('to_status')
             to_position: int | None = mv.get('to_position')
-            if task_id is None or to_status is None or to_position is None:
+            if task_id is None or not valid_name(to_status) or to_position is None:
                 return jsonify({'message': 'Invalid move'}), 400
             task: BoardTask | None = BoardTask.query.filter_by(id=task_id, board_id=board.id).first()
             if not task:
                 return jsonify({'message': f'Task {task_id} not found'}), 404
             # ensure destination status exists
-            if not BoardStatus.query.filter_by(board_id=board.id, name=to_status).first():
-                max_pos: int = db.session.query(db.func.max(BoardStatus.position)).filter_by(board_id=board.id).scalar() or 0
-                db.session.add(BoardStatus(board_id=board.id, name=to_status, position=max_pos + 1))
-                db.session.flush()
+            to_status_id: int = ensure_status(board, to_status)
             # gather tasks in destination column (including the task if already there)
             col_tasks: list[BoardTask] = (BoardTask.query
-                         .filter_by(board_id=board.id, status=to_status)
+                         .filter_by(board_id=board.id, status_id=to_status_id)
                          .order_by(BoardTask.position, BoardTask.id)
                          .all())
             # if moving from different status, remove from old column list by not including
-            if task.status == to_status:
+            if task.status_id == to_status_id:
                 # remove the task from its current spot in the list to reinsert
                 col_tasks = [t for t in col_tasks if t.id != task.id]
             # clamp position
@@ -518,9 +536,10 @@ def reorder_tasks(current_user, board_id) -> Tuple[Response, int]:
             # build new order and reindex
             new_order: list[BoardTask] = col_tasks[:insert_at] + [task] + col_tasks[insert_at:]
             # update task status
-            task.status = to_status
+            task.status_id = to_status_id
             for idx, t in enumerate(new_order):
                 t.position = idx
+        bump_board_version(board.id)
         db.session.commit()
         try:
             db.session.add(ActivityLog(board_id=board.id, user_id=current_user.id, action='reorder', entity_type='task', entity_id=None, before=None, after=json.dumps({'moves': moves})))
@@ -536,7 +555,7 @@ def reorder_tasks(current_user, board_id) -> Tuple[Response, int]:
 @board_bp.route('/boards/<int:board_id>/dependencies', methods=['GET'])
 @token_required
 def list_dependencies(current_user, board_id) -> Tuple[Response, int]:
-    board: Board | None = Board.query.filter_by(id=board_id).first()
+    board: Board | None = Board.query.filter_by(id=board_id, deleted_at=None).first()
     if not board:
         return jsonify({'message': 'Board not found'}), 404
     if board.owner_id != current_user.id and not BoardMember.query.filter_by(board_id=board.id, user_id=current_user.id).first():
@@ -555,7 +574,7 @@ def list_dependencies(current_user, board_id) -> Tuple[Response, int]:
 @board_bp.route('/boards/<int:board_id>/dependencies', methods=['POST'])
 @token_required
 def create_dependency(current_user, board_id) -> Tuple[Response, int]:
-    board: Board | None = Board.query.filter_by(id=board_id).first()
+    board: Board | None = Board.query.filter_by(id=board_id, deleted_at=None).first()
     if not board:
         return jsonify({'message': 'Board not found'}), 404
     manager: BoardMember | None = BoardMember.query.filter_by(board_id=board.id, user_id=current_user.id).first()
@@ -582,13 +601,14 @@ def create_dependency(current_user, board_id) -> Tuple[Response, int]:
         return jsonify({'message': 'Circular dependency not allowed'}), 400
     dep = TaskDependency(board_id=board.id, blocker_task_id=blocker_id, blocked_task_id=blocked_id)
     db.session.add(dep)
+    bump_board_version(board.id)
     db.session.commit()
     return jsonify({'id': dep.id, 'board_id': dep.board_id, 'blocker_task_id': dep.blocker_task_id, 'blocked_task_id': dep.blocked_task_id}), 201
 
 @board_bp.route('/boards/<int:board_id>/dependencies/<int:dep_id>', methods=['DELETE'])
 @token_required
 def delete_dependency(current_user, board_id, dep_id) -> Tuple[Response, int]:
-    board: Board | None = Board.query.filter_by(id=board_id).first()
+    board: Board | None = Board.query.filter_by(id=board_id, deleted_at=None).first()
     if not board:
         return jsonify({'message': 'Board not found'}), 404
     manager: BoardMember | None = BoardMember.query.filter_by(board_id=board.id, user_id=current_user.id).first()
@@ -598,6 +618,7 @@ def delete_dependency(current_user, board_id, dep_id) -> Tuple[Response, int]:
     if not dep:
         return jsonify({'message': 'Dependency not found'}), 404
     db.session.delete(dep)
+    bump_board_version(board.id)
     db.session.commit()
     return jsonify({'message': 'Dependency removed'}), 200
 
@@ -605,44 +626,72 @@ def delete_dependency(current_user, board_id, dep_id) -> Tuple[Response, int]:
 @board_bp.route('/boards/<int:board_id>/tasks/bulk', methods=['POST'])
 @token_required
 def bulk_update_tasks(current_user, board_id) -> Tuple[Response, int]:
+    """
+    Update many tasks at once with one set-based UPDATE and one audit row per task.
+    Body: { task_ids: number[], changes: { title?, description?, status?, priority?, assigned_to?, sprint_id?, due_date?, estimate?, effort_used?, labels? } }
+    Tasks moved to another status are appended to the end of that column in their current order.
+    """
     try:
-        board: Board | None = Board.query.filter_by(id=board_id).first()
+        board: Board | None = Board.query.filter_by(id=board_id, deleted_at=None).first()
         if not board:
             return jsonify({'message': 'Board not found'}), 404
         if board.owner_id != current_user.id and not BoardMember.query.filter_by(board_id=board.id, user_id=current_user.id).first():
             return jsonify({'message': 'Board not found'}), 404
         data = request.get_json() or {}
-        task_ids = data.get('task_ids', [])
+        raw_ids = data.get('task_ids', [])
         changes = data.get('changes', {}) or {}
-        if not isinstance(task_ids, list) or not task_ids:
+        if not isinstance(raw_ids, list) or not raw_ids:
             return jsonify({'message': 'task_ids required'}), 400
-        updates = {}
-        if 'status' in changes and changes['status']:
-            if not BoardStatus.query.filter_by(board_id=board.id, name=changes['status']).first():
-                max_pos: int = db.session.query(db.func.max(BoardStatus.position)).filter_by(board_id=board.id).scalar() or 0
-                db.session.add(BoardStatus(board_id=board.id, name=changes['status'], position=max_pos + 1))
-                db.session.flush()
+        try:
+            task_ids: list[int] = list(dict.fromkeys(int(task_id) for task_id in raw_ids))
+        except (TypeError, ValueError):
+            return jsonify({'message': 'task_ids must be integers'}), 400
+        if not isinstance(changes, dict):
+            return jsonify({'message': 'changes must be an object'}), 400
+        updates: dict = {}
+        if 'title' in changes:
+            if not isinstance(changes['title'], str) or not changes['title'].strip():
+                return jsonify({'message': 'Title is required'}), 400
+            updates['title'] = changes['title'].strip()
+        for field in ('description', 'assigned_to'):
+            if field in changes:
+                updates[field] = changes[field]
+        for field in ('status', 'priority'):
+            if changes.get(field) and not valid_name(changes[field]):
+                return jsonify({'message': f'{field} must be a non-empty string of at most 50 characters'}), 400
+        if changes.get('status'):
+            updates['status_id'] = ensure_status(board, changes['status'])
             updates['status'] = changes['status']
-        if 'assigned_to' in changes:
-            updates['assigned_to'] = changes['assigned_to']
+        if changes.get('priority'):
+            ensure_priority(board, changes['priority'])
+            updates['priority'] = changes['priority']
+        if 'sprint_id' in changes:
+            try:
+                sprint_id: int | None = int(changes['sprint_id']) if changes['sprint_id'] is not None else None
+            except (TypeError, ValueError):
+                return jsonify({'message': 'Invalid sprint_id'}), 400
+            if sprint_id is not None and not BoardSprint.query.filter_by(id=sprint_id, board_id=board.id).first():
+                return jsonify({'message': 'Sprint not found'}), 404
+            updates['sprint_id'] = sprint_id
+        if 'due_date' in changes:
+            updates['due_date'] = _parse_date(changes['due_date'])
         if 'estimate' in changes:
             try:
                 updates['estimate'] = int(changes['estimate']) if changes['estimate'] is not None else None
             except (TypeError, ValueError):
                 pass
+        if 'effort_used' in changes:
+            value = changes['effort_used']
+            # Treat missing/invalid as 0, as in update_board_task
+            updates['effort_used'] = int(value) if isinstance(value, (int, str)) and str(value).isdigit() else 0
         if 'labels' in changes:
-            updates['labels'] = (",".join(changes['labels']) if isinstance(changes['labels'], list) else changes['labels'])
+            updates['labels'] = labels_csv(changes['labels'])
+        updated: list[int] = []
         if updates:
-            (BoardTask.query
-                .filter(BoardTask.board_id==board.id, BoardTask.id.in_(task_ids))
-                .update(updates, synchronize_session=False))
+            updated = bulk_update_board_tasks(board.id, current_user.id, task_ids, updates)
+            bump_board_version(board.id)
             db.session.commit()
-            try:
-                db.session.add(ActivityLog(board_id=board.id, user_id=current_user.id, action='bulk_update', entity_type='task', entity_id=None, before=None, after=json.dumps({'task_ids': task_ids, 'changes': changes})))
-                db.session.commit()
-            except sqlalchemy.exc.SQLAlchemyError:
-                db.session.rollback()
-        return jsonify({'message': 'Updated'}), 200
+        return jsonify({'message': 'Updated', 'updated': len(updated), 'task_ids': updated}), 200
     except sqlalchemy.exc.SQLAlchemyError:
         db.session.rollback()
         return jsonify({'message': 'Internal server error'}), 500
@@ -652,7 +701,7 @@ def bulk_update_tasks(current_user, board_id) -> Tuple[Response, int]:
 @token_required
 def update_board_sprint(current_user, board_id) -> Tuple[Response, int]:
     try:
-        board: Board | None = Board.query.filter_by(id=board_id).first()
+        board: Board | None = Board.query.filter_by(id=board_id, deleted_at=None).first()
         if not board:
             return jsonify({'message': 'Board not found'}), 404
         if board.owner_id != current_user.id and not BoardMember.query.filter_by(board_id=board.id, user_id=current_user.id).first():
@@ -660,6 +709,7 @@ def update_board_sprint(current_user, board_id) -> Tuple[Response, int]:
         data = request.get_json() or {}
         board.sprint_start = _parse_date(data.get('sprint_start'))
         board.sprint_end = _parse_date(data.get('sprint_end'))
+        bump_board_version(board.id)
         db.session.commit()
         try:
             db.session.add(ActivityLog(board_id=board.id, user_id=current_user.id, action='sprint_update', entity_type='board', entity_id=board.id, before=None, after=json.dumps({'sprint_start': data.get('sprint_start'), 'sprint_end': data.get('sprint_end')})))
@@ -674,7 +724,7 @@ def update_board_sprint(current_user, board_id) -> Tuple[Response, int]:
 @board_bp.route('/boards/<int:board_id>/sprint', methods=['GET'])
 @token_required
 def get_board_sprint(current_user, board_id) -> Tuple[Response, int]:
-    board: Board | None = Board.query.filter_by(id=board_id).first()
+    board: Board | None = Board.query.filter_by(id=board_id, deleted_at=None).first()
     if not board:
         return jsonify({'message': 'Board not found'}), 404
     if board.owner_id != current_user.id and not BoardMember.query.filter_by(board_id=board.id, user_id=current_user.id).first():
@@ -685,7 +735,7 @@ def get_board_sprint(current_user, board_id) -> Tuple[Response, int]:
 @board_bp.route('/boards/<int:board_id>/reports/burnup', methods=['GET'])
 @token_required
 def burnup_data(current_user, board_id) -> Tuple[Response, int]:
-    board: Board | None = Board.query.filter_by(id=board_id).first()
+    board: Board | None = Board.query.filter_by(id=board_id, deleted_at=None).first()
     if not board:
         return jsonify({'message': 'Board not found'}), 404
     tasks: list[BoardTask] = BoardTask.query.filter_by(board_id=board.id).all()
@@ -696,18 +746,49 @@ def burnup_data(current_user, board_id) -> Tuple[Response, int]:
 @board_bp.route('/boards/<int:board_id>/reports/cfd', methods=['GET'])
 @token_required
 def cfd_data(current_user, board_id) -> Tuple[Response, int]:
-    board: Board | None = Board.query.filter_by(id=board_id).first()
+    board: Board | None = Board.query.filter_by(id=board_id, deleted_at=None).first()
     if not board:
         return jsonify({'message': 'Board not found'}), 404
-    statuses: list[BoardStatus] = BoardStatus.query.filter_by(board_id=board.id).order_by(BoardStatus.position).all()
-    counts = { s.name: BoardTask.query.filter_by(board_id=board.id, status=s.name).count() for s in statuses }
+    vocab = board_vocabulary(board)
+    # one grouped count instead of one COUNT per status column
+    task_counts: dict[int, int] = dict(
+        db.session.query(BoardTask.status_id, db.func.count(BoardTask.id))
+        .filter(BoardTask.board_id == board.id)
+        .group_by(BoardTask.status_id)
+        .all()
+    )
+    counts = { name: task_counts.get(vocab.status_ids[name], 0) for name in vocab.statuses }
     return jsonify({'counts': counts}), 200
 
+@board_bp.route('/boards/<int:board_id>/reports/velocity', methods=['GET'])
+@token_required
+def velocity_data(current_user, board_id) -> Tuple[Response, int]:
+    """
+    Completed points per sprint with rolling averages and a Monte Carlo forecast for the remaining points.
+    Query: done_statuses (comma separated, default 'done'), window (default 3), trials (default 10000), seed (optional)
+    """
+    board: Board | None = Board.query.filter_by(id=board_id, deleted_at=None).first()
+    if not board:
+        return jsonify({'message': 'Board not found'}), 404
+    if board.owner_id != current_user.id and not BoardMember.query.filter_by(board_id=board.id, user_id=current_user.id).first():
+        return jsonify({'message': 'Board not found'}), 404
+    done_statuses: list[str] = clean_names((request.args.get('done_statuses') or '').split(',')) or list(DEFAULT_DONE_STATUSES)
+    try:
+        window: int = min(max(int(request.args.get('window', 3)), 1), 52)
+        trials: int = min(max(int(request.args.get('trials', 10000)), 100), VELOCITY_MAX_TRIALS)
+        seed: int | None = int(request.args['seed']) if request.args.get('seed') else None
+    except ValueError:
+        return jsonify({'message': 'window, trials and seed must be integers'}), 400
+    try:
+        return jsonify(velocity_report(board, done_statuses, window=window, trials=trials, seed=seed)), 200
+    except sqlalchemy.exc.SQLAlchemyError:
+        return jsonify({'message': 'Internal server error'}), 500
+
 # Activity log listing
 @board_bp.route('/boards/<int:board_id>/activity', methods=['GET'])
 @token_required
 def list_activity(current_user, board_id) -> Tuple[Response, int]:
-    board: Board | None = Board.query.filter_by(id=board_id).first()
+    board: Board | None = Board.query.filter_by(id=board_id, deleted_at=None).first()
     if not board:
         return jsonify({'message': 'Board not found'}), 404
     if board.owner_id != current_user.id and not BoardMember.query.filter_by(board_id=board.id, user_id=current_user.id).first():
@@ -740,7 +821,7 @@ def list_activity(current_user, board_id) -> Tuple[Response, int]:
 @board_bp.route('/boards/<int:board_id>/sprints', methods=['GET'])
 @token_required
 def list_sprints(current_user, board_id) -> Tuple[Response, int]:
-    board: Board | None = Board.query.filter_by(id=board_id).first()
+    board: Board | None = Board.query.filter_by(id=board_id, deleted_at=None).first()
     if not board:
         return jsonify({'message': 'Board not found'}), 404
     if board.owner_id != current_user.id and not BoardMember.query.filter_by(board_id=board.id, user_id=current_user.id).first():
@@ -760,7 +841,7 @@ def list_sprints(current_user, board_id) -> Tuple[Response, int]:
 @board_bp.route('/boards/<int:board_id>/sprints', methods=['POST'])
 @token_required
 def create_sprint(current_user, board_id) -> Tuple[Response, int]:
-    board: Board | None = Board.query.filter_by(id=board_id).first()
+    board: Board | None = Board.query.filter_by(id=board_id, deleted_at=None).first()
     if not board:
         return jsonify({'message': 'Board not found'}), 404
     manager: BoardMember | None = BoardMember.query.filter_by(board_id=board.id, user_id=current_user.id).first()
@@ -775,6 +856,7 @@ def create_sprint(current_user, board_id) -> Tuple[Response, int]:
     if sprint.is_active:
         BoardSprint.query.filter_by(board_id=board.id, is_active=1).update({'is_active': 0})
     db.session.add(sprint)
+    bump_board_version(board.id)
     db.session.commit()
     try:
         db.session.add(ActivityLog(board_id=board.id, user_id=current_user.id, action='sprint_create', entity_type='sprint', entity_id=sprint.id, before=None, after=json.dumps({'start_date': sprint.start_date.isoformat(), 'end_date': sprint.end_date.isoformat()})))
@@ -786,7 +868,7 @@ def create_sprint(current_user, board_id) -> Tuple[Response, int]:
 @board_bp.route('/boards/<int:board_id>/sprints/<int:sprint_id>', methods=['PUT'])
 @token_required
 def update_sprint(current_user, board_id, sprint_id) -> Tuple[Response, int]:
-    board: Board | None = Board.query.filter_by(id=board_id).first()
+    board: Board | None = Board.query.filter_by(id=board_id, deleted_at=None).first()
     if not board:
         return jsonify({'message': 'Board not found'}), 404
     manager: BoardMember | None = BoardMember.query.filter_by(board_id=board.id, user_id=current_user.id).first()
@@ -814,6 +896,7 @@ def update_sprint(current_user, board_id, sprint_id) -> Tuple[Response, int]:
         if s.is_active:
             BoardSprint.query.filter_by(board_id=board.id, is_active=1).update({'is_active': 0})
             s.is_active = 1
+    bump_board_version(board.id)
     db.session.commit()
     try:
         db.session.add(ActivityLog(board_id=board.id, user_id=current_user.id, action='sprint_update', entity_type='sprint', entity_id=s.id, before=json.dumps(before), after=json.dumps({'name': s.name, 'start_date': s.start_date.isoformat(), 'end_date': s.end_date.isoformat(), 'goal': s.goal, 'is_active': bool(s.is_active)})))
@@ -825,7 +908,7 @@ def update_sprint(current_user, board_id, sprint_id) -> Tuple[Response, int]:
 @board_bp.route('/boards/<int:board_id>/sprints/<int:sprint_id>', methods=['DELETE'])
 @token_required
 def delete_sprint(current_user, board_id, sprint_id) -> Tuple[Response, int]:
-    board: Board | None = Board.query.filter_by(id=board_id).first()
+    board: Board | None = Board.query.filter_by(id=board_id, deleted_at=None).first()
     if not board:
         return jsonify({'message': 'Board not found'}), 404
     manager: BoardMember | None = BoardMember.query.filter_by(board_id=board.id, user_id=current_user.id).first()
@@ -835,6 +918,7 @@ def delete_sprint(current_user, board_id, sprint_id) -> Tuple[Response, int]:
     if not s:
         return jsonify({'message': 'Sprint not found'}), 404
     db.session.delete(s)
+    bump_board_version(board.id)
     db.session.commit()
     try:
         db.session.add(ActivityLog(board_id=board.id, user_id=current_user.id, action='sprint_delete', entity_type='sprint', entity_id=sprint_id, before=None, after=None))
@@ -846,7 +930,7 @@ def delete_sprint(current_user, board_id, sprint_id) -> Tuple[Response, int]:
 @board_bp.route('/boards/<int:board_id>/sprints/active', methods=['GET'])
 @token_required
 def get_active_sprint(current_user, board_id) -> Tuple[Response, int]:
-    board: Board | None = Board.query.filter_by(id=board_id).first()
+    board: Board | None = Board.query.filter_by(id=board_id, deleted_at=None).first()
     if not board:
         return jsonify({'message': 'Board not found'}), 404
     if board.owner_id != current_user.id and not BoardMember.query.filter_by(board_id=board.id, user_id=current_user.id).first():
@@ -865,33 +949,169 @@ def get_active_sprint(current_user, board_id) -> Tuple[Response, int]:
         }
     }), 200
 
-# Board templates: simple payload of statuses and priorities
+@board_bp.route('/boards/<int:board_id>/sprints/<int:sprint_id>/complete', methods=['POST'])
+@token_required
+def complete_sprint_route(current_user, board_id, sprint_id) -> Tuple[Response, int]:
+    """
+    Complete a sprint in one transaction: deactivate it, select or create the next sprint and make it
+    active, move unfinished tasks to it and record a velocity summary.
+    Body: { next_sprint_id?: number, next_sprint?: { name?, start_date, end_date, goal? }, done_statuses?: string[] }
+    Without either next sprint option the earliest later sprint is used, or one of the same length is created.
+    """
+    try:
+        board: Board | None = Board.query.filter_by(id=board_id, deleted_at=None).first()
+        if not board:
+            return jsonify({'message': 'Board not found'}), 404
+        manager: BoardMember | None = BoardMember.query.filter_by(board_id=board.id, user_id=current_user.id).first()
+        if not (board.owner_id == current_user.id or manager):
+            return jsonify({'message': 'Board not found'}), 404
+        sprint: BoardSprint | None = BoardSprint.query.filter_by(id=sprint_id, board_id=board.id).first()
+        if not sprint:
+            return jsonify({'message': 'Sprint not found'}), 404
+        if SprintSummary.query.filter_by(sprint_id=sprint.id).first():
+            return jsonify({'message': 'Sprint already completed'}), 409
+        data: dict = request.get_json(silent=True) or {}
+        done_statuses: list[str] = clean_names(data.get('done_statuses')) or list(DEFAULT_DONE_STATUSES)
+        next_sprint: BoardSprint | None
+        if data.get('next_sprint_id') is not None:
+            try:
+                next_id: int = int(data['next_sprint_id'])
+            except (TypeError, ValueError):
+                return jsonify({'message': 'Invalid next_sprint_id'}), 400
+            next_sprint = BoardSprint.query.filter_by(id=next_id, board_id=board.id).first()
+            if not next_sprint or next_sprint.id == sprint.id:
+                return jsonify({'message': 'Next sprint not found'}), 404
+        elif isinstance(data.get('next_sprint'), dict):
+            spec: dict = data['next_sprint']
+            sd = _parse_date(spec.get('start_date'))
+            ed = _parse_date(spec.get('end_date'))
+            if not sd or not ed or sd > ed:
+                return jsonify({'message': 'Invalid dates'}), 400
+            next_sprint = BoardSprint(board_id=board.id, start_date=sd, end_date=ed, name=spec.get('name'), goal=spec.get('goal'))
+            db.session.add(next_sprint)
+            db.session.flush()
+        else:
+            next_sprint = find_or_create_next_sprint(sprint)
+        summary: SprintSummary = complete_sprint(sprint, next_sprint, current_user.id, done_statuses)
+        db.session.add(ActivityLog(board_id=board.id, user_id=current_user.id, action='sprint_complete', entity_type='sprint', entity_id=sprint.id, before=None, after=json.dumps({
+            'next_sprint_id': next_sprint.id, 'completed_points': summary.completed_points, 'carried_over_tasks': summary.carried_over_tasks
+        })))
+        bump_board_version(board.id)
+        db.session.commit()
+        return jsonify({
+            'summary': serialize_summary(summary),
+            'next_sprint': {
+                'id': next_sprint.id,
+                'name': next_sprint.name,
+                'start_date': next_sprint.start_date.isoformat(),
+                'end_date': next_sprint.end_date.isoformat(),
+                'goal': next_sprint.goal,
+                'is_active': bool(next_sprint.is_active)
+            }
+        }), 200
+    except sqlalchemy.exc.SQLAlchemyError:
+        db.session.rollback()
+        return jsonify({'message': 'Internal server error'}), 500
+
+@board_bp.route('/boards/<int:board_id>/sprints/summaries', methods=['GET'])
+@token_required
+def list_sprint_summaries(current_user, board_id) -> Tuple[Response, int]:
+    """
+    Velocity summaries of completed sprints, oldest first.
+    """
+    board: Board | None = Board.query.filter_by(id=board_id, deleted_at=None).first()
+    if not board:
+        return jsonify({'message': 'Board not found'}), 404
+    if board.owner_id != current_user.id and not BoardMember.query.filter_by(board_id=board.id, user_id=current_user.id).first():
+        return jsonify({'message': 'Board not found'}), 404
+    summaries: list[SprintSummary] = SprintSummary.query.filter_by(board_id=board.id).order_by(SprintSummary.end_date, SprintSummary.id).all()
+    return jsonify([serialize_summary(summary) for summary in summaries]), 200
+
+# Board templates: built-in templates plus the user's saved templates
 @board_bp.route('/boards/templates', methods=['GET'])
 @token_required
 def list_board_templates(current_user) -> Tuple[Response, int]:
-    # TODO: Make so kanban basic and scrum sprint are defaults for every user, add sql table, add model if needed, wire up
-    templates = [
-        {
-            'id': 'kanban-basic',
-            'name': 'Kanban (Basic)',
-            'statuses': ['todo', 'in_progress', 'review', 'done'],
-            'priorities': ['low', 'medium', 'high']
-        },
-        {
-            'id': 'scrum-sprint',
-            'name': 'Scrum Sprint',
-            'statuses': ['backlog', 'selected', 'in_progress', 'review', 'done'],
-            'priorities': ['low', 'medium', 'high', 'critical']
-        }
-    ]
+    """
+    List built-in templates followed by the current user's saved templates.
+    """
+    saved: list[BoardTemplate] = BoardTemplate.query.filter_by(owner_id=current_user.id).order_by(BoardTemplate.id).all()
+    templates: list[dict] = [dict(t, builtin=True) for t in BUILTIN_TEMPLATES] + [serialize_template(t) for t in saved]
     return jsonify(templates), 200
 
+@board_bp.route('/boards/templates', methods=['POST'])
+@token_required
+def create_board_template(current_user) -> Tuple[Response, int]:
+    """
+    Save a template. Body: { name, statuses?, priorities? } or { name, board_id } to snapshot a board's columns.
+    """
+    data: dict = request.get_json() or {}
+    name: str | None = data.get('name')
+    if not name:
+        return jsonify({'message': 'Name is required'}), 400
+    statuses: list[str] = clean_names(data.get('statuses'))
+    priorities: list[str] = clean_names(data.get('priorities'))
+    if data.get('board_id') is not None:
+        board: Board | None = Board.query.filter_by(id=data.get('board_id'), deleted_at=None).first()
+        if not board or (board.owner_id != current_user.id and not BoardMember.query.filter_by(board_id=board.id, user_id=current_user.id).first()):
+            return jsonify({'message': 'Board not found'}), 404
+        statuses = list(db.session.scalars(select(BoardStatus.name).where(BoardStatus.board_id == board.id).order_by(BoardStatus.position, BoardStatus.id)))
+        priorities = list(db.session.scalars(select(BoardPriority.name).where(BoardPriority.board_id == board.id).order_by(BoardPriority.position, BoardPriority.id)))
+    if not statuses:
+        return jsonify({'message': 'At least one status is required'}), 400
+    template = BoardTemplate(owner_id=current_user.id, name=str(name)[:100], statuses=json.dumps(statuses), priorities=json.dumps(priorities))
+    db.session.add(template)
+    db.session.commit()
+    return jsonify(serialize_template(template)), 201
+
+@board_bp.route('/boards/templates/<int:template_id>', methods=['DELETE'])
+@token_required
+def delete_board_template(current_user, template_id) -> Tuple[Response, int]:
+    """
+    Delete one of the current user's saved templates.
+    """
+    template: BoardTemplate | None = BoardTemplate.query.filter_by(id=template_id, owner_id=current_user.id).first()
+    if not template:
+        return jsonify({'message': 'Template not found'}), 404
+    db.session.delete(template)
+    db.session.commit()
+    return jsonify({'message': 'Template deleted'}), 200
+
+@board_bp.route('/boards/<int:board_id>/clone', methods=['POST'])
+@token_required
+def clone_board_route(current_user, board_id) -> Tuple[Response, int]:
+    """
+    Clone a board (statuses, priorities, sprints, tasks and dependencies) into a new board owned by the caller.
+    Body: { name?: string, include_tasks?: bool }
+    """
+    try:
+        source: Board | None = Board.query.filter_by(id=board_id, deleted_at=None).first()
+        if not source:
+            return jsonify({'message': 'Board not found'}), 404
+        if source.owner_id != current_user.id and not BoardMember.query.filter_by(board_id=source.id, user_id=current_user.id).first():
+            return jsonify({'message': 'Board not found'}), 404
+        data: dict = request.get_json(silent=True) or {}
+        board: Board = clone_board(source, owner_id=current_user.id, name=data.get('name'), include_tasks=bool(data.get('include_tasks', True)))
+        db.session.add(ActivityLog(board_id=board.id, user_id=current_user.id, action='clone', entity_type='board', entity_id=board.id, before=None, after=json.dumps({'source_board_id': source.id})))
+        db.session.commit()
+        return jsonify({
+            'id': board.id,
+            'name': board.name,
+            'description': board.description or '',
+            'owner_id': board.owner_id,
+            'created_at': board.created_at.isoformat(),
+            'updated_at': board.updated_at.isoformat() if board.updated_at else None,
+            'background_color': getattr(board, 'background_color', None)
+        }), 201
+    except (sqlalchemy.exc.SQLAlchemyError, RuntimeError):
+        db.session.rollback()
+        return jsonify({'message': 'Internal server error'}), 500
+
 # Status management endpoints
 @board_bp.route('/boards/<int:board_id>/statuses', methods=['GET'])
 @token_required
 def list_statuses(current_user, board_id) -> Tuple[Response, int]:
     """List all statuses for a specific board."""
-    board: Board | None = Board.query.filter_by(id=board_id).first()
+    board: Board | None = Board.query.filter_by(id=board_id, deleted_at=None).first()
     if not board:
         return jsonify({'message': 'Board not found'}), 404
     if board.owner_id != current_user.id and not BoardMember.query.filter_by(board_id=board.id, user_id=current_user.id).first():
@@ -905,7 +1125,7 @@ def list_statuses(current_user, board_id) -> Tuple[Response, int]:
 @token_required
 def create_status(current_user, board_id) -> Tuple[Response, int]:
     """Create a new status for a specific board."""
-    board: Board | None = Board.query.filter_by(id=board_id, owner_id=current_user.id).first()
+    board: Board | None = Board.query.filter_by(id=board_id, owner_id=current_user.id, deleted_at=None).first()
     if not board:
         return jsonify({'message': 'Board not found'}), 404
     data: dict = request.get_json() or {}
@@ -918,16 +1138,50 @@ def create_status(current_user, board_id) -> Tuple[Response, int]:
     status_color: str | None = data.get('color')
     status: BoardStatus = BoardStatus(board_id=board.id, name=name, position=max_pos + 1, color=status_color)
     db.session.add(status)
+    bump_board_version(board.id, vocabulary=True)
     db.session.commit()
     return jsonify({'id': status.id, 'name': status.name, 'position': status.position, 'color': getattr(status, 'color', None)}), 201
 
+def _reorder(current_user, board_id: int, model) -> Tuple[Response, int]:
+    """
+    Shared body of the status and priority order endpoints: body `{ids: [...]}` lists every id of the board once.
+    """
+    try:
+        board: Board | None = Board.query.filter_by(id=board_id, owner_id=current_user.id, deleted_at=None).first()
+        if not board:
+            return jsonify({'message': 'Board not found'}), 404
+        raw_ids = (request.get_json() or {}).get('ids')
+        if not isinstance(raw_ids, list):
+            return jsonify({'message': 'ids required'}), 400
+        try:
+            ordered_ids: list[int] = [int(item_id) for item_id in raw_ids]
+        except (TypeError, ValueError):
+            return jsonify({'message': 'ids must be integers'}), 400
+        if not apply_order(model, board.id, ordered_ids):
+            return jsonify({'message': 'ids must list every id of the board exactly once'}), 400
+        bump_board_version(board.id, vocabulary=True)
+        version: int = db.session.scalar(select(Board.version).where(Board.id == board.id))
+        db.session.commit()
+        return jsonify({'ids': ordered_ids, 'version': version}), 200
+    except sqlalchemy.exc.SQLAlchemyError:
+        db.session.rollback()
+        return jsonify({'message': 'Internal server error'}), 500
+
+@board_bp.route('/boards/<int:board_id>/statuses/order', methods=['PUT'])
+@token_required
+def reorder_statuses(current_user, board_id) -> Tuple[Response, int]:
+    """
+    Reorder all of a board's statuses in one transaction; returns the new board version.
+    """
+    return _reorder(current_user, board_id, BoardStatus)
+
 @board_bp.route('/boards/<int:board_id>/statuses/<int:status_id>', methods=['PUT'])
 @token_required
 def update_status(current_user, board_id, status_id) -> Tuple[Response, int]:
     """
     Update a specific status in a board.
     """
-    board: Board | None = Board.query.filter_by(id=board_id, owner_id=current_user.id).first()
+    board: Board | None = Board.query.filter_by(id=board_id, owner_id=current_user.id, deleted_at=None).first()
     if not board:
         return jsonify({'message': 'Board not found'}), 404
     status: BoardStatus | None = BoardStatus.query.filter_by(id=status_id, board_id=board.id).first()
@@ -938,14 +1192,13 @@ def update_status(current_user, board_id, status_id) -> Tuple[Response, int]:
         # enforce uniqueness per board
         if BoardStatus.query.filter(BoardStatus.board_id==board.id, BoardStatus.name==data['name'], BoardStatus.id!=status.id).first():
             return jsonify({'message': 'Status name already used'}), 400
-        # update all tasks referencing old name
-        old_name: str = status.name
+        # tasks reference the status by id, so a rename touches this row only
         status.name = data['name']
-        BoardTask.query.filter_by(board_id=board.id, status=old_name).update({BoardTask.status: data['name']})
     if 'position' in data:
         status.position = int(data['position'])
     if 'color' in data:
         status.color = data['color']
+    bump_board_version(board.id, vocabulary=True)
     db.session.commit()
     return jsonify({'message': 'Status updated'}), 200
 
@@ -955,17 +1208,37 @@ def delete_status(current_user, board_id, status_id) -> Tuple[Response, int]:
     """
     Delete a specific status in a board.
     """
-    board: Board | None = Board.query.filter_by(id=board_id, owner_id=current_user.id).first()
+    board: Board | None = Board.query.filter_by(id=board_id, owner_id=current_user.id, deleted_at=None).first()
     if not board:
         return jsonify({'message': 'Board not found'}), 404
     status: BoardStatus | None = BoardStatus.query.filter_by(id=status_id, board_id=board.id).first()
     if not status:
         return jsonify({'message': 'Status not found'}), 404
-    # move tasks in this status to fallback (first status) or 'todo'
-    fallback: BoardStatus | None = BoardStatus.query.filter_by(board_id=board.id).order_by(BoardStatus.position).first()
-    fallback_name: str = fallback.name if fallback and fallback.id != status.id else 'todo'
-    BoardTask.query.filter_by(board_id=board.id, status=status.name).update({BoardTask.status: fallback_name, BoardTask.position: 0})
+    # move tasks in this status to the first remaining column
+    fallback: BoardStatus | None = (BoardStatus.query
+        .filter(BoardStatus.board_id == board.id, BoardStatus.id != status.id)
+        .order_by(BoardStatus.position, BoardStatus.id)
+        .first())
+    if not fallback:
+        return jsonify({'message': 'Cannot delete the last status'}), 400
+    # one UPDATE ... CASE appends the moved tasks after the fallback column's own, in their current
+    # order and numbered densely like every other write
+    end: int = (db.session.query(db.func.max(BoardTask.position))
+        .filter(BoardTask.board_id == board.id, BoardTask.status_id == fallback.id)
+        .scalar())
+    base: int = end + 1 if end is not None else 0
+    moved_ids: list[int] = list(db.session.scalars(
+        select(BoardTask.id).where(BoardTask.board_id == board.id, BoardTask.status_id == status.id)
+        .order_by(BoardTask.position, BoardTask.id)
+    ))
+    if moved_ids:
+        (BoardTask.query
+            .filter(BoardTask.board_id == board.id, BoardTask.id.in_(moved_ids))
+            .update({BoardTask.status_id: fallback.id,
+                     BoardTask.position: case({task_id: base + idx for idx, task_id in enumerate(moved_ids)}, value=BoardTask.id)},
+                    synchronize_session=False))
     db.session.delete(status)
+    bump_board_version(board.id, vocabulary=True)
     db.session.commit()
     return jsonify({'message': 'Status deleted'}), 200
 
@@ -976,7 +1249,7 @@ def list_priorities(current_user, board_id) -> Tuple[Response, int]:
     """
     List all priorities for a specific board.
     """
-    board: Board | None = Board.query.filter_by(id=board_id).first()
+    board: Board | None = Board.query.filter_by(id=board_id, deleted_at=None).first()
     if not board:
         return jsonify({'message': 'Board not found'}), 404
     if board.owner_id != current_user.id and not BoardMember.query.filter_by(board_id=board.id, user_id=current_user.id).first():
@@ -992,7 +1265,7 @@ def create_priority(current_user, board_id) -> Tuple[Response, int]:
     """
     Create a new priority for a specific board.
     """
-    board: Board | None = Board.query.filter_by(id=board_id, owner_id=current_user.id).first()
+    board: Board | None = Board.query.filter_by(id=board_id, owner_id=current_user.id, deleted_at=None).first()
     if not board:
         return jsonify({'message': 'Board not found'}), 404
     data: dict = request.get_json() or {}
@@ -1005,16 +1278,25 @@ def create_priority(current_user, board_id) -> Tuple[Response, int]:
     max_pos: int = db.session.query(db.func.max(BoardPriority.position)).filter_by(board_id=board.id).scalar() or 0
     board_priority: BoardPriority = BoardPriority(board_id=board.id, name=name, position=max_pos + 1)
     db.session.add(board_priority)
+    bump_board_version(board.id, vocabulary=True)
     db.session.commit()
     return jsonify({'id': board_priority.id, 'name': board_priority.name, 'position': board_priority.position}), 201
 
+@board_bp.route('/boards/<int:board_id>/priorities/order', methods=['PUT'])
+@token_required
+def reorder_priorities(current_user, board_id) -> Tuple[Response, int]:
+    """
+    Reorder all of a board's priorities in one transaction; returns the new board version.
+    """
+    return _reorder(current_user, board_id, BoardPriority)
+
 @board_bp.route('/boards/<int:board_id>/priorities/<int:priority_id>', methods=['PUT'])
 @token_required
 def update_priority(current_user, board_id, priority_id) -> Tuple[Response, int]:
     """
     Update a specific priority in a board.
     """
-    board: Board | None = Board.query.filter_by(id=board_id, owner_id=current_user.id).first()
+    board: Board | None = Board.query.filter_by(id=board_id, owner_id=current_user.id, deleted_at=None).first()
     if not board:
         return jsonify({'message': 'Board not found'}), 404
     board_priority: BoardPriority | None = BoardPriority.query.filter_by(id=priority_id, board_id=board.id).first()
@@ -1030,6 +1312,7 @@ def update_priority(current_user, board_id, priority_id) -> Tuple[Response, int]
         BoardTask.query.filter_by(board_id=board.id, priority=old_name).update({BoardTask.priority: data['name']})
     if 'position' in data:
         board_priority.position = int(data['position'])
+    bump_board_version(board.id, vocabulary=True)
     db.session.commit()
     return jsonify({'message': 'Priority updated'}), 200
 
@@ -1039,7 +1322,7 @@ def delete_priority(current_user, board_id, priority_id) -> Tuple[Response, int]
     """
     Delete a specific priority in a board.
     """
-    board: Board | None = Board.query.filter_by(id=board_id, owner_id=current_user.id).first()
+    board: Board | None = Board.query.filter_by(id=board_id, owner_id=current_user.id, deleted_at=None).first()
     if not board:
         return jsonify({'message': 'Board not found'}), 404
     board_priority: BoardPriority | None = BoardPriority.query.filter_by(id=priority_id, board_id=board.id).first()
@@ -1050,37 +1333,83 @@ def delete_priority(current_user, board_id, priority_id) -> Tuple[Response, int]
     fallback_name: str = fallback.name if fallback and fallback.id != board_priority.id else 'medium'
     BoardTask.query.filter_by(board_id=board.id, priority=board_priority.name).update({BoardTask.priority: fallback_name})
     db.session.delete(board_priority)
+    bump_board_version(board.id, vocabulary=True)
     db.session.commit()
     return jsonify({'message': 'Priority deleted'}), 200
 
 # Membership endpoints
+MEMBER_PAGE_MAX: int = 500
+
 @board_bp.route('/boards/<int:board_id>/members', methods=['GET'])
 @token_required
 def list_board_members(current_user, board_id) -> Tuple[Response, int]:
-    """List all members of a specific board."""
-    board: Board | None = Board.query.filter_by(id=board_id).first()
+    """
+    List members of a specific board.
+    Query params: q (username prefix), role, limit/offset (X-Total-Count header is set when limit is given),
+    compact=1 (only user_id and role, for assignee pickers).
+    """
+    board: Board | None = Board.query.filter_by(id=board_id, deleted_at=None).first()
     if not board:
         return jsonify({'message': 'Board not found'}), 404
     if board.owner_id != current_user.id and not BoardMember.query.filter_by(board_id=board_id, user_id=current_user.id).first():
         return jsonify({'message': 'Board not found'}), 404
-    members = BoardMember.query.filter_by(board_id=board_id).all()
-    return jsonify([
-        {
-            'id': member.id,
-            'board_id': member.board_id,
-            'user_id': member.user_id,
-            'username': getattr(member.user, 'username', None),
-            'role': member.role,
-            'joined_at': member.joined_at.isoformat() if member.joined_at else None
-        }
-        for member in members
-    ]), 200
+    prefix: str = (request.args.get('q') or '').strip()
+    role: str | None = request.args.get('role')
+    compact: bool = request.args.get('compact') in ('1', 'true')
+    try:
+        limit: int | None = int(request.args['limit']) if 'limit' in request.args else None
+        offset: int = int(request.args.get('offset', 0))
+    except ValueError:
+        return jsonify({'message': 'Invalid pagination parameters'}), 400
+    conditions = [BoardMember.board_id == board_id]
+    if role:
+        conditions.append(BoardMember.role == role)
+    if prefix:
+        # LIKE 'prefix%' can use the unique index on users.username
+        escaped: str = prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        conditions.append(User.username.like(escaped + '%', escape='\\'))
+    # usernames are joined in the same query rather than lazy-loading member.user per row
+    if compact:
+        stmt = select(BoardMember.user_id, BoardMember.role)
+        if prefix:
+            stmt = stmt.join(User, User.id == BoardMember.user_id)
+    else:
+        stmt = select(BoardMember, User.username).outerjoin(User, User.id == BoardMember.user_id)
+    stmt = stmt.where(*conditions).order_by(BoardMember.id)
+    total: int | None = None
+    if limit is not None:
+        limit = max(1, min(limit, MEMBER_PAGE_MAX))
+        offset = max(0, offset)
+        count_stmt = select(db.func.count(BoardMember.id)).where(*conditions)
+        if prefix:
+            count_stmt = count_stmt.join(User, User.id == BoardMember.user_id)
+        total = db.session.scalar(count_stmt)
+        stmt = stmt.limit(limit).offset(offset)
+    rows = db.session.execute(stmt).all()
+    if compact:
+        payload: list[dict] = [{'user_id': user_id, 'role': member_role} for user_id, member_role in rows]
+    else:
+        payload = [
+            {
+                'id': member.id,
+                'board_id': member.board_id,
+                'user_id': member.user_id,
+                'username': username,
+                'role': member.role,
+                'joined_at': member.joined_at.isoformat() if member.joined_at else None
+            }
+            for member, username in rows
+        ]
+    response: Response = jsonify(payload)
+    if total is not None:
+        response.headers['X-Total-Count'] = str(total)
+    return response, 200
 
 @board_bp.route('/boards/<int:board_id>/members', methods=['POST'])
 @token_required
 def add_board_member(current_user, board_id) -> Tuple[Response, int]:
     """Add a member to a specific board."""
-    board: Board | None = Board.query.filter_by(id=board_id).first()
+    board: Board | None = Board.query.filter_by(id=board_id, deleted_at=None).first()
     if not board:
         return jsonify({'message': 'Board not found'}), 404
     manager: BoardMember | None = BoardMember.query.filter_by(board_id=board.id, user_id=current_user.id).first()
@@ -1096,6 +1425,11 @@ def add_board_member(current_user, board_id) -> Tuple[Response, int]:
     user_id: str | None = data.get('user_id')
     username: str | None = data.get('username')
     role: str = data.get('role', 'member')
+    # bulk mode: { user_ids?: number[], usernames?: string[], role? }
+    if isinstance(data.get('user_ids'), list) or isinstance(data.get('usernames'), list):
+        added: list[int] = add_board_members(board.id, user_ids=data.get('user_ids'), usernames=data.get('usernames'), role=role)
+        db.session.commit()
+        return jsonify({'message': 'Members added', 'added_user_ids': added}), 201
     user_to_add_id: int | None = None
     if user_id is not None:
         try:
@@ -1119,7 +1453,7 @@ def add_board_member(current_user, board_id) -> Tuple[Response, int]:
 @token_required
 def remove_board_member(current_user, board_id, user_id) -> Tuple[Response, int]:
     """Remove a member from a specific board."""
-    board: Board | None = Board.query.filter_by(id=board_id).first()
+    board: Board | None = Board.query.filter_by(id=board_id, deleted_at=None).first()
     if not board:
         return jsonify({'message': 'Board not found'}), 404
     manager: BoardMember | None = BoardMember.query.filter_by(board_id=board.id, user_id=current_user.id).first()
@@ -0,0 +1,117 @@
+""" Per-board status and priority vocabulary, cached per vocabulary version """
+from typing import NamedTuple, Optional
+from sqlalchemy import case, func, literal, select, union_all, update
+from sqlalchemy.orm import aliased
+from models import db, Board, BoardPriority, BoardStatus, BoardTask
+from cache import VersionedCache
+from db_helpers import bump_board_version, insert_skip_duplicate
+
+# Length of board_statuses.name and board_priorities.name
+NAME_MAX_LENGTH = 50
+
+# Keyed by board id; versioned by boards.vocabulary_version, which only the status and priority
+# endpoints and _append_if_missing bump, so task writes keep the cache warm
+vocabulary_cache = VersionedCache(max_entries=2048)
+
+class Vocabulary(NamedTuple):
+    """ Ordered status and priority names of a board, with column positions and ids by status
+        name and a set of priority names for constant-time existence checks
+    """
+    statuses: tuple[str, ...]
+    priorities: tuple[str, ...]
+    status_positions: dict[str, int]
+    priority_names: frozenset[str]
+    status_ids: dict[str, int]
+
+def board_vocabulary(board: Board) -> Vocabulary:
+    """
+    The board's statuses and priorities in column order: one small query on a miss, none on a hit.
+    """
+    return vocabulary_cache.get_or_compute(board.id, board.vocabulary_version, lambda: _load(board.id))
+
+def _load(board_id: int) -> Vocabulary:
+    """
+    Uncached body of board_vocabulary: statuses and priorities in one UNION ALL.
+    """
+    rows = db.session.execute(union_all(
+        select(literal('status').label('kind'), BoardStatus.name, BoardStatus.position, BoardStatus.id).where(BoardStatus.board_id == board_id),
+        select(literal('priority').label('kind'), BoardPriority.name, BoardPriority.position, BoardPriority.id).where(BoardPriority.board_id == board_id)
+    ).order_by('kind', 'position', 'id')).all()
+    statuses = [(name, position, status_id) for kind, name, position, status_id in rows if kind == 'status']
+    priorities = [name for kind, name, _, _ in rows if kind == 'priority']
+    return Vocabulary(
+        statuses=tuple(name for name, _, _ in statuses),
+        priorities=tuple(priorities),
+        status_positions={name: position for name, position, _ in statuses},
+        priority_names=frozenset(priorities),
+        status_ids={name: status_id for name, _, status_id in statuses}
+    )
+
+def valid_name(name) -> bool:
+    """
+    True for a status or priority name that fits its column: a non-blank string of at most NAME_MAX_LENGTH characters.
+    """
+    return isinstance(name, str) and bool(name.strip()) and len(name) <= NAME_MAX_LENGTH
+
+def _append_if_missing(model, board_id: int, name: str) -> None:
+    """
+    Add a status or priority at the end of the board's list unless it already exists, as a single
+    INSERT ... SELECT MAX(position) + 1 that skips duplicates. Concurrent requests adding the same
+    name cannot both insert it, so uq_board_*_name violations no longer surface as errors.
+    """
+    if not valid_name(name):
+        raise ValueError(f'Invalid name: {name!r}')
+    # alias the SELECT side so ON DUPLICATE KEY UPDATE's column refers to the inserted row only
+    existing = aliased(model)
+    db.session.execute(insert_skip_duplicate(model).from_select(
+        ['board_id', 'name', 'position'],
+        select(literal(board_id), literal(name), func.coalesce(func.max(existing.position), 0) + 1).where(existing.board_id == board_id)
+    ))
+    bump_board_version(board_id, vocabulary=True)
+
+def ensure_status(board: Board, name: str) -> int:
+    """
+    Id of the board's status column with this name, creating the column if needed; no query when
+    the cache already knows it. Adding the column bumps the board's vocabulary version, which
+    refreshes the cached vocabulary once the caller commits. Raises ValueError for names valid_name rejects.
+    """
+    status_id: Optional[int] = board_vocabulary(board).status_ids.get(name)
+    if status_id is not None:
+        return status_id
+    _append_if_missing(BoardStatus, board.id, name)
+    return db.session.scalar(select(BoardStatus.id).where(BoardStatus.board_id == board.id, BoardStatus.name == name))
+
+def ensure_priority(board: Board, name: str) -> None:
+    """
+    Make sure the board has a priority with this name; no query when the cache already knows it.
+    Raises ValueError for names valid_name rejects.
+    """
+    if name not in board_vocabulary(board).priority_names:
+        _append_if_missing(BoardPriority, board.id, name)
+
+def status_in(names: list[str], board_id: Optional[int] = None):
+    """
+    Condition matching tasks whose status is one of the given names, on status_id so the
+    (board_id, status_id, position) index still serves it. Pass board_id when the tasks are on one board.
+    """
+    status_ids = select(BoardStatus.id).where(BoardStatus.name.in_(names))
+    if board_id is not None:
+        status_ids = status_ids.where(BoardStatus.board_id == board_id)
+    return BoardTask.status_id.in_(status_ids)
+
+def apply_order(model, board_id: int, ordered_ids: list[int]) -> bool:
+    """
+    Renumber a board's statuses or priorities (model) to the order of `ordered_ids`, which must
+    list every one of the board's ids exactly once, with one UPDATE ... CASE. Returns False,
+    without writing, when it does not. Does not commit.
+    """
+    current: set[int] = set(db.session.scalars(select(model.id).where(model.board_id == board_id)))
+    if len(ordered_ids) != len(current) or set(ordered_ids) != current:
+        return False
+    if ordered_ids:
+        db.session.execute(
+            update(model).where(model.board_id == board_id, model.id.in_(ordered_ids))
+            .values(position=case({item_id: idx for idx, item_id in enumerate(ordered_ids)}, value=model.id))
+            .execution_options(synchronize_session=False)
+        )
+    return True
@@ -0,0 +1,84 @@
+""" Set-based bulk updates of board tasks with a per-task audit trail """
+import json
+from datetime import date, datetime
+from sqlalchemy import case, func, insert, select, update
+from models import db, ActivityLog, BoardTask
+from task_labels import parse_labels, set_task_labels
+from task_search import index_tasks
+
+# Fields a bulk update may change; position is derived when status changes
+BULK_FIELDS: tuple[str, ...] = ('title', 'description', 'status', 'priority', 'assigned_to', 'sprint_id',
+                                'due_date', 'estimate', 'effort_used', 'labels')
+# Fields covered by the search index
+SEARCH_FIELDS: tuple[str, ...] = ('title', 'description', 'labels')
+
+def _json_value(value):
+    """
+    Make a column value JSON-serialisable for the audit log.
+    """
+    return value.isoformat() if isinstance(value, (date, datetime)) else value
+
+def _end_positions(board_id: int, status_id: int, moving: list[int]) -> dict[int, int]:
+    """
+    Positions at the end of the destination column for tasks moving into it, in the given order.
+    One aggregate query finds the current end of the column.
+    """
+    if not moving:
+        return {}
+    last: int | None = db.session.scalar(
+        select(func.max(BoardTask.position)).where(BoardTask.board_id == board_id, BoardTask.status_id == status_id, BoardTask.id.not_in(moving))
+    )
+    start: int = (last + 1) if last is not None else 0
+    return {task_id: start + offset for offset, task_id in enumerate(moving)}
+
+def bulk_update_board_tasks(board_id: int, user_id: int, task_ids: list[int], updates: dict) -> list[int]:
+    """
+    Apply `updates` (already validated, keys from BULK_FIELDS; a 'status' name comes with its
+    'status_id') to the given tasks of a board:
+    one SELECT ... IN for the before-snapshots, one aggregate for end-of-column positions,
+    one UPDATE (positions via CASE) and one multi-row insert of per-task ActivityLog rows.
+    When searchable text changes, the tasks are re-indexed from the snapshots with one DELETE and one INSERT;
+    new labels replace the tasks' task_labels rows with a constant number of statements.
+    Ids not on the board are ignored. Does not commit. Returns the ids that were updated.
+    """
+    columns = [BoardTask.id, BoardTask.position, BoardTask.status_id] + [getattr(BoardTask, field) for field in BULK_FIELDS]
+    rows = db.session.execute(
+        select(*columns).where(BoardTask.board_id == board_id, BoardTask.id.in_(task_ids)).order_by(BoardTask.position, BoardTask.id)
+    ).mappings().all()
+    if not rows:
+        return []
+    found: list[int] = [row['id'] for row in rows]
+    # the status name is read-only on BoardTask; status_id carries the change and the name the audit
+    audited: dict = {field: value for field, value in updates.items() if field in BULK_FIELDS}
+    values: dict = {field: value for field, value in updates.items() if field != 'status'}
+    positions: dict[int, int] = {}
+    if 'status_id' in updates:
+        # tasks already in the destination keep their place; the rest go to the end in their current order
+        positions = _end_positions(board_id, updates['status_id'], [row['id'] for row in rows if row['status_id'] != updates['status_id']])
+        if positions:
+            values['position'] = case(positions, value=BoardTask.id, else_=BoardTask.position)
+    db.session.execute(
+        update(BoardTask).where(BoardTask.board_id == board_id, BoardTask.id.in_(found)).values(values)
+        .execution_options(synchronize_session=False)
+    )
+    if any(field in updates for field in SEARCH_FIELDS):
+        index_tasks([
+            {'id': row['id'], 'board_id': board_id, **{field: updates.get(field, row[field]) for field in SEARCH_FIELDS}}
+            for row in rows
+        ])
+    if 'labels' in updates:
+        names: list[str] = parse_labels(updates['labels'])
+        set_task_labels(board_id, {task_id: names for task_id in found})
+    audit_rows: list[dict] = []
+    for row in rows:
+        before: dict = {field: _json_value(row[field]) for field in audited}
+        after: dict = {field: _json_value(value) for field, value in audited.items()}
+        if row['id'] in positions:
+            before['position'] = row['position']
+            after['position'] = positions[row['id']]
+        audit_rows.append({
+            'board_id': board_id, 'user_id': user_id, 'action': 'bulk_update', 'entity_type': 'task',
+            'entity_id': row['id'], 'before': json.dumps(before), 'after': json.dumps(after)
+        })
+    db.session.execute(insert(ActivityLog), audit_rows)
+    return found
@@ -0,0 +1,61 @@
+""" In-process caches keyed by a version such as boards.version """
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+class VersionedCache:
+    """
+    Small thread-safe LRU cache whose entries are valid for one board version.
+    Writers bump boards.version (see db_helpers.bump_board_version), so a stale
+    entry is simply never matched again and ages out; nothing has to be
+    invalidated explicitly, and every worker process stays correct on its own.
+    """
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, version: int) -> Any | None:
+        """
+        The cached value for key at this version, or None.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: Hashable, version: int, value: Any) -> None:
+        """
+        Store value for key at this version, evicting the least recently used entry if full.
+        """
+        with self._lock:
+            self._entries[key] = (version, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(self, key: Hashable, version: int, compute: Callable[[], Any]) -> Any:
+        """
+        Return the cached value or compute, store and return it. Computation runs outside the lock.
+        """
+        value = self.get(key, version)
+        if value is None:
+            value = compute()
+            self.set(key, version, value)
+        return value
+
+    def discard(self, key: Hashable) -> None:
+        """
+        Drop the entry for key, for versions too coarse to tell every write apart.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        Drop every entry.
+        """
+        with self._lock:
+            self._entries.clear()
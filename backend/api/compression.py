@@ -0,0 +1,108 @@
+""" Response compression (gzip, and Brotli when the brotli package is installed) """
+import gzip
+import os
+import zlib
+from typing import Iterable, Iterator
+from flask import Flask, Response, current_app, request
+
+try:
+    import brotli
+except ImportError:  # pinned in requirements.txt; without it only gzip is offered
+    brotli = None
+
+# Text and MessagePack payloads worth compressing; images and archives are already compressed
+COMPRESSIBLE_MIMETYPES: frozenset[str] = frozenset({
+    'application/json', 'application/javascript', 'application/x-ndjson', 'application/x-msgpack', 'application/xml',
+    'text/csv', 'text/html', 'text/plain', 'text/css', 'text/xml'
+})
+
+def _choose_encoding() -> str | None:
+    """
+    The encoding to use for this request's Accept-Encoding: br when available and preferred
+    at least as much as gzip, else gzip, else None.
+    """
+    accepted = request.accept_encodings
+    gzip_q: float = accepted.quality('gzip')
+    if brotli is not None and accepted.quality('br') > 0 and accepted.quality('br') >= gzip_q:
+        return 'br'
+    return 'gzip' if gzip_q > 0 else None
+
+def _compress_body(data: bytes, encoding: str) -> bytes:
+    """
+    Compress a complete body.
+    """
+    if encoding == 'br':
+        return brotli.compress(data, quality=current_app.config['COMPRESS_BR_LEVEL'])
+    return gzip.compress(data, compresslevel=current_app.config['COMPRESS_LEVEL'], mtime=0)
+
+def _compress_stream(chunks: Iterable[bytes], encoding: str, level: int) -> Iterator[bytes]:
+    """
+    Compress a streamed body chunk by chunk, flushing after each so the client receives data
+    as soon as it is produced instead of when the stream ends.
+    """
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=level)
+        for chunk in chunks:
+            out: bytes = compressor.process(chunk) + compressor.flush()
+            if out:
+                yield out
+        yield compressor.finish()
+        return
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        out = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if out:
+            yield out
+    yield compressor.flush()
+
+def _compressible(response: Response) -> bool:
+    """
+    True for successful text responses that are not already encoded, ranged or marked no-transform.
+    """
+    return (request.method != 'HEAD'
+            and 200 <= response.status_code < 300 and response.status_code not in (204, 206)
+            and not response.direct_passthrough
+            and response.mimetype in COMPRESSIBLE_MIMETYPES
+            and 'Content-Encoding' not in response.headers
+            and not response.cache_control.no_transform)
+
+def compress_response(response: Response) -> Response:
+    """
+    after_request hook: compress bodies of at least COMPRESS_MIN_SIZE bytes, and every streamed
+    body, with the best encoding the client accepts.
+    """
+    if not _compressible(response):
+        return response
+    if not response.is_streamed and len(response.get_data()) < current_app.config['COMPRESS_MIN_SIZE']:
+        return response
+    response.vary.add('Accept-Encoding')
+    encoding: str | None = _choose_encoding()
+    if encoding is None:
+        return response
+    if response.is_streamed:
+        level: int = current_app.config['COMPRESS_BR_LEVEL' if encoding == 'br' else 'COMPRESS_LEVEL']
+        source = response.response
+        response.response = _compress_stream(response.iter_encoded(), encoding, level)
+        if hasattr(source, 'close'):
+            response.call_on_close(source.close)
+        response.headers.pop('Content-Length', None)
+    else:
+        response.set_data(_compress_body(response.get_data(), encoding))
+    response.headers['Content-Encoding'] = encoding
+    # the encoded body is a different representation: keep ETags valid for If-None-Match only
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+def init_compression(app: Flask) -> None:
+    """
+    Read compression settings from the environment and register the after_request hook.
+    COMPRESS_ENABLED=0 turns compression off, e.g. behind a proxy that already compresses.
+    """
+    app.config.setdefault('COMPRESS_ENABLED', os.getenv('COMPRESS_ENABLED', '1') == '1')
+    app.config.setdefault('COMPRESS_MIN_SIZE', int(os.getenv('COMPRESS_MIN_SIZE', '500')))
+    app.config.setdefault('COMPRESS_LEVEL', int(os.getenv('COMPRESS_LEVEL', '6')))
+    app.config.setdefault('COMPRESS_BR_LEVEL', int(os.getenv('COMPRESS_BR_LEVEL', '4')))
+    if app.config['COMPRESS_ENABLED']:
+        app.after_request(compress_response)
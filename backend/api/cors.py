@@ -0,0 +1,64 @@
+""" CORS for the browser frontend, answered in front of the Flask app """
+import os
+from typing import Callable, Iterable, Optional
+from flask import Flask
+
+ALLOW_METHODS = 'GET, POST, PUT, PATCH, DELETE, OPTIONS'
+ALLOW_HEADERS = 'Content-Type, Authorization, If-None-Match, X-Profile-Request, X-Admin-Token'
+# Response headers the frontend may read: rate-limit waits, cache validators and page totals
+EXPOSE_HEADERS = 'Retry-After, ETag, X-Total-Count'
+
+class CorsMiddleware:
+    """
+    WSGI middleware adding CORS headers for allowed origins. Preflight requests are answered
+    here, before Flask builds a request context, opens a session or dispatches to a blueprint,
+    and carry Access-Control-Max-Age so browsers reuse them instead of preflighting every
+    JSON PUT/POST/DELETE. Origins are exact matches; '*' allows any origin (echoed back,
+    since credentials are allowed).
+    """
+    def __init__(self, wsgi_app: Callable, origins: Iterable[str], max_age: int):
+        self.wsgi_app = wsgi_app
+        self.origins: frozenset[str] = frozenset(origin.rstrip('/') for origin in origins if origin)
+        self.preflight_headers: list[tuple[str, str]] = [
+            ('Access-Control-Allow-Methods', ALLOW_METHODS),
+            ('Access-Control-Allow-Headers', ALLOW_HEADERS),
+            ('Access-Control-Max-Age', str(max_age))
+        ]
+
+    def _allowed(self, origin: Optional[str]) -> bool:
+        return bool(origin) and ('*' in self.origins or origin in self.origins)
+
+    def __call__(self, environ: dict, start_response: Callable):
+        origin: Optional[str] = environ.get('HTTP_ORIGIN')
+        allowed: bool = self._allowed(origin)
+        cors_headers: list[tuple[str, str]] = [
+            ('Access-Control-Allow-Origin', origin), ('Access-Control-Allow-Credentials', 'true')
+        ] if allowed else []
+        if environ.get('REQUEST_METHOD') == 'OPTIONS' and 'HTTP_ACCESS_CONTROL_REQUEST_METHOD' in environ:
+            headers: list[tuple[str, str]] = [('Vary', 'Origin'), ('Content-Length', '0')]
+            if allowed:
+                headers += cors_headers + self.preflight_headers
+            start_response('204 No Content', headers)
+            return []
+        if not origin:
+            return self.wsgi_app(environ, start_response)
+
+        def start_with_cors(status: str, headers: list, exc_info=None):
+            vary: Optional[str] = next((value for name, value in headers if name.lower() == 'vary'), None)
+            headers = [(name, value) for name, value in headers if name.lower() != 'vary']
+            headers.append(('Vary', f'{vary}, Origin' if vary else 'Origin'))
+            if allowed:
+                headers += cors_headers + [('Access-Control-Expose-Headers', EXPOSE_HEADERS)]
+            return start_response(status, headers, exc_info)
+
+        return self.wsgi_app(environ, start_with_cors)
+
+def init_cors(app: Flask) -> None:
+    """
+    Read CORS settings from the environment and wrap the app's WSGI callable.
+    CORS_ORIGINS is a comma-separated list of allowed origins.
+    """
+    app.config.setdefault('CORS_ORIGINS', os.getenv('CORS_ORIGINS', 'http://localhost:3000'))
+    app.config.setdefault('CORS_MAX_AGE', int(os.getenv('CORS_MAX_AGE', '7200')))
+    origins: list[str] = [origin.strip() for origin in app.config['CORS_ORIGINS'].split(',')]
+    app.wsgi_app = CorsMiddleware(app.wsgi_app, origins, app.config['CORS_MAX_AGE'])
@@ -0,0 +1,53 @@
+""" Dialect-aware SQL helpers shared by the route modules """
+from sqlalchemy import insert, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.sql.dml import Insert
+from models import db, Board
+
+def dialect_name() -> str:
+    """
+    Name of the SQL dialect bound to the current session, e.g. 'mysql' or 'sqlite'.
+    """
+    return db.session.get_bind().dialect.name
+
+def insert_ignore(model) -> Insert:
+    """
+    Multi-row INSERT that silently skips rows violating a unique key.
+    Uses INSERT IGNORE on MySQL and INSERT OR IGNORE on SQLite.
+    """
+    stmt: Insert = insert(model)
+    dialect: str = dialect_name()
+    if dialect == 'mysql':
+        return stmt.prefix_with('IGNORE')
+    if dialect == 'sqlite':
+        return stmt.prefix_with('OR IGNORE')
+    return stmt
+
+def insert_skip_duplicate(model) -> Insert:
+    """
+    INSERT that skips a row only when it duplicates a unique key. Unlike insert_ignore, MySQL
+    still raises NOT NULL and truncation errors: ON DUPLICATE KEY UPDATE id = id on MySQL,
+    ON CONFLICT DO NOTHING on SQLite.
+    """
+    dialect: str = dialect_name()
+    if dialect == 'mysql':
+        return mysql_insert(model).on_duplicate_key_update(id=model.id)
+    if dialect == 'sqlite':
+        return sqlite_insert(model).on_conflict_do_nothing()
+    return insert(model)
+
+def bump_board_version(board_id: int, vocabulary: bool = False) -> None:
+    """
+    Increment boards.version in the caller's transaction. Call from every write that changes
+    a board's tasks, sprints, statuses or priorities so caches keyed on the version miss.
+    Pass vocabulary=True when statuses or priorities change to also increment
+    boards.vocabulary_version, which keys the status/priority name cache.
+    """
+    values: dict = {'version': Board.version + 1}
+    if vocabulary:
+        values['vocabulary_version'] = Board.vocabulary_version + 1
+    db.session.execute(
+        update(Board).where(Board.id == board_id).values(**values)
+        .execution_options(synchronize_session=False)
+    )
@@ -0,0 +1,239 @@
+""" Asynchronous cascade deletion of boards and users in bounded batches """
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Iterator, Tuple
+import sqlalchemy.exc
+from flask import Blueprint, Flask, Response, jsonify
+from sqlalchemy import and_, delete, or_, select, update
+from models import db, ActivityLog, Board, BoardLabel, BoardMember, BoardPriority, BoardSprint, BoardStatus, BoardTask, BoardTemplate, DeletionJob, RefreshToken, SprintSummary, TaskDependency, TaskLabel, TaskSearchTerm, User, UserDefaults
+from auth_middleware import token_required
+from db_helpers import dialect_name
+
+deletion_bp = Blueprint('deletions', __name__)
+
+# Jobs left 'running' longer than this (e.g. the worker process died) are picked up again
+STALE_JOB_SECONDS = 600
+MAX_ATTEMPTS = 5
+
+# A step deletes or updates at most batch_size rows and returns how many it touched
+Step = Tuple[str, Callable[[int], int]]
+
+_wake = threading.Event()
+
+def _batched_delete(table, condition) -> Callable[[int], int]:
+    """
+    DELETE ... LIMIT n on MySQL; elsewhere DELETE ... WHERE id IN (SELECT id ... LIMIT n).
+    """
+    def run(batch_size: int) -> int:
+        if dialect_name() == 'mysql':
+            stmt = delete(table).where(condition).with_dialect_options(mysql_limit=batch_size)
+        else:
+            stmt = delete(table).where(table.c.id.in_(select(table.c.id).where(condition).limit(batch_size)))
+        return db.session.execute(stmt).rowcount
+    return run
+
+def _batched_update(table, condition, values: dict) -> Callable[[int], int]:
+    """
+    UPDATE ... LIMIT n on MySQL; elsewhere UPDATE ... WHERE id IN (SELECT id ... LIMIT n).
+    The condition must stop matching once a row is updated.
+    """
+    def run(batch_size: int) -> int:
+        if dialect_name() == 'mysql':
+            stmt = update(table).where(condition).values(values).with_dialect_options(mysql_limit=batch_size)
+        else:
+            stmt = update(table).where(table.c.id.in_(select(table.c.id).where(condition).limit(batch_size))).values(values)
+        return db.session.execute(stmt).rowcount
+    return run
+
+def _board_steps(board_id: int) -> list[Step]:
+    """
+    Purge order for one board: leaf tables first, the board row last.
+    """
+    steps: list[Step] = []
+    for model in (TaskSearchTerm, TaskLabel, TaskDependency, ActivityLog, SprintSummary, BoardTask, BoardLabel, BoardSprint, BoardStatus, BoardPriority, BoardMember):
+        table = model.__table__
+        steps.append((table.name, _batched_delete(table, table.c.board_id == board_id)))
+    boards = Board.__table__
+    steps.append((boards.name, _batched_delete(boards, boards.c.id == board_id)))
+    return steps
+
+def _user_steps(user_id: int) -> Iterator[Step]:
+    """
+    Purge every board the user owns, detach them from other boards, then delete the user row.
+    Tasks they created on other boards are handed to that board's owner.
+    """
+    owned: list[int] = list(db.session.scalars(select(Board.id).where(Board.owner_id == user_id).order_by(Board.id)))
+    for board_id in owned:
+        yield from _board_steps(board_id)
+    tasks = BoardTask.__table__
+    logs = ActivityLog.__table__
+    members = BoardMember.__table__
+    board_owner = select(Board.owner_id).where(Board.id == tasks.c.board_id).scalar_subquery()
+    yield members.name, _batched_delete(members, members.c.user_id == user_id)
+    yield 'board_tasks.assigned_to', _batched_update(tasks, tasks.c.assigned_to == user_id, {'assigned_to': None})
+    yield 'board_tasks.created_by', _batched_update(tasks, tasks.c.created_by == user_id, {'created_by': board_owner})
+    yield 'activity_logs.user_id', _batched_update(logs, logs.c.user_id == user_id, {'user_id': None})
+    summaries = SprintSummary.__table__
+    yield 'sprint_summaries.completed_by', _batched_update(summaries, summaries.c.completed_by == user_id, {'completed_by': None})
+    for model, column in ((BoardTemplate, 'owner_id'), (UserDefaults, 'user_id'), (RefreshToken, 'user_id'), (User, 'id')):
+        table = model.__table__
+        yield table.name, _batched_delete(table, table.c[column] == user_id)
+
+def schedule_board_deletion(board: Board, requested_by: int) -> DeletionJob:
+    """
+    Hide the board immediately and queue its purge. Only flushes; the caller commits.
+    """
+    board.deleted_at = datetime.utcnow()
+    job = DeletionJob(entity_type='board', entity_id=board.id, requested_by=requested_by)
+    db.session.add(job)
+    db.session.flush()
+    return job
+
+def schedule_user_deletion(user: User, requested_by: int) -> DeletionJob:
+    """
+    Hide the user and every board they own with one UPDATE, then queue the purge.
+    Only flushes; the caller commits.
+    """
+    now: datetime = datetime.utcnow()
+    user.deleted_at = now
+    db.session.execute(update(Board).where(Board.owner_id == user.id, Board.deleted_at.is_(None)).values(deleted_at=now))
+    job = DeletionJob(entity_type='user', entity_id=user.id, requested_by=requested_by)
+    db.session.add(job)
+    db.session.flush()
+    return job
+
+def notify_worker() -> None:
+    """
+    Wake the background worker after a deletion has been committed.
+    """
+    _wake.set()
+
+def _claimable():
+    """
+    Pending jobs, plus running jobs whose worker stopped reporting progress.
+    """
+    stale: datetime = datetime.utcnow() - timedelta(seconds=STALE_JOB_SECONDS)
+    return or_(DeletionJob.status == 'pending', and_(DeletionJob.status == 'running', DeletionJob.updated_at < stale))
+
+def _claim_next_job() -> DeletionJob | None:
+    """
+    Atomically move the oldest claimable job to 'running'; safe with several workers.
+    """
+    while True:
+        job_id: int | None = db.session.scalar(select(DeletionJob.id).where(_claimable()).order_by(DeletionJob.id).limit(1))
+        if job_id is None:
+            return None
+        claimed: int = db.session.execute(
+            update(DeletionJob).where(DeletionJob.id == job_id, _claimable())
+            .values(status='running', updated_at=datetime.utcnow())
+        ).rowcount
+        db.session.commit()
+        if claimed == 1:
+            return db.session.get(DeletionJob, job_id)
+
+def _run_job(job: DeletionJob, batch_size: int) -> None:
+    """
+    Run every step of a job, committing each batch together with the job's progress so
+    locks are held for one batch at a time and progress survives a restart.
+    """
+    steps: Iterator[Step] = iter(_board_steps(job.entity_id)) if job.entity_type == 'board' else _user_steps(job.entity_id)
+    for name, run_batch in steps:
+        while True:
+            affected: int = run_batch(batch_size)
+            job.current_step = name
+            job.rows_deleted += affected
+            job.updated_at = datetime.utcnow()
+            db.session.commit()
+            if affected < batch_size:
+                break
+    job.status = 'done'
+    job.current_step = None
+    job.finished_at = datetime.utcnow()
+    job.updated_at = job.finished_at
+    db.session.commit()
+
+def run_pending_jobs(batch_size: int = 1000, max_jobs: int | None = None) -> int:
+    """
+    Process queued deletion jobs until none are left (or max_jobs ran). Returns the number of jobs run.
+    A failing job goes back to 'pending' and is marked 'failed' after MAX_ATTEMPTS tries.
+    """
+    processed: int = 0
+    while max_jobs is None or processed < max_jobs:
+        job: DeletionJob | None = _claim_next_job()
+        if job is None:
+            break
+        processed += 1
+        job_id: int = job.id
+        try:
+            _run_job(job, batch_size)
+        except sqlalchemy.exc.SQLAlchemyError as err:
+            db.session.rollback()
+            job = db.session.get(DeletionJob, job_id)
+            if job is not None:
+                job.attempts += 1
+                job.status = 'failed' if job.attempts >= MAX_ATTEMPTS else 'pending'
+                job.error = str(err)[:2000]
+                job.updated_at = datetime.utcnow()
+                db.session.commit()
+            # retry on the next poll rather than spinning on the same error
+            break
+    return processed
+
+def _worker_loop(app: Flask) -> None:
+    """
+    Poll for deletion jobs forever; woken early by notify_worker().
+    """
+    while True:
+        _wake.clear()
+        with app.app_context():
+            try:
+                run_pending_jobs(app.config['DELETION_BATCH_SIZE'])
+            except sqlalchemy.exc.SQLAlchemyError:
+                db.session.rollback()
+                app.logger.exception('Deletion worker failed')
+            finally:
+                db.session.remove()
+        _wake.wait(app.config['DELETION_POLL_SECONDS'])
+
+def init_deletion_worker(app: Flask) -> None:
+    """
+    Read configuration from the environment and start the background deletion worker
+    thread unless DELETION_WORKER_ENABLED=0 (e.g. when a separate process runs the jobs).
+    """
+    app.config.setdefault('DELETION_WORKER_ENABLED', os.getenv('DELETION_WORKER_ENABLED', '1') == '1')
+    app.config.setdefault('DELETION_BATCH_SIZE', int(os.getenv('DELETION_BATCH_SIZE', '1000')))
+    app.config.setdefault('DELETION_POLL_SECONDS', float(os.getenv('DELETION_POLL_SECONDS', '5')))
+    if app.config['DELETION_WORKER_ENABLED']:
+        threading.Thread(target=_worker_loop, args=(app,), name='deletion-worker', daemon=True).start()
+
+def serialize_job(job: DeletionJob) -> dict:
+    """
+    API shape of a deletion job.
+    """
+    return {
+        'id': job.id,
+        'entity_type': job.entity_type,
+        'entity_id': job.entity_id,
+        'status': job.status,
+        'current_step': job.current_step,
+        'rows_deleted': job.rows_deleted,
+        'attempts': job.attempts,
+        'error': job.error if job.status == 'failed' else None,
+        'created_at': job.created_at.isoformat() if job.created_at else None,
+        'finished_at': job.finished_at.isoformat() if job.finished_at else None
+    }
+
+@deletion_bp.route('/deletions/<int:job_id>', methods=['GET'])
+@token_required
+def get_deletion_job(current_user, job_id) -> Tuple[Response, int]:
+    """
+    Progress of a deletion job requested by the current user.
+    """
+    try:
+        job: DeletionJob | None = DeletionJob.query.filter_by(id=job_id, requested_by=current_user.id).first()
+        if not job:
+            return jsonify({'message': 'Deletion job not found'}), 404
+        return jsonify(serialize_job(job)), 200
+    except sqlalchemy.exc.SQLAlchemyError:
+        return jsonify({'message': 'Internal server error'}), 500
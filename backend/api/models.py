@@ -3,8 +3,8 @@ from __future__ import annotations
 from typing import Optional
 from datetime import datetime, date
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import String, Integer, Text, ForeignKey, DateTime, Date
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import JSON, String, Integer, Text, ForeignKey, DateTime, Date, select
+from sqlalchemy.orm import Mapped, column_property, mapped_column, relationship
 
 db = SQLAlchemy()
 
@@ -24,12 +24,67 @@ class User(db.Model):
     password: Mapped[str] = mapped_column(String(255), nullable=False)
     email: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=db.func.current_timestamp())
+    # Set when the account is scheduled for deletion; the row is purged by the deletion worker
+    deleted_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True, default=None)
 
     def __init__(self, username, password, email):
         self.username = username
         self.password = password
         self.email = email
 
+class RefreshToken(db.Model):
+    """ Rotating refresh token; only a SHA-256 of the token is stored
+        {
+            id: int,
+            user_id: int,
+            session_id: int,  # id of the first token of the login session; shared by its rotations
+            token_hash: str,
+            expires_at: datetime,
+            used_at: datetime,  # set when rotated; presenting a used token revokes the session
+            revoked_at: datetime,
+            created_at: datetime
+        }
+    """
+    __tablename__ = 'refresh_tokens'
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
+    session_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True, index=True)
+    token_hash: Mapped[str] = mapped_column(String(64), unique=True, nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    used_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True, default=None)
+    revoked_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True, default=None)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=db.func.current_timestamp())
+
+    def __init__(self, user_id: int, token_hash: str, expires_at: datetime, session_id: Optional[int] = None):
+        self.user_id = user_id
+        self.token_hash = token_hash
+        self.expires_at = expires_at
+        self.session_id = session_id
+
+class TokenRevocation(db.Model):
+    """ Revocation of a login session or of every token of a user, polled by each worker process
+        {
+            id: int,
+            user_id: int,
+            session_id: int,
+            revoked_at: datetime
+        }
+    """
+    __tablename__ = 'token_revocations'
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    # No foreign keys: a revocation must outlive the deleted user it is about
+    user_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    session_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    # each worker re-reads a trailing window of revoked_at (auth_tokens.RevocationList.sync)
+    revoked_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
+
+    def __init__(self, revoked_at: datetime, user_id: Optional[int] = None, session_id: Optional[int] = None):
+        self.revoked_at = revoked_at
+        self.user_id = user_id
+        self.session_id = session_id
+
 # New models for Boards and Tasks on Boards
 class Board(db.Model):
     """ Board Model
@@ -38,6 +93,7 @@ class Board(db.Model):
             name: str,
             description: str,
             owner_id: int,
+            version: int,
             created_at: datetime,
             updated_at: datetime
         }
@@ -54,6 +110,12 @@ class Board(db.Model):
     sprint_end: Mapped[Optional[date]] = mapped_column(Date, nullable=True, default=None)
     # Optional background color for the board UI (e.g. hex like #ffffff)
     background_color: Mapped[Optional[str]] = mapped_column(String(20), nullable=True, default=None)
+    # Incremented by every write to the board's tasks, sprints, statuses or priorities; keys derived-data caches
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default='0')
+    # Incremented only when the board's statuses or priorities change; keys the vocabulary cache
+    vocabulary_version: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default='0')
+    # Soft-delete marker: deleted boards are hidden at once and purged in batches by the deletion worker
+    deleted_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True, default=None)
 
     owner: Mapped['User'] = relationship('User', backref=db.backref('boards', lazy=True))
 
@@ -79,9 +141,9 @@ class UserDefaults(db.Model):
     __tablename__: str = 'user_defaults'
     id: Mapped[int] = mapped_column(primary_key=True)
     user_id: Mapped[int] = mapped_column(ForeignKey('users.id', ondelete='CASCADE'), nullable=False, unique=True)
-    # Store as JSON-encoded TEXT to work across MySQL/SQLite
-    default_statuses: Mapped[str] = mapped_column(Text)
-    default_priorities: Mapped[str] = mapped_column(Text)
+    # Native JSON on MySQL; SQLite stores the encoded text. Read through user_defaults.user_defaults
+    default_statuses: Mapped[Optional[list]] = mapped_column(JSON)
+    default_priorities: Mapped[Optional[list]] = mapped_column(JSON)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=db.func.current_timestamp(), onupdate=db.func.current_timestamp())
 
     user: Mapped['User'] = relationship('User', backref=db.backref('defaults', lazy=True, cascade="all, delete-orphan"))
@@ -91,6 +153,34 @@ class UserDefaults(db.Model):
         self.default_statuses = default_statuses
         self.default_priorities = default_priorities
 
+class BoardTemplate(db.Model):
+    """ Saved board template (statuses and priorities) owned by a user
+        {
+            id: int,
+            owner_id: int,
+            name: str,
+            statuses: list[str],
+            priorities: list[str],
+            created_at: datetime
+        }
+    """
+    __tablename__: str = 'board_templates'
+    id: Mapped[int] = mapped_column(primary_key=True)
+    owner_id: Mapped[int] = mapped_column(ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
+    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    # Store as JSON-encoded TEXT to work across MySQL/SQLite
+    statuses: Mapped[str] = mapped_column(Text)
+    priorities: Mapped[str] = mapped_column(Text)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=db.func.current_timestamp())
+
+    owner: Mapped['User'] = relationship('User', backref=db.backref('board_templates', lazy=True, cascade="all, delete-orphan"))
+
+    def __init__(self, owner_id, name, statuses, priorities):
+        self.owner_id = owner_id
+        self.name = name
+        self.statuses = statuses
+        self.priorities = priorities
+
 class BoardStatus(db.Model):
     """ Custom statuses per board
         {
@@ -151,6 +241,7 @@ class BoardTask(db.Model):
             board_id: int,
             title: str,
             description: str,
+            status_id: int,
             assigned_to: int,
             created_by: int,
             due_date: date,
@@ -163,7 +254,12 @@ class BoardTask(db.Model):
     id: Mapped[int] = mapped_column(primary_key=True)
     title: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    status: Mapped[str] = mapped_column(String(50), default='todo')  # free-form tied to BoardStatus.name
+    # column (BoardStatus) the task is in; renaming a status is a single-row update
+    status_id: Mapped[Optional[int]] = mapped_column(ForeignKey('board_statuses.id', ondelete='SET NULL'), nullable=True)
+    # read-only status name for API responses; filter and group on status_id in hot queries
+    status: Mapped[Optional[str]] = column_property(
+        select(BoardStatus.name).where(BoardStatus.id == status_id).correlate_except(BoardStatus).scalar_subquery()
+    )
     # priority becomes a free-form string tied to BoardPriority.name
     priority: Mapped[str] = mapped_column(String(50), default='medium')
     board_id: Mapped[int] = mapped_column(ForeignKey('boards.id', ondelete='CASCADE'))
@@ -179,21 +275,27 @@ class BoardTask(db.Model):
     effort_used: Mapped[Optional[int]] = mapped_column(Integer, nullable=True, default=0)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=db.func.current_timestamp())
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=db.func.current_timestamp(), onupdate=db.func.current_timestamp())
-    # optional labels stored as CSV for simplicity
-    labels: Mapped[Optional[str]] = mapped_column(String(255), nullable=True, default=None)
+    # labels as CSV for the API shape; board_labels/task_labels are the indexed source for filters and counts
+    labels: Mapped[Optional[str]] = mapped_column(Text, nullable=True, default=None)
+
+    __table_args__ = (
+        # "my work": a user's assigned tasks in due-date order, keyset paginated on (due_date, id)
+        db.Index('idx_board_tasks_assignee_due', 'assigned_to', 'due_date', 'id'),
+        db.Index('idx_board_tasks_board_status_id_position', 'board_id', 'status_id', 'position'),
+    )
 
     board: Mapped['Board'] = relationship('Board', backref=db.backref('tasks', lazy=True, cascade="all, delete-orphan"))
     assignee: Mapped['User'] = relationship('User', foreign_keys=[assigned_to], backref=db.backref('assigned_board_tasks', lazy=True))
     creator: Mapped['User'] = relationship('User', foreign_keys=[created_by], backref=db.backref('created_board_tasks', lazy=True))
 
-    def __init__(self, title, description, assigned_to, created_by, due_date, position, status, priority, board_id, estimate=None, effort_used: Optional[int] | None = 0, labels: Optional[str] = None, sprint_id: Optional[int] = None):
+    def __init__(self, title, description, assigned_to, created_by, due_date, position, status_id, priority, board_id, estimate=None, effort_used: Optional[int] | None = 0, labels: Optional[str] = None, sprint_id: Optional[int] = None):
         self.title = title
         self.description = description
         self.assigned_to = assigned_to
         self.created_by = created_by
         self.due_date = due_date
         self.position = position
-        self.status = status
+        self.status_id = status_id
         self.priority = priority
         self.board_id = board_id
         self.estimate = estimate
@@ -219,6 +321,7 @@ class BoardMember(db.Model):
 
     __table_args__ = (
         db.UniqueConstraint('board_id', 'user_id', name='uq_board_user'),
+        db.Index('idx_board_members_board_role', 'board_id', 'role'),
     )
 
     board: Mapped['Board'] = relationship('Board', backref=db.backref('members', lazy=True, cascade="all, delete-orphan"))
@@ -255,6 +358,74 @@ class TaskDependency(db.Model):
         self.blocker_task_id = blocker_task_id
         self.blocked_task_id = blocked_task_id
 
+class BoardLabel(db.Model):
+    """ Label defined on a board
+        {
+            id: int,
+            board_id: int,
+            name: str
+        }
+    """
+    __tablename__ = 'board_labels'
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    board_id: Mapped[int] = mapped_column(ForeignKey('boards.id', ondelete='CASCADE'), nullable=False)
+    name: Mapped[str] = mapped_column(String(50), nullable=False)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=db.func.current_timestamp())
+
+    __table_args__ = (
+        db.UniqueConstraint('board_id', 'name', name='uq_board_label_name'),
+    )
+
+    def __init__(self, board_id: int, name: str):
+        self.board_id = board_id
+        self.name = name
+
+class TaskLabel(db.Model):
+    """ Label attached to a task. board_id is denormalised so label filters and
+        counts are served from the (board_id, label_id, task_id) index alone.
+    """
+    __tablename__ = 'task_labels'
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    board_id: Mapped[int] = mapped_column(ForeignKey('boards.id', ondelete='CASCADE'), nullable=False)
+    task_id: Mapped[int] = mapped_column(ForeignKey('board_tasks.id', ondelete='CASCADE'), nullable=False)
+    label_id: Mapped[int] = mapped_column(ForeignKey('board_labels.id', ondelete='CASCADE'), nullable=False)
+
+    __table_args__ = (
+        db.UniqueConstraint('task_id', 'label_id', name='uq_task_label'),
+        db.Index('idx_task_labels_board_label_task', 'board_id', 'label_id', 'task_id'),
+    )
+
+    def __init__(self, board_id: int, task_id: int, label_id: int):
+        self.board_id = board_id
+        self.task_id = task_id
+        self.label_id = label_id
+
+class TaskSearchTerm(db.Model):
+    """ Inverted index for task search: one row per distinct term of a task's title,
+        description and labels, weighted by where (and how often) the term appears.
+        Maintained by the task write paths through task_search.index_tasks.
+    """
+    __tablename__ = 'task_search_terms'
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    task_id: Mapped[int] = mapped_column(ForeignKey('board_tasks.id', ondelete='CASCADE'), nullable=False)
+    board_id: Mapped[int] = mapped_column(ForeignKey('boards.id', ondelete='CASCADE'), nullable=False)
+    term: Mapped[str] = mapped_column(String(64), nullable=False)
+    weight: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+
+    __table_args__ = (
+        db.UniqueConstraint('task_id', 'term', name='uq_task_search_term'),
+        db.Index('idx_task_search_board_term', 'board_id', 'term'),
+    )
+
+    def __init__(self, task_id: int, board_id: int, term: str, weight: int = 1):
+        self.task_id = task_id
+        self.board_id = board_id
+        self.term = term
+        self.weight = weight
+
 class BoardSprint(db.Model):
     """Multiple sprints per board"""
     __tablename__ = 'board_sprints'
@@ -278,6 +449,68 @@ class BoardSprint(db.Model):
         self.goal = goal
         self.is_active = is_active
 
+class SprintSummary(db.Model):
+    """ Velocity record written when a sprint is completed
+        {
+            id: int,
+            board_id: int,
+            sprint_id: int,
+            name: str,
+            start_date: date,
+            end_date: date,
+            committed_tasks: int,
+            completed_tasks: int,
+            carried_over_tasks: int,
+            committed_points: int,
+            completed_points: int,
+            effort_used: int,
+            next_sprint_id: int,
+            completed_by: int,
+            completed_at: datetime
+        }
+    """
+    __tablename__ = 'sprint_summaries'
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    board_id: Mapped[int] = mapped_column(ForeignKey('boards.id', ondelete='CASCADE'), nullable=False)
+    # Kept when the sprint is deleted so velocity history survives
+    sprint_id: Mapped[Optional[int]] = mapped_column(ForeignKey('board_sprints.id', ondelete='SET NULL'), nullable=True, unique=True)
+    name: Mapped[Optional[str]] = mapped_column(String(100), nullable=True, default=None)
+    start_date: Mapped[date] = mapped_column(Date, nullable=False)
+    end_date: Mapped[date] = mapped_column(Date, nullable=False)
+    committed_tasks: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    completed_tasks: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    carried_over_tasks: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    committed_points: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    completed_points: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    effort_used: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    next_sprint_id: Mapped[Optional[int]] = mapped_column(ForeignKey('board_sprints.id', ondelete='SET NULL'), nullable=True)
+    completed_by: Mapped[Optional[int]] = mapped_column(ForeignKey('users.id', ondelete='SET NULL'), nullable=True)
+    completed_at: Mapped[datetime] = mapped_column(DateTime, default=db.func.current_timestamp())
+
+    __table_args__ = (
+        db.Index('idx_sprint_summaries_board_end', 'board_id', 'end_date'),
+    )
+
+    board: Mapped['Board'] = relationship('Board', backref=db.backref('sprint_summaries', lazy=True, cascade="all, delete-orphan"))
+
+    def __init__(self, board_id: int, sprint_id: Optional[int], name: Optional[str], start_date: date, end_date: date,
+                 committed_tasks: int = 0, completed_tasks: int = 0, carried_over_tasks: int = 0, committed_points: int = 0,
+                 completed_points: int = 0, effort_used: int = 0, next_sprint_id: Optional[int] = None, completed_by: Optional[int] = None):
+        self.board_id = board_id
+        self.sprint_id = sprint_id
+        self.name = name
+        self.start_date = start_date
+        self.end_date = end_date
+        self.committed_tasks = committed_tasks
+        self.completed_tasks = completed_tasks
+        self.carried_over_tasks = carried_over_tasks
+        self.committed_points = committed_points
+        self.completed_points = completed_points
+        self.effort_used = effort_used
+        self.next_sprint_id = next_sprint_id
+        self.completed_by = completed_by
+
 # Activity / Audit log
 class ActivityLog(db.Model):
     """Audit trail for changes on boards and tasks"""
@@ -304,3 +537,48 @@ class ActivityLog(db.Model):
         self.entity_id = entity_id
         self.before = before
         self.after = after
+
+class DeletionJob(db.Model):
+    """ Background purge of a soft-deleted board or user
+        {
+            id: int,
+            entity_type: str,  # board|user
+            entity_id: int,
+            requested_by: int,
+            status: str,  # pending|running|done|failed
+            current_step: str,
+            rows_deleted: int,
+            attempts: int,
+            error: str,
+            created_at: datetime,
+            updated_at: datetime,
+            finished_at: datetime
+        }
+    """
+    __tablename__ = 'deletion_jobs'
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    entity_type: Mapped[str] = mapped_column(String(20), nullable=False)
+    # No foreign keys: the job outlives the rows it deletes
+    entity_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    requested_by: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default='pending')
+    current_step: Mapped[Optional[str]] = mapped_column(String(50), nullable=True, default=None)
+    rows_deleted: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True, default=None)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=db.func.current_timestamp())
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=db.func.current_timestamp(), onupdate=db.func.current_timestamp())
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True, default=None)
+
+    __table_args__ = (
+        db.Index('idx_deletion_jobs_status', 'status', 'id'),
+    )
+
+    def __init__(self, entity_type: str, entity_id: int, requested_by: Optional[int] = None):
+        self.entity_type = entity_type
+        self.entity_id = entity_id
+        self.requested_by = requested_by
+        self.status = 'pending'
+        self.rows_deleted = 0
+        self.attempts = 0
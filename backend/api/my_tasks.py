@@ -0,0 +1,65 @@
+""" "My work": tasks assigned to a user across every board they can see, keyset paginated """
+import base64
+import json
+from datetime import date
+from typing import Optional
+from sqlalchemy import and_, or_, select
+from models import db, Board, BoardSprint, BoardTask
+from board_vocabulary import status_in
+from portfolio import visible_boards_condition
+
+MY_TASKS_MAX_LIMIT = 200
+
+def encode_cursor(due_date: Optional[date], task_id: int) -> str:
+    """
+    Opaque cursor for the position after a task in (due_date, id) order.
+    """
+    raw: str = json.dumps({'due': due_date.isoformat() if due_date else None, 'id': task_id})
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_cursor(cursor: str) -> tuple[Optional[date], int]:
+    """
+    Inverse of encode_cursor. Raises ValueError for anything it did not produce.
+    """
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+        return (date.fromisoformat(data['due']) if data['due'] else None), int(data['id'])
+    except (TypeError, KeyError, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError('Invalid cursor') from e
+
+def assigned_tasks(user_id: int, statuses: list[str], due_before: Optional[date] = None, active_sprint: bool = False,
+                   after: Optional[tuple[Optional[date], int]] = None, limit: int = 50) -> tuple[list, Optional[str]]:  # pylint: disable=too-many-arguments
+    """
+    (BoardTask, board name) rows assigned to the user on boards they own or belong to, ordered by
+    due date then id with undated tasks last, plus the cursor of the next page (None on the last page).
+
+    Dated and undated tasks are read with separate range scans of idx_board_tasks_assignee_due,
+    so each page is one or two index-ordered queries however many tasks the user has.
+    """
+    base = (select(BoardTask, Board.name)
+            .join(Board, Board.id == BoardTask.board_id)
+            .where(BoardTask.assigned_to == user_id, visible_boards_condition(user_id)))
+    if statuses:
+        base = base.where(status_in(statuses))
+    if due_before:
+        base = base.where(BoardTask.due_date < due_before)
+    if active_sprint:
+        base = base.where(BoardTask.sprint_id.in_(select(BoardSprint.id).where(BoardSprint.is_active == 1)))
+
+    rows: list = []
+    after_due, after_id = after if after else (None, None)
+    if after is None or after_due is not None:
+        dated = base.where(BoardTask.due_date.is_not(None))
+        if after is not None:
+            dated = dated.where(or_(BoardTask.due_date > after_due, and_(BoardTask.due_date == after_due, BoardTask.id > after_id)))
+        rows = list(db.session.execute(dated.order_by(BoardTask.due_date, BoardTask.id).limit(limit + 1)).all())
+    if len(rows) <= limit and due_before is None:
+        undated = base.where(BoardTask.due_date.is_(None))
+        if after is not None and after_due is None:
+            undated = undated.where(BoardTask.id > after_id)
+        rows += db.session.execute(undated.order_by(BoardTask.id).limit(limit + 1 - len(rows))).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last: BoardTask = rows[-1][0]
+    return rows, encode_cursor(last.due_date, last.id)
@@ -0,0 +1,112 @@
+""" Password hashing on a small bounded pool instead of every request thread """
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Callable, Optional
+from flask import Flask, current_app
+from werkzeug.security import check_password_hash, generate_password_hash
+
+# werkzeug's default for 3.x, spelled out so stored hashes can be compared against it
+DEFAULT_HASH_METHOD = 'scrypt:32768:8:1'
+
+class HashingBusy(Exception):
+    """ Raised when the hashing queue is full or a hash did not finish in time """
+
+class PasswordHasher:
+    """
+    Runs werkzeug hashing on `workers` dedicated threads, so at most that many cores hash at
+    once however many requests arrive: hashlib's scrypt and pbkdf2 release the GIL, so the rest
+    of the API keeps running alongside. At most `max_pending` hashes are queued or running and
+    callers beyond that get HashingBusy immediately instead of piling up.
+    With workers=0 hashing runs inline on the calling thread.
+    """
+    def __init__(self, method: str = DEFAULT_HASH_METHOD, workers: int = 0, max_pending: int = 32, timeout: float = 10.0):
+        self.method = method
+        # werkzeug stores methods with every parameter spelled out ('scrypt' as 'scrypt:32768:8:1',
+        # 'pbkdf2:sha256' as 'pbkdf2:sha256:600000'); compare stored hashes against that form
+        self.stored_method: str = generate_password_hash('', method).split('$', 1)[0]
+        self.workers = workers
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max(1, max_pending))
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _executor(self) -> ThreadPoolExecutor:
+        """
+        The pool, created on first use so forked server workers each start their own.
+        """
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='password-hash')
+            return self._pool
+
+    def _run(self, func: Callable, *args):
+        """
+        Run func(*args) in the pool, or inline without workers.
+        """
+        if not self.workers:
+            return func(*args)
+        if not self._slots.acquire(blocking=False):
+            raise HashingBusy('Too many password hashes pending')
+        try:
+            future: Future = self._executor().submit(func, *args)
+        except RuntimeError:
+            self._slots.release()
+            raise
+        # the slot is held until the hash finishes, even if this caller stops waiting for it
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError as e:
+            raise HashingBusy('Password hashing timed out') from e
+
+    def hash(self, password: str) -> str:
+        """
+        Hash a password with the configured method.
+        """
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, stored_hash: str, password: str) -> bool:
+        """
+        Check a password against a stored hash made with any method werkzeug supports.
+        """
+        return bool(self._run(check_password_hash, stored_hash, password))
+
+    def needs_rehash(self, stored_hash: str) -> bool:
+        """
+        True when a stored hash was made with other parameters than the configured method.
+        """
+        return stored_hash.split('$', 1)[0] != self.stored_method
+
+    def shutdown(self) -> None:
+        """
+        Stop the pool's threads, if any were started.
+        """
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+_inline_hasher = PasswordHasher()
+
+def password_hasher() -> PasswordHasher:
+    """
+    The app's hasher; apps that did not call init_password_hashing hash inline with the defaults.
+    """
+    return current_app.extensions.get('password_hasher', _inline_hasher)
+
+def init_password_hashing(app: Flask) -> None:
+    """
+    Read hashing configuration from the environment and attach the app's hasher.
+    PASSWORD_HASH_WORKERS=0 keeps hashing on the request threads.
+    """
+    app.config.setdefault('PASSWORD_HASH_METHOD', os.getenv('PASSWORD_HASH_METHOD', DEFAULT_HASH_METHOD))
+    app.config.setdefault('PASSWORD_HASH_WORKERS', int(os.getenv('PASSWORD_HASH_WORKERS', '2')))
+    app.config.setdefault('PASSWORD_HASH_MAX_PENDING', int(os.getenv('PASSWORD_HASH_MAX_PENDING', '32')))
+    app.config.setdefault('PASSWORD_HASH_TIMEOUT', float(os.getenv('PASSWORD_HASH_TIMEOUT', '10')))
+    app.extensions['password_hasher'] = PasswordHasher(
+        method=app.config['PASSWORD_HASH_METHOD'],
+        workers=app.config['PASSWORD_HASH_WORKERS'],
+        max_pending=app.config['PASSWORD_HASH_MAX_PENDING'],
+        timeout=app.config['PASSWORD_HASH_TIMEOUT']
+    )
@@ -0,0 +1,97 @@
+""" Cross-board portfolio rollup computed with grouped aggregates """
+from datetime import date
+from typing import Optional
+from sqlalchemy import and_, case, func, or_, select
+from models import db, Board, BoardMember, BoardSprint, BoardStatus, BoardTask
+
+def visible_boards_condition(user_id: int):
+    """
+    Boards owned by the user or where the user is a member, excluding soft-deleted boards.
+    """
+    member_board_ids = select(BoardMember.board_id).where(BoardMember.user_id == user_id)
+    return and_(or_(Board.owner_id == user_id, Board.id.in_(member_board_ids)), Board.deleted_at.is_(None))
+
+def board_rollup(user_id: int, done_statuses: list[str], today: Optional[date] = None) -> list[dict]:
+    """
+    Per-board task counts by status, point totals, overdue counts and active-sprint progress for
+    every board visible to the user, with three queries however many boards there are: the boards,
+    one GROUP BY (board_id, status) over tasks joined to their status and one GROUP BY over active sprints joined to their tasks.
+    """
+    today = today or date.today()
+    boards = db.session.execute(
+        select(Board.id, Board.name, Board.owner_id, Board.background_color, Board.updated_at)
+        .where(visible_boards_condition(user_id))
+        .order_by(Board.created_at.desc())
+    ).all()
+    if not boards:
+        return []
+    visible_ids = select(Board.id).where(visible_boards_condition(user_id))
+    # tasks reference their column by id; join the status row once for the name
+    is_done = BoardStatus.name.in_(done_statuses)
+    points = func.coalesce(BoardTask.estimate, 0)
+
+    rollup: dict[int, dict] = {
+        board.id: {
+            'id': board.id,
+            'name': board.name,
+            'owner_id': board.owner_id,
+            'background_color': board.background_color,
+            'updated_at': board.updated_at.isoformat() if board.updated_at else None,
+            'status_counts': {},
+            'total_tasks': 0,
+            'completed_tasks': 0,
+            'total_points': 0,
+            'completed_points': 0,
+            'effort_used': 0,
+            'overdue': 0,
+            'active_sprint': None
+        } for board in boards
+    }
+    task_rows = db.session.execute(
+        select(BoardTask.board_id, BoardStatus.name, func.count(BoardTask.id), func.coalesce(func.sum(points), 0),
+               func.coalesce(func.sum(BoardTask.effort_used), 0),
+               func.sum(case((and_(BoardTask.due_date < today, ~is_done), 1), else_=0)))
+        .outerjoin(BoardStatus, BoardStatus.id == BoardTask.status_id)
+        .where(BoardTask.board_id.in_(visible_ids))
+        .group_by(BoardTask.board_id, BoardStatus.name)
+    ).all()
+    for board_id, status, count, total_points, effort, overdue in task_rows:
+        entry: dict | None = rollup.get(board_id)
+        if entry is None:
+            continue
+        entry['status_counts'][status] = int(count)
+        entry['total_tasks'] += int(count)
+        entry['total_points'] += int(total_points)
+        entry['effort_used'] += int(effort)
+        entry['overdue'] += int(overdue or 0)
+        if status in done_statuses:
+            entry['completed_tasks'] += int(count)
+            entry['completed_points'] += int(total_points)
+
+    sprint_rows = db.session.execute(
+        select(BoardSprint.board_id, BoardSprint.id, BoardSprint.name, BoardSprint.start_date, BoardSprint.end_date,
+               func.count(BoardTask.id), func.sum(case((is_done, 1), else_=0)),
+               func.coalesce(func.sum(points), 0), func.coalesce(func.sum(case((is_done, points), else_=0)), 0))
+        .outerjoin(BoardTask, BoardTask.sprint_id == BoardSprint.id)
+        .outerjoin(BoardStatus, BoardStatus.id == BoardTask.status_id)
+        .where(BoardSprint.board_id.in_(visible_ids), BoardSprint.is_active == 1)
+        .group_by(BoardSprint.board_id, BoardSprint.id, BoardSprint.name, BoardSprint.start_date, BoardSprint.end_date)
+        .order_by(BoardSprint.start_date)
+    ).all()
+    for board_id, sprint_id, name, start, end, tasks, done, total_points, done_points in sprint_rows:
+        entry = rollup.get(board_id)
+        if entry is None:
+            continue
+        # with several active sprints (legacy data) the latest start wins, as in get_active_sprint
+        entry['active_sprint'] = {
+            'id': sprint_id,
+            'name': name,
+            'start_date': start.isoformat(),
+            'end_date': end.isoformat(),
+            'total_tasks': int(tasks),
+            'completed_tasks': int(done or 0),
+            'total_points': int(total_points),
+            'completed_points': int(done_points),
+            'progress': round(int(done_points) / int(total_points), 4) if total_points else None
+        }
+    return [rollup[board.id] for board in boards]
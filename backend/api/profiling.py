@@ -0,0 +1,186 @@
+""" Opt-in request profiling for slow endpoints """
+import cProfile
+import hmac
+import io
+import json
+import os
+import pstats
+import random
+import re
+import time
+from datetime import datetime
+from typing import Tuple
+from flask import Blueprint, Flask, Response, current_app, g, has_app_context, jsonify, request, send_from_directory
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+profiling_bp = Blueprint('profiling', __name__)
+
+PROFILE_HEADER = 'X-Profile-Request'
+ADMIN_TOKEN_HEADER = 'X-Admin-Token'
+
+def _is_admin_request() -> bool:
+    """
+    Check the admin token header against the configured ADMIN_TOKEN.
+    """
+    expected: str = current_app.config.get('ADMIN_TOKEN') or ''
+    provided: str = request.headers.get(ADMIN_TOKEN_HEADER) or ''
+    return bool(expected) and hmac.compare_digest(expected, provided)
+
+def _profile_dir() -> str:
+    """
+    Directory where profile dumps are written, created on demand.
+    """
+    path: str = current_app.config['PROFILING_DIR']
+    os.makedirs(path, exist_ok=True)
+    return path
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):  # pylint: disable=unused-argument,too-many-arguments
+    """ Record the start time of statements issued by a profiled request """
+    if has_app_context() and g.get('request_profile') is not None:
+        conn.info.setdefault('_profile_query_start', []).append(time.perf_counter())
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):  # pylint: disable=unused-argument,too-many-arguments
+    """ Append the statement and its duration to the profiled request's SQL log """
+    if not has_app_context() or g.get('request_profile') is None:
+        return
+    starts: list[float] = conn.info.get('_profile_query_start') or []
+    started: float = starts.pop() if starts else time.perf_counter()
+    g.request_profile['sql'].append({
+        'statement': statement,
+        'executemany': bool(executemany),
+        'duration_ms': round((time.perf_counter() - started) * 1000, 3)
+    })
+
+def _start_profile() -> None:
+    """
+    Decide whether to profile this request and start cProfile if so.
+    """
+    forced: bool = request.headers.get(PROFILE_HEADER) == '1' and _is_admin_request()
+    sampled: bool = (current_app.config['PROFILING_ENABLED']
+                     and random.random() < current_app.config['PROFILING_SAMPLE_RATE'])
+    if not (forced or sampled):
+        return
+    profiler = cProfile.Profile()
+    g.request_profile = {'profiler': profiler, 'forced': forced, 'sql': [], 'started': time.perf_counter()}
+    profiler.enable()
+
+def _finish_profile(response: Response) -> Response:
+    """
+    Dump stats when the request exceeded its latency budget. The profiler is stopped by
+    _stop_profile, which also runs when the view raised and this hook is skipped.
+    """
+    profile: dict | None = g.get('request_profile')
+    if profile is None:
+        return response
+    elapsed_ms: float = (time.perf_counter() - profile['started']) * 1000
+    if profile['forced'] or elapsed_ms >= current_app.config['PROFILING_LATENCY_MS']:
+        try:
+            _write_dump(profile, elapsed_ms, response.status_code)
+        except OSError:
+            current_app.logger.exception('Failed to write request profile')
+    return response
+
+def _stop_profile(_exc: BaseException | None) -> None:
+    """
+    teardown_request hook: always disable the request's profiler, so a failed request does not
+    leave it enabled on this thread (cProfile refuses to enable a second one on Python 3.12+).
+    """
+    profile: dict | None = g.pop('request_profile', None)
+    if profile is not None:
+        profile['profiler'].disable()
+
+def _write_dump(profile: dict, elapsed_ms: float, status_code: int) -> None:
+    """
+    Write <stem>.prof (pstats) and <stem>.json (request info, SQL log, top functions), then rotate.
+    """
+    directory: str = _profile_dir()
+    endpoint: str = re.sub(r'[^A-Za-z0-9_.-]', '_', request.endpoint or 'unknown')
+    stem: str = f"{datetime.utcnow().strftime('%Y%m%dT%H%M%S%f')}_{request.method}_{endpoint}_{int(elapsed_ms)}ms"
+    profiler: cProfile.Profile = profile['profiler']
+    profiler.dump_stats(os.path.join(directory, stem + '.prof'))
+    summary = io.StringIO()
+    pstats.Stats(profiler, stream=summary).sort_stats('cumulative').print_stats(30)
+    with open(os.path.join(directory, stem + '.json'), 'w', encoding='utf-8') as dump_file:
+        json.dump({
+            'method': request.method,
+            'path': request.path,
+            'endpoint': request.endpoint,
+            'status': status_code,
+            'elapsed_ms': round(elapsed_ms, 3),
+            'forced': profile['forced'],
+            'query_count': len(profile['sql']),
+            'sql': profile['sql'],
+            'top_functions': summary.getvalue()
+        }, dump_file, indent=2)
+    _rotate(directory, current_app.config['PROFILING_MAX_DUMPS'])
+
+def _rotate(directory: str, max_dumps: int) -> None:
+    """
+    Keep only the newest max_dumps dumps (a dump is a .prof/.json pair sharing a stem).
+    """
+    stems: list[str] = sorted({os.path.splitext(name)[0] for name in os.listdir(directory) if name.endswith(('.prof', '.json'))})
+    for stem in stems[:max(0, len(stems) - max_dumps)]:
+        for ext in ('.prof', '.json'):
+            try:
+                os.remove(os.path.join(directory, stem + ext))
+            except FileNotFoundError:
+                pass
+
+def init_profiling(app: Flask) -> None:
+    """
+    Register the profiling hooks and read configuration from the environment.
+    Sampling is off unless PROFILING_ENABLED=1; admins can force a profile with
+    the X-Profile-Request: 1 header plus a valid X-Admin-Token.
+    """
+    app.config.setdefault('PROFILING_ENABLED', os.getenv('PROFILING_ENABLED', '0') == '1')
+    app.config.setdefault('PROFILING_SAMPLE_RATE', float(os.getenv('PROFILING_SAMPLE_RATE', '0.01')))
+    app.config.setdefault('PROFILING_LATENCY_MS', float(os.getenv('PROFILING_LATENCY_MS', '500')))
+    app.config.setdefault('PROFILING_DIR', os.getenv('PROFILING_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'profiles')))
+    app.config.setdefault('PROFILING_MAX_DUMPS', int(os.getenv('PROFILING_MAX_DUMPS', '200')))
+    app.config.setdefault('ADMIN_TOKEN', os.getenv('ADMIN_TOKEN', ''))
+    app.before_request(_start_profile)
+    app.after_request(_finish_profile)
+    app.teardown_request(_stop_profile)
+
+@profiling_bp.route('/admin/profiles', methods=['GET'])
+def list_profiles() -> Tuple[Response, int]:
+    """
+    List the stored profile dumps, newest first.
+    """
+    if not _is_admin_request():
+        return jsonify({'message': 'Insufficient permissions'}), 403
+    directory: str = _profile_dir()
+    dumps: list[dict] = []
+    for name in sorted(os.listdir(directory), reverse=True):
+        if not name.endswith('.json'):
+            continue
+        try:
+            with open(os.path.join(directory, name), encoding='utf-8') as dump_file:
+                meta: dict = json.load(dump_file)
+        except (OSError, json.JSONDecodeError):
+            continue
+        stem: str = os.path.splitext(name)[0]
+        dumps.append({
+            'name': stem,
+            'method': meta.get('method'),
+            'path': meta.get('path'),
+            'status': meta.get('status'),
+            'elapsed_ms': meta.get('elapsed_ms'),
+            'query_count': meta.get('query_count'),
+            'files': [stem + '.prof', stem + '.json']
+        })
+    return jsonify(dumps), 200
+
+@profiling_bp.route('/admin/profiles/<path:filename>', methods=['GET'])
+def download_profile(filename):
+    """
+    Download a single .prof or .json file from the profile directory.
+    """
+    if not _is_admin_request():
+        return jsonify({'message': 'Insufficient permissions'}), 403
+    if not filename.endswith(('.prof', '.json')):
+        return jsonify({'message': 'Profile not found'}), 404
+    return send_from_directory(_profile_dir(), filename, as_attachment=True)
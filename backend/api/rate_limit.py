@@ -0,0 +1,61 @@
+""" In-process token-bucket rate limits for the authentication endpoints """
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, Optional
+from flask import Flask, current_app
+
+class TokenBucketLimiter:
+    """
+    One token bucket per key holding up to `burst` tokens, refilled at `per_minute` tokens a minute.
+    Buckets live in a bounded LRU, so a flood of distinct keys cannot grow memory; an evicted
+    key simply starts again with a full bucket. Limits are per worker process.
+    """
+    def __init__(self, per_minute: float, burst: Optional[int] = None, max_keys: int = 10000):
+        self.rate = per_minute / 60.0
+        self.burst = float(burst if burst is not None else max(1, int(per_minute)))
+        self.max_keys = max_keys
+        self._buckets: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, key: Hashable, now: Optional[float] = None) -> float:
+        """
+        Take a token for key. Returns 0 when allowed, else the seconds until a token is available.
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+            allowed: bool = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        if allowed:
+            return 0.0
+        return (1 - tokens) / self.rate
+
+def auth_retry_after(ip: Optional[str], username: Optional[str] = None) -> float:
+    """
+    Charge one authentication attempt to the client address and, when given, the username.
+    Returns 0 when both allow it, else the seconds to wait. No-op unless init_auth_rate_limits ran.
+    """
+    limiters: dict = current_app.extensions.get('auth_rate_limits', {})
+    wait: float = 0.0
+    if 'ip' in limiters:
+        wait = limiters['ip'].acquire(ip or 'unknown')
+    if username and 'username' in limiters:
+        wait = max(wait, limiters['username'].acquire(username.lower()))
+    return wait
+
+def init_auth_rate_limits(app: Flask) -> None:
+    """
+    Read the login/register limits (attempts per minute) from the environment; 0 disables a limit.
+    """
+    app.config.setdefault('AUTH_RATE_LIMIT_PER_IP', float(os.getenv('AUTH_RATE_LIMIT_PER_IP', '30')))
+    app.config.setdefault('AUTH_RATE_LIMIT_PER_USERNAME', float(os.getenv('AUTH_RATE_LIMIT_PER_USERNAME', '10')))
+    limits: dict[str, float] = {'ip': app.config['AUTH_RATE_LIMIT_PER_IP'], 'username': app.config['AUTH_RATE_LIMIT_PER_USERNAME']}
+    app.extensions['auth_rate_limits'] = {scope: TokenBucketLimiter(per_minute) for scope, per_minute in limits.items() if per_minute > 0}
@@ -0,0 +1,68 @@
+""" Compact list payloads: columnar layout (?format=columnar) and MessagePack encoding (Accept) """
+from typing import Iterable, Sequence, Tuple
+from flask import Response, jsonify, request
+
+try:
+    import msgpack
+except ImportError:  # pinned in requirements.txt; without it every client gets JSON
+    msgpack = None
+
+MSGPACK_MIMETYPES: tuple[str, ...] = ('application/x-msgpack', 'application/msgpack')
+
+def columnar_requested() -> bool:
+    """
+    True when the client asked for the columnar layout with ?format=columnar.
+    """
+    return request.args.get('format') == 'columnar'
+
+def to_columnar(rows: Sequence[dict], dictionaries: dict[str, Iterable[str]] | None = None) -> dict:
+    """
+    Turn a list of records with identical keys into {'length', 'columns', 'dictionaries'}: each
+    column name appears once with an array of its values. Columns named in `dictionaries` hold
+    small ints indexing that column's dictionary instead of strings; the dictionary starts with
+    the given names (e.g. the board's statuses in column order) and gains any other value seen.
+    A column whose values are lists (labels) is encoded element-wise.
+    """
+    names: list[str] = list(rows[0]) if rows else []
+    encoders: dict[str, dict[str, int]] = {
+        column: {value: idx for idx, value in enumerate(dict.fromkeys(initial))}
+        for column, initial in (dictionaries or {}).items()
+    }
+
+    def encode(column: str, value):
+        index: dict[str, int] = encoders[column]
+        if value is None:
+            return None
+        if isinstance(value, list):
+            return [encode(column, item) for item in value]
+        return index.setdefault(value, len(index))
+
+    columns: dict[str, list] = {
+        name: [encode(name, row[name]) for row in rows] if name in encoders else [row[name] for row in rows]
+        for name in names
+    }
+    return {
+        'length': len(rows),
+        'columns': columns,
+        'dictionaries': {column: list(index) for column, index in encoders.items()}
+    }
+
+def _msgpack_accepted() -> bool:
+    """
+    True when msgpack is installed and the client prefers it to JSON.
+    """
+    if msgpack is None:
+        return False
+    best: str | None = request.accept_mimetypes.best_match(('application/json',) + MSGPACK_MIMETYPES)
+    return best in MSGPACK_MIMETYPES
+
+def list_response(payload, status: int = 200) -> Tuple[Response, int]:
+    """
+    Encode a list payload as MessagePack when the client's Accept header prefers it, else as JSON.
+    """
+    if _msgpack_accepted():
+        response = Response(msgpack.packb(payload, use_bin_type=True), mimetype=MSGPACK_MIMETYPES[0])
+    else:
+        response = jsonify(payload)
+    response.vary.add('Accept')
+    return response, status
@@ -0,0 +1,90 @@
+""" Sprint completion: close a sprint, carry unfinished work over and record its velocity """
+import re
+from datetime import date, timedelta
+from typing import Optional
+from sqlalchemy import case, func, select, update
+from models import db, BoardSprint, BoardTask, SprintSummary
+from board_vocabulary import status_in
+
+DEFAULT_DONE_STATUSES: list[str] = ['done']
+
+def next_sprint_name(name: Optional[str]) -> Optional[str]:
+    """
+    'Sprint 7' -> 'Sprint 8'; names without a trailing number get no automatic successor name.
+    """
+    match = re.search(r'(\d+)\s*$', name or '')
+    if not match:
+        return None
+    return f"{name[:match.start(1)]}{int(match.group(1)) + 1}"
+
+def find_or_create_next_sprint(sprint: BoardSprint) -> BoardSprint:
+    """
+    The earliest sprint starting after this one ends, or a new sprint of the same length
+    starting the day after. Only flushes.
+    """
+    upcoming: BoardSprint | None = (BoardSprint.query
+        .filter(BoardSprint.board_id == sprint.board_id, BoardSprint.id != sprint.id, BoardSprint.start_date > sprint.end_date)
+        .order_by(BoardSprint.start_date, BoardSprint.id).first())
+    if upcoming:
+        return upcoming
+    start: date = sprint.end_date + timedelta(days=1)
+    next_sprint = BoardSprint(board_id=sprint.board_id, start_date=start, end_date=start + (sprint.end_date - sprint.start_date),
+                              name=next_sprint_name(sprint.name))
+    db.session.add(next_sprint)
+    db.session.flush()
+    return next_sprint
+
+def complete_sprint(sprint: BoardSprint, next_sprint: BoardSprint, user_id: int, done_statuses: list[str]) -> SprintSummary:
+    """
+    Close `sprint` and make `next_sprint` the active one: one grouped aggregate computes the
+    committed/completed totals, one UPDATE moves every unfinished task to the next sprint and
+    a SprintSummary row records the velocity. Only flushes; the caller commits once.
+    """
+    is_done = status_in(done_statuses, sprint.board_id)
+    totals = {done: (tasks, points, effort) for done, tasks, points, effort in db.session.execute(
+        select(case((is_done, 1), else_=0).label('done'), func.count(BoardTask.id),
+               func.coalesce(func.sum(BoardTask.estimate), 0), func.coalesce(func.sum(BoardTask.effort_used), 0))
+        .where(BoardTask.board_id == sprint.board_id, BoardTask.sprint_id == sprint.id)
+        .group_by('done')
+    ).all()}
+    done_tasks, done_points, done_effort = totals.get(1, (0, 0, 0))
+    open_tasks, open_points, _ = totals.get(0, (0, 0, 0))
+    carried: int = db.session.execute(
+        update(BoardTask).where(BoardTask.board_id == sprint.board_id, BoardTask.sprint_id == sprint.id, ~is_done)
+        .values(sprint_id=next_sprint.id).execution_options(synchronize_session=False)
+    ).rowcount
+    db.session.execute(
+        update(BoardSprint).where(BoardSprint.board_id == sprint.board_id)
+        .values(is_active=case((BoardSprint.id == next_sprint.id, 1), else_=0))
+        .execution_options(synchronize_session=False)
+    )
+    summary = SprintSummary(
+        board_id=sprint.board_id, sprint_id=sprint.id, name=sprint.name, start_date=sprint.start_date, end_date=sprint.end_date,
+        committed_tasks=done_tasks + open_tasks, completed_tasks=done_tasks, carried_over_tasks=carried,
+        committed_points=int(done_points + open_points), completed_points=int(done_points), effort_used=int(done_effort),
+        next_sprint_id=next_sprint.id, completed_by=user_id
+    )
+    db.session.add(summary)
+    db.session.flush()
+    return summary
+
+def serialize_summary(summary: SprintSummary) -> dict:
+    """
+    API shape of a sprint summary.
+    """
+    return {
+        'id': summary.id,
+        'sprint_id': summary.sprint_id,
+        'name': summary.name,
+        'start_date': summary.start_date.isoformat(),
+        'end_date': summary.end_date.isoformat(),
+        'committed_tasks': summary.committed_tasks,
+        'completed_tasks': summary.completed_tasks,
+        'carried_over_tasks': summary.carried_over_tasks,
+        'committed_points': summary.committed_points,
+        'completed_points': summary.completed_points,
+        'effort_used': summary.effort_used,
+        'next_sprint_id': summary.next_sprint_id,
+        'completed_by': summary.completed_by,
+        'completed_at': summary.completed_at.isoformat() if summary.completed_at else None
+    }
@@ -0,0 +1,132 @@
+""" Normalised task labels: board_labels/task_labels back label filters and counts """
+from typing import Optional
+from sqlalchemy import delete, func, insert, literal, select
+from models import db, BoardLabel, BoardTask, TaskLabel
+from db_helpers import insert_ignore
+from task_search import fold
+
+MAX_LABEL_LENGTH = 50
+
+def parse_labels(value) -> list[str]:
+    """
+    Label names from a list or a CSV string, trimmed and truncated, without duplicates.
+    """
+    if isinstance(value, str):
+        value = value.split(',')
+    names: list[str] = []
+    for raw in (value if isinstance(value, list) else []):
+        if isinstance(raw, str) and raw.strip():
+            name: str = raw.strip()[:MAX_LABEL_LENGTH]
+            if name not in names:
+                names.append(name)
+    return names
+
+def labels_csv(value) -> Optional[str]:
+    """
+    The CSV form stored on board_tasks.labels and returned by the API; None when there are no labels.
+    """
+    names: list[str] = parse_labels(value)
+    return ",".join(names) if names else None
+
+def set_task_labels(board_id: int, task_labels: dict[int, list[str]]) -> None:
+    """
+    Replace the labels of the given tasks of one board: one INSERT IGNORE of any new board
+    labels, one SELECT of their ids, one DELETE and one multi-row INSERT of task_labels rows.
+    Names are matched to ids by their folded form, as MySQL's case- and accent-insensitive
+    collation matches them: "Bug" attaches the existing "bug" label. Does not commit.
+    """
+    if not task_labels:
+        return
+    names: list[str] = list(dict.fromkeys(name for task_names in task_labels.values() for name in task_names))
+    label_ids: dict[str, int] = {}
+    if names:
+        db.session.execute(insert_ignore(BoardLabel), [{'board_id': board_id, 'name': name} for name in names])
+        for name, label_id in db.session.execute(
+            select(BoardLabel.name, BoardLabel.id).where(BoardLabel.board_id == board_id, BoardLabel.name.in_(names))
+        ).all():
+            label_ids.setdefault(fold(name), label_id)
+    missing: list[str] = [name for name in names if fold(name) not in label_ids]
+    if missing:
+        raise LookupError(f'Labels not stored on board {board_id}: {missing}')
+    db.session.execute(delete(TaskLabel).where(TaskLabel.task_id.in_(list(task_labels))))
+    rows: list[dict] = [
+        {'board_id': board_id, 'task_id': task_id, 'label_id': label_id}
+        for task_id, task_names in task_labels.items()
+        # spellings of one label share an id: attach it once
+        for label_id in dict.fromkeys(label_ids[fold(name)] for name in task_names)
+    ]
+    if rows:
+        db.session.execute(insert(TaskLabel), rows)
+
+def clear_task_labels(task_ids: list[int]) -> None:
+    """
+    Detach every label from the given tasks. Does not commit.
+    """
+    if task_ids:
+        db.session.execute(delete(TaskLabel).where(TaskLabel.task_id.in_(task_ids)))
+
+def label_filter(board_id: int, names: list[str]):
+    """
+    Subquery of ids of the board's tasks carrying any of the given labels, served from the
+    (board_id, label_id, task_id) index.
+    """
+    return (select(TaskLabel.task_id)
+            .join(BoardLabel, BoardLabel.id == TaskLabel.label_id)
+            .where(TaskLabel.board_id == board_id, BoardLabel.board_id == board_id, BoardLabel.name.in_(names)))
+
+def label_counts(board_id: int) -> list[dict]:
+    """
+    Every label of the board with the number of tasks carrying it, in one grouped query.
+    """
+    rows = db.session.execute(
+        select(BoardLabel.id, BoardLabel.name, func.count(TaskLabel.id))
+        .outerjoin(TaskLabel, TaskLabel.label_id == BoardLabel.id)
+        .where(BoardLabel.board_id == board_id)
+        .group_by(BoardLabel.id, BoardLabel.name)
+        .order_by(BoardLabel.name)
+    ).all()
+    return [{'id': label_id, 'name': name, 'task_count': int(count)} for label_id, name, count in rows]
+
+def copy_board_labels(source_board_id: int, target_board_id: int, task_map: dict[int, int]) -> None:
+    """
+    Copy a cloned board's labels and task labels onto the copy, remapping task ids. Does not commit.
+    """
+    db.session.execute(insert(BoardLabel).from_select(
+        ['board_id', 'name'],
+        select(literal(target_board_id), BoardLabel.name).where(BoardLabel.board_id == source_board_id).order_by(BoardLabel.id)
+    ))
+    rows = db.session.execute(
+        select(TaskLabel.task_id, BoardLabel.name)
+        .join(BoardLabel, BoardLabel.id == TaskLabel.label_id)
+        .where(TaskLabel.board_id == source_board_id)
+    ).all()
+    copies: dict[int, list[str]] = {}
+    for task_id, name in rows:
+        if task_id in task_map:
+            copies.setdefault(task_map[task_id], []).append(name)
+    set_task_labels(target_board_id, copies)
+
+def backfill_labels(batch_size: int = 1000) -> int:
+    """
+    Parse the CSV labels of every task into board_labels/task_labels, committing per batch.
+    Used once after the tables are introduced. Returns the number of labelled tasks.
+    """
+    last_id = 0
+    labelled = 0
+    while True:
+        rows = db.session.execute(
+            select(BoardTask.id, BoardTask.board_id, BoardTask.labels)
+            .where(BoardTask.id > last_id, BoardTask.labels.is_not(None)).order_by(BoardTask.id).limit(batch_size)
+        ).all()
+        if not rows:
+            return labelled
+        per_board: dict[int, dict[int, list[str]]] = {}
+        for task_id, board_id, labels in rows:
+            names: list[str] = parse_labels(labels)
+            if names:
+                per_board.setdefault(board_id, {})[task_id] = names
+        for board_id, task_labels in per_board.items():
+            set_task_labels(board_id, task_labels)
+            labelled += len(task_labels)
+        db.session.commit()
+        last_id = rows[-1][0]
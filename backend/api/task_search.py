@@ -0,0 +1,142 @@
+""" Task search backed by a weighted token index kept in sync by the task write paths """
+import re
+import unicodedata
+from typing import Iterable, Optional
+from sqlalchemy import case, delete, distinct, func, insert, or_, select
+from models import db, BoardTask, TaskSearchTerm
+
+TERM_PATTERN = re.compile(r'\w+', re.UNICODE)
+MAX_TERM_LENGTH = 64
+# A term's weight is the sum over fields it appears in, per occurrence, capped so repetition cannot dominate
+FIELD_WEIGHTS: tuple[tuple[str, int], ...] = (('title', 5), ('labels', 3), ('description', 1))
+MAX_TERM_WEIGHT = 50
+MAX_QUERY_TERMS = 8
+SEARCH_MAX_LIMIT = 100
+
+def fold(text: str) -> str:
+    """
+    Case- and accent-folded text ("Résumé" -> "resume"). MySQL's default utf8mb4_0900_ai_ci
+    collation compares terms this way, so uq_task_search_term would treat two spellings that
+    Python keeps apart as duplicates; folding first makes both sides agree.
+    """
+    decomposed: str = unicodedata.normalize('NFKD', text)
+    return ''.join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+def tokenize(text: Optional[str]) -> list[str]:
+    """
+    Folded word tokens of a text, truncated to the indexed term length.
+    """
+    return [token[:MAX_TERM_LENGTH] for token in TERM_PATTERN.findall(fold(text or ''))]
+
+def task_terms(title: Optional[str], description: Optional[str], labels: Optional[str]) -> dict[str, int]:
+    """
+    Distinct terms of a task with their weights.
+    """
+    fields: dict[str, Optional[str]] = {'title': title, 'description': description, 'labels': labels}
+    weights: dict[str, int] = {}
+    for field, weight in FIELD_WEIGHTS:
+        for term in tokenize(fields[field]):
+            weights[term] = min(weights.get(term, 0) + weight, MAX_TERM_WEIGHT)
+    return weights
+
+def index_tasks(tasks: Iterable[dict]) -> None:
+    """
+    Replace the index rows of the given tasks (dicts with id, board_id, title, description, labels):
+    one DELETE and one multi-row INSERT. The task ids must exist, so flush new tasks first. Does not commit.
+    """
+    tasks = list(tasks)
+    if not tasks:
+        return
+    unindex_tasks([task['id'] for task in tasks])
+    rows: list[dict] = [
+        {'task_id': task['id'], 'board_id': task['board_id'], 'term': term, 'weight': weight}
+        for task in tasks
+        for term, weight in task_terms(task.get('title'), task.get('description'), task.get('labels')).items()
+    ]
+    if rows:
+        db.session.execute(insert(TaskSearchTerm), rows)
+
+def index_task(task: BoardTask) -> None:
+    """
+    Re-index one task after its title, description or labels changed.
+    """
+    index_tasks([{'id': task.id, 'board_id': task.board_id, 'title': task.title, 'description': task.description, 'labels': task.labels}])
+
+def unindex_tasks(task_ids: list[int]) -> None:
+    """
+    Drop the index rows of the given tasks. Does not commit.
+    """
+    if task_ids:
+        db.session.execute(delete(TaskSearchTerm).where(TaskSearchTerm.task_id.in_(task_ids)))
+
+def copy_board_index(source_board_id: int, target_board_id: int, task_map: dict[int, int]) -> None:
+    """
+    Copy the index rows of a cloned board's tasks onto the copies, remapping task ids. Does not commit.
+    """
+    rows = db.session.execute(
+        select(TaskSearchTerm.task_id, TaskSearchTerm.term, TaskSearchTerm.weight).where(TaskSearchTerm.board_id == source_board_id)
+    ).all()
+    copies: list[dict] = [
+        {'task_id': task_map[task_id], 'board_id': target_board_id, 'term': term, 'weight': weight}
+        for task_id, term, weight in rows if task_id in task_map
+    ]
+    if copies:
+        db.session.execute(insert(TaskSearchTerm), copies)
+
+def rebuild_index(batch_size: int = 1000) -> int:
+    """
+    Index every task, committing per batch of tasks. Used to backfill the index once after the
+    table is introduced. Returns the number of tasks indexed.
+    """
+    last_id = 0
+    indexed = 0
+    while True:
+        rows = db.session.execute(
+            select(BoardTask.id, BoardTask.board_id, BoardTask.title, BoardTask.description, BoardTask.labels)
+            .where(BoardTask.id > last_id).order_by(BoardTask.id).limit(batch_size)
+        ).mappings().all()
+        if not rows:
+            return indexed
+        index_tasks([dict(row) for row in rows])
+        db.session.commit()
+        indexed += len(rows)
+        last_id = rows[-1]['id']
+
+def query_terms(query: Optional[str]) -> list[str]:
+    """
+    Distinct search terms of a query. A term that is a prefix of another query term is dropped,
+    since every task matching the longer one matches it too.
+    """
+    terms: list[str] = list(dict.fromkeys(tokenize(query)))
+    terms = [term for term in terms if not any(other != term and other.startswith(term) for other in terms)]
+    return terms[:MAX_QUERY_TERMS]
+
+def search_tasks(board_ids, terms: list[str], limit: int = 20, offset: int = 0) -> tuple[list[tuple[int, int]], int]:
+    """
+    Ranked (task_id, score) pairs for tasks on the given boards (a list of ids or a subquery)
+    matching every term, and the total number of matches. Each term matches indexed terms it
+    is a prefix of, so partially typed words find cards; exact matches score double.
+    Two queries over the (board_id, term) index, however large the boards are.
+    """
+    if not terms:
+        return [], 0
+    prefix_matches = [TaskSearchTerm.term.startswith(term, autoescape=True) for term in terms]
+    # no indexed term can start with two query terms (query_terms drops prefixes), so this names the one it matched
+    matched_term = case(*[(condition, idx) for idx, condition in enumerate(prefix_matches)])
+    score = TaskSearchTerm.weight + case((TaskSearchTerm.term.in_(terms), TaskSearchTerm.weight), else_=0)
+    matches = (
+        select(TaskSearchTerm.task_id, func.sum(score).label('score'))
+        .where(TaskSearchTerm.board_id.in_(board_ids), or_(*prefix_matches))
+        .group_by(TaskSearchTerm.task_id)
+        .having(func.count(distinct(matched_term)) == len(terms))
+        .subquery()
+    )
+    total: int = db.session.scalar(select(func.count()).select_from(matches)) or 0
+    if not total or offset >= total:
+        return [], total
+    rows = db.session.execute(
+        select(matches.c.task_id, matches.c.score)
+        .order_by(matches.c.score.desc(), matches.c.task_id.desc())
+        .limit(limit).offset(offset)
+    ).all()
+    return [(task_id, int(score)) for task_id, score in rows], total
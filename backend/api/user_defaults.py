@@ -0,0 +1,52 @@
+""" Per-user defaults for new boards, parsed once and cached per row version """
+from typing import NamedTuple
+from sqlalchemy import select
+from models import db, UserDefaults
+from cache import VersionedCache
+
+# Keyed by user id at the row's updated_at; set_user_defaults also discards its entry, since
+# updated_at only has one-second resolution
+user_defaults_cache = VersionedCache(max_entries=4096)
+
+class DefaultLists(NamedTuple):
+    """ A user's default status and priority names for new boards; empty when unset """
+    statuses: tuple[str, ...]
+    priorities: tuple[str, ...]
+
+NO_DEFAULTS = DefaultLists(statuses=(), priorities=())
+
+def _names(value) -> tuple[str, ...]:
+    """
+    Names stored in a defaults column; anything but a JSON list reads as no defaults.
+    """
+    return tuple(str(name) for name in value) if isinstance(value, list) else ()
+
+def _load(user_id: int) -> DefaultLists:
+    """
+    Uncached body of user_defaults.
+    """
+    row = db.session.execute(
+        select(UserDefaults.default_statuses, UserDefaults.default_priorities).where(UserDefaults.user_id == user_id)
+    ).first()
+    return DefaultLists(statuses=_names(row[0]), priorities=_names(row[1])) if row else NO_DEFAULTS
+
+def user_defaults(user_id: int) -> DefaultLists:
+    """
+    The user's defaults. A hit costs one narrow lookup of updated_at on the unique user_id index;
+    the lists are only fetched and decoded after they change.
+    """
+    version = db.session.execute(select(UserDefaults.updated_at).where(UserDefaults.user_id == user_id)).first()
+    if version is None:
+        return NO_DEFAULTS
+    return user_defaults_cache.get_or_compute(user_id, version[0], lambda: _load(user_id))
+
+def save_user_defaults(user_id: int, statuses: list[str], priorities: list[str]) -> None:
+    """
+    Create or replace the user's defaults. Does not commit; discard the user's cache entry after committing.
+    """
+    uds: UserDefaults | None = UserDefaults.query.filter_by(user_id=user_id).first()
+    if uds is None:
+        db.session.add(UserDefaults(user_id=user_id, default_statuses=statuses, default_priorities=priorities))
+    else:
+        uds.default_statuses = statuses
+        uds.default_priorities = priorities
@@ -1,39 +1,107 @@
 """ User management routes for the API """
-import json
+from datetime import date
 from typing import Tuple
 import sqlalchemy.exc
 from flask import Blueprint, Response, jsonify, request
-from models import db, User, UserDefaults
+from models import db, Board, DeletionJob, User
 from auth_middleware import token_required
+from auth_tokens import revoke_user
+from deletion_jobs import notify_worker, schedule_user_deletion
+from my_tasks import MY_TASKS_MAX_LIMIT, assigned_tasks, decode_cursor
+from response_formats import columnar_requested, list_response, to_columnar
+from task_labels import parse_labels
+from user_defaults import DefaultLists, save_user_defaults, user_defaults, user_defaults_cache
 
 user_bp = Blueprint('users', __name__)
 
+# Most ids one lookup may resolve; a board's distinct assignees and creators fit comfortably
+USER_LOOKUP_MAX_IDS = 500
+# Usernames rarely change, so clients may reuse user records briefly and revalidate with the ETag
+USER_CACHE_MAX_AGE = 60
+
+def _cacheable(response: Response) -> Tuple[Response, int]:
+    """
+    Mark a user response as privately cacheable with an ETag; answers 304 when If-None-Match matches.
+    """
+    response.headers['Cache-Control'] = f'private, max-age={USER_CACHE_MAX_AGE}'
+    response.add_etag()
+    response.make_conditional(request)
+    return response, response.status_code
+
+def _parse_user_ids(raw) -> list[int] | None:
+    """
+    Distinct positive user ids in request order, or None when raw is not a list of ids.
+    """
+    if not isinstance(raw, list):
+        return None
+    ids: list[int] = []
+    for value in raw:
+        try:
+            user_id = int(value)
+        except (TypeError, ValueError):
+            return None
+        if isinstance(value, bool) or user_id <= 0:
+            return None
+        ids.append(user_id)
+    return list(dict.fromkeys(ids))
+
+def _lookup_users(raw_ids) -> Tuple[Response, int]:
+    """
+    Compact records of the given users from one IN query; unknown and deleted ids are listed as missing.
+    """
+    ids: list[int] | None = _parse_user_ids(raw_ids)
+    if not ids:
+        return jsonify({'message': 'ids must be a non-empty list of user ids'}), 400
+    if len(ids) > USER_LOOKUP_MAX_IDS:
+        return jsonify({'message': f'At most {USER_LOOKUP_MAX_IDS} ids per lookup'}), 400
+    try:
+        rows = db.session.query(User.id, User.username).filter(User.id.in_(ids), User.deleted_at.is_(None)).all()
+    except sqlalchemy.exc.SQLAlchemyError:
+        return jsonify({'message': 'Internal server error'}), 500
+    usernames: dict[int, str] = dict(rows)
+    return _cacheable(jsonify({
+        'users': [{'id': user_id, 'username': usernames[user_id]} for user_id in ids if user_id in usernames],
+        'missing': [user_id for user_id in ids if user_id not in usernames]
+    }))
+
+@user_bp.route('/users', methods=['GET'])
+@token_required
+def lookup_users(current_user) -> Tuple[Response, int]:  # pylint: disable=unused-argument
+    """ Resolve several users at once: ?ids=1,2,3 """
+    return _lookup_users([part.strip() for part in (request.args.get('ids') or '').split(',') if part.strip()])
+
+@user_bp.route('/users/lookup', methods=['POST'])
+@token_required
+def lookup_users_post(current_user) -> Tuple[Response, int]:  # pylint: disable=unused-argument
+    """ Resolve several users at once, for id lists too long for a query string: {"ids": [1, 2, 3]} """
+    return _lookup_users((request.get_json(silent=True) or {}).get('ids'))
+
 @user_bp.route('/users/<int:user_id>', methods=['GET'])
 @token_required
 def get_user(current_user, user_id) -> Tuple[Response, int]:  # pylint: disable=unused-argument
     """ Get a user by ID """
     try:
-        user: User | None = db.session.query(User).filter_by(id=user_id).first()
+        user: User | None = db.session.query(User).filter_by(id=user_id, deleted_at=None).first()
         if user is None:
             return jsonify({'message': 'User not found'}), 404
 
-        return jsonify({
+        return _cacheable(jsonify({
             'id': user.id,
             'username': user.username,
             'email': user.email,
             'dateJoined': user.created_at.isoformat(),
             'role': getattr(user, 'role', 'user')
-        }), 200
+        }))
     except sqlalchemy.exc.SQLAlchemyError:
         return jsonify({'message': 'Internal server error'}), 500
 
 @user_bp.route('/users/<string:username>', methods=['DELETE'])
 @token_required
 def delete_user(current_user, username) -> Tuple[Response, int]:
-    """ Delete a user by username """
+    """ Delete a user by username. Users who own boards are purged in the background (202 + job_id). """
     try:
         # Only allow admins or the user themselves to delete
-        user_to_delete: User | None = User.query.filter_by(username=username).first()
+        user_to_delete: User | None = User.query.filter_by(username=username, deleted_at=None).first()
 
         if user_to_delete is None:
             return jsonify({'message': 'User not found'}), 404
@@ -42,8 +110,21 @@ def delete_user(current_user, username) -> Tuple[Response, int]:
         if current_user.id != user_to_delete.id and getattr(current_user, 'role', 'user') != 'admin':
             return jsonify({'message': 'Insufficient permissions'}), 403
 
+        # Owned boards can hold any number of rows: hide the user now and let the deletion worker purge them
+        if db.session.query(Board.id).filter_by(owner_id=user_to_delete.id).first() is not None:
+            try:
+                job: DeletionJob = schedule_user_deletion(user_to_delete, requested_by=current_user.id)
+                revoke_user(user_to_delete.id)
+                db.session.commit()
+            except sqlalchemy.exc.SQLAlchemyError:
+                db.session.rollback()
+                return jsonify({'message': 'Internal server error'}), 500
+            notify_worker()
+            return jsonify({'message': 'User deleted successfully', 'job_id': job.id}), 202
+
         # Delete the user using a bulk delete to avoid loading related tables
         try:
+            revoke_user(user_to_delete.id)
             deleted = db.session.query(User).filter(User.id == user_to_delete.id).delete(synchronize_session=False)
             db.session.commit()
             if deleted == 0:
@@ -70,7 +151,7 @@ def edit_username(current_user, user_id) -> Tuple[Response, int]:
         # Find the user by ID
         user: User | None = User.query.get(user_id)
 
-        if user is None:
+        if user is None or user.deleted_at is not None:
             return jsonify({'message': 'User not found'}), 404
 
         # Check permissions - only allow the user themselves or admin
@@ -114,29 +195,58 @@ def get_current_user_profile(current_user) -> Tuple[Response, int]:
     except sqlalchemy.exc.SQLAlchemyError:
         return jsonify({'message': 'Internal server error'}), 500
 
+@user_bp.route('/users/me/tasks', methods=['GET'])
+@token_required
+def get_my_tasks(current_user) -> Tuple[Response, int]:
+    """
+    Tasks assigned to the current user across their boards, soonest due first, undated last.
+    Query: status (comma separated), due_before (YYYY-MM-DD, exclusive), active_sprint (true/false),
+    limit (default 50, max 200), cursor (next_cursor of the previous page), format=columnar for columnar items
+    """
+    statuses: list[str] = [s.strip() for s in (request.args.get('status') or '').split(',') if s.strip()]
+    active_sprint: bool = (request.args.get('active_sprint') or '').lower() in ('1', 'true', 'yes')
+    try:
+        due_before: date | None = date.fromisoformat(request.args['due_before']) if request.args.get('due_before') else None
+        limit: int = min(max(int(request.args.get('limit', 50)), 1), MY_TASKS_MAX_LIMIT)
+        after = decode_cursor(request.args['cursor']) if request.args.get('cursor') else None
+    except ValueError:
+        return jsonify({'message': 'Invalid due_before, limit or cursor'}), 400
+    try:
+        rows, next_cursor = assigned_tasks(current_user.id, statuses, due_before=due_before, active_sprint=active_sprint, after=after, limit=limit)
+        items: list[dict] = [
+            {
+                'id': task.id,
+                'title': task.title,
+                'status': task.status,
+                'priority': task.priority,
+                'board_id': task.board_id,
+                'board_name': board_name,
+                'sprint_id': task.sprint_id,
+                'labels': task.labels,
+                'due_date': task.due_date.isoformat() if task.due_date else None,
+                'estimate': task.estimate,
+                'effort_used': task.effort_used,
+                'position': task.position,
+                'updated_at': task.updated_at.isoformat() if task.updated_at else None
+            } for task, board_name in rows
+        ]
+        if columnar_requested():
+            for item in items:
+                item['labels'] = parse_labels(item['labels'] or '')
+            # tasks span boards, so the dictionaries are built from the page itself
+            return list_response({'items': to_columnar(items, {'status': (), 'priority': (), 'board_name': (), 'labels': ()}),
+                                  'next_cursor': next_cursor})
+        return list_response({'items': items, 'next_cursor': next_cursor})
+    except sqlalchemy.exc.SQLAlchemyError:
+        return jsonify({'message': 'Internal server error'}), 500
+
 @user_bp.route('/users/defaults', methods=['GET'])
 @token_required
 def get_user_defaults(current_user) -> Tuple[Response, int]:
     """Get current user's default statuses and priorities for new boards"""
     try:
-        uds: UserDefaults | None = UserDefaults.query.filter_by(user_id=current_user.id).first()
-        statuses: list[str] = []
-        priorities: list[str] = []
-        if uds and uds.default_statuses:
-            try:
-                parsed: list | None = json.loads(uds.default_statuses)
-                if isinstance(parsed, list):
-                    statuses = [str(x) for x in parsed]
-            except json.JSONDecodeError:
-                statuses = []
-        if uds and uds.default_priorities:
-            try:
-                parsed: list | None = json.loads(uds.default_priorities)
-                if isinstance(parsed, list):
-                    priorities = [str(x) for x in parsed]
-            except json.JSONDecodeError:
-                priorities = []
-        return jsonify({ 'statuses': statuses, 'priorities': priorities }), 200
+        defaults: DefaultLists = user_defaults(current_user.id)
+        return jsonify({ 'statuses': list(defaults.statuses), 'priorities': list(defaults.priorities) }), 200
     except sqlalchemy.exc.SQLAlchemyError:
         return jsonify({'message': 'Internal server error'}), 500
 
@@ -163,18 +273,10 @@ def set_user_defaults(current_user) -> Tuple[Response, int]:
             return out
         statuses_s: list[str] = sanitize(statuses)
         priorities_s: list[str] = sanitize(priorities)
-        uds: UserDefaults | None = UserDefaults.query.filter_by(user_id=current_user.id).first()
-        if not uds:
-            uds = UserDefaults(
-                user_id=current_user.id,
-                default_statuses=json.dumps(statuses_s),
-                default_priorities=json.dumps(priorities_s),
-            )
-            db.session.add(uds)
-        else:
-            uds.default_statuses = json.dumps(statuses_s)
-            uds.default_priorities = json.dumps(priorities_s)
+        save_user_defaults(current_user.id, statuses_s, priorities_s)
         db.session.commit()
+        # after the commit, so no concurrent read can cache the old lists again
+        user_defaults_cache.discard(current_user.id)
         return jsonify({'message': 'Defaults saved'}), 200
     except sqlalchemy.exc.SQLAlchemyError:
         db.session.rollback()
@@ -0,0 +1,135 @@
+""" Sprint velocity history and Monte Carlo completion forecast """
+import math
+from datetime import date, timedelta
+from typing import Optional
+import numpy as np
+from sqlalchemy import case, func, select
+from models import db, Board, BoardSprint, BoardTask
+from cache import VersionedCache
+from board_vocabulary import status_in
+
+# Keyed by (board id, parameters); an entry is valid for one board version
+velocity_cache = VersionedCache(max_entries=512)
+
+FORECAST_PERCENTILES: tuple[int, ...] = (50, 85, 95)
+MAX_FORECAST_SPRINTS = 260
+VELOCITY_MAX_TRIALS = 20000
+
+def sprint_points(board_id: int, done_statuses: list[str]) -> dict[int | None, dict]:
+    """
+    Committed and completed points and task counts per sprint_id, with one GROUP BY over the board's tasks.
+    The None key holds tasks outside any sprint.
+    """
+    is_done = status_in(done_statuses, board_id)
+    points = func.coalesce(BoardTask.estimate, 0)
+    rows = db.session.execute(
+        select(BoardTask.sprint_id,
+               func.count(BoardTask.id),
+               func.sum(case((is_done, 1), else_=0)),
+               func.coalesce(func.sum(points), 0),
+               func.coalesce(func.sum(case((is_done, points), else_=0)), 0))
+        .where(BoardTask.board_id == board_id)
+        .group_by(BoardTask.sprint_id)
+    ).all()
+    return {
+        sprint_id: {'tasks': int(tasks), 'completed_tasks': int(done or 0), 'committed_points': int(committed), 'completed_points': int(completed)}
+        for sprint_id, tasks, done, committed, completed in rows
+    }
+
+def rolling_average(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Trailing mean over up to `window` values (shorter at the start of the series).
+    """
+    if values.size == 0:
+        return values.astype(float)
+    sums = np.cumsum(np.insert(values.astype(float), 0, 0.0))
+    idx = np.arange(1, values.size + 1)
+    start = np.maximum(idx - window, 0)
+    return (sums[idx] - sums[start]) / (idx - start)
+
+def monte_carlo_sprints(velocities: np.ndarray, remaining: float, trials: int, seed: Optional[int] = None) -> np.ndarray | None:
+    """
+    Number of sprints needed to burn `remaining` points in each trial, sampling past velocities
+    with replacement. Vectorised: one (trials x horizon) draw, a cumulative sum and an argmax.
+    Trials that never finish within the horizon are +inf. None when there is no usable history.
+    """
+    if velocities.size == 0 or not np.any(velocities > 0):
+        return None
+    if remaining <= 0:
+        return np.zeros(trials)
+    # enough sprints that even a run of below-average sprints finishes, bounded for memory
+    horizon = int(min(MAX_FORECAST_SPRINTS, max(1, math.ceil(remaining / max(velocities.mean(), 1e-9) * 3))))
+    rng = np.random.default_rng(seed)
+    burned = np.cumsum(rng.choice(velocities, size=(trials, horizon), replace=True), axis=1)
+    finished = burned >= remaining
+    needed = np.argmax(finished, axis=1).astype(float) + 1
+    needed[~finished[:, -1]] = np.inf
+    return needed
+
+def velocity_report(board: Board, done_statuses: list[str], window: int = 3, trials: int = 10000,
+                    today: Optional[date] = None, seed: Optional[int] = None) -> dict:
+    """
+    Completed points per sprint with rolling averages, plus a forecast of how many more sprints
+    the remaining (not done) points need. Sprints count as history once they are no longer
+    active and have ended. Cached per board version and parameters.
+    """
+    today = today or date.today()
+    key = (board.id, tuple(done_statuses), window, trials, today.isoformat(), seed)
+    return velocity_cache.get_or_compute(key, board.version, lambda: _build_report(board.id, done_statuses, window, trials, today, seed))
+
+def _build_report(board_id: int, done_statuses: list[str], window: int, trials: int, today: date, seed: Optional[int]) -> dict:  # pylint: disable=too-many-arguments,too-many-locals
+    """
+    Uncached body of velocity_report.
+    """
+    per_sprint: dict = sprint_points(board_id, done_statuses)
+    sprints = db.session.execute(
+        select(BoardSprint.id, BoardSprint.name, BoardSprint.start_date, BoardSprint.end_date, BoardSprint.is_active)
+        .where(BoardSprint.board_id == board_id)
+        .order_by(BoardSprint.start_date, BoardSprint.id)
+    ).all()
+    history = [s for s in sprints if not s.is_active and s.end_date <= today]
+    history_index: dict[int, int] = {s.id: idx for idx, s in enumerate(history)}
+    completed = np.array([per_sprint.get(s.id, {}).get('completed_points', 0) for s in history], dtype=float)
+    averages = rolling_average(completed, window)
+    remaining: int = sum(v['committed_points'] - v['completed_points'] for v in per_sprint.values())
+
+    forecast: dict | None = None
+    needed = monte_carlo_sprints(completed, remaining, trials, seed)
+    if needed is not None:
+        lengths = [(s.end_date - s.start_date).days + 1 for s in history]
+        sprint_days = int(np.median(lengths)) if lengths else 14
+        start: date = max([s.end_date for s in history] + [today])
+        forecast = {
+            'trials': trials,
+            'sprint_length_days': sprint_days,
+            'probability_within_horizon': round(float(np.isfinite(needed).mean()), 4),
+            'sprints': {},
+            'dates': {}
+        }
+        for pct in FORECAST_PERCENTILES:
+            # nearest rank: sprint counts are whole numbers and may be +inf
+            value = float(np.percentile(needed, pct, method='higher'))
+            finite = math.isfinite(value)
+            forecast['sprints'][f"p{pct}"] = int(value) if finite else None
+            forecast['dates'][f"p{pct}"] = (start + timedelta(days=int(value) * sprint_days)).isoformat() if finite else None
+
+    return {
+        'board_id': board_id,
+        'done_statuses': done_statuses,
+        'window': window,
+        'sprints': [
+            {
+                'id': s.id,
+                'name': s.name,
+                'start_date': s.start_date.isoformat(),
+                'end_date': s.end_date.isoformat(),
+                'is_active': bool(s.is_active),
+                'in_history': s.id in history_index,
+                **per_sprint.get(s.id, {'tasks': 0, 'completed_tasks': 0, 'committed_points': 0, 'completed_points': 0}),
+                'rolling_average': round(float(averages[history_index[s.id]]), 2) if s.id in history_index else None
+            } for s in sprints
+        ],
+        'average_velocity': round(float(completed.mean()), 2) if completed.size else None,
+        'remaining_points': remaining,
+        'forecast': forecast
+    }
@@ -0,0 +1,173 @@
+"""Seeded synthetic data generator for Planarc benchmarks.
+
+Builds users, boards, statuses, priorities, members, sprints, tasks,
+dependencies and activity logs with multi-row inserts so that a 100k task
+board can be generated in seconds.
+"""
+import json
+import os
+import random
+import sys
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+
+CURRENT_DIR = os.path.dirname(__file__)
+BACKEND_DIR = os.path.abspath(os.path.join(CURRENT_DIR, ".."))
+API_DIR = os.path.join(BACKEND_DIR, "api")
+if API_DIR not in sys.path:
+    sys.path.insert(0, API_DIR)
+
+from werkzeug.security import generate_password_hash  # pylint: disable=wrong-import-position
+from sqlalchemy import insert, select  # pylint: disable=wrong-import-position
+from models import (  # type: ignore  # pylint: disable=wrong-import-position
+    db, User, Board, BoardMember, BoardStatus, BoardPriority, BoardSprint, BoardTask, TaskDependency, ActivityLog
+)
+
+SCALES: dict[str, int] = {'1k': 1_000, '10k': 10_000, '100k': 100_000}
+BENCH_PASSWORD = 'benchmark'
+STATUSES: list[str] = ['backlog', 'todo', 'in_progress', 'review', 'qa', 'done']
+PRIORITIES: list[str] = ['low', 'medium', 'high', 'critical']
+LABELS: list[str] = ['frontend', 'backend', 'bug', 'infra', 'ux', 'docs', 'perf', 'security']
+CHUNK_SIZE = 1000
+
+
+@dataclass
+class GeneratedData:
+    """Ids of the generated rows that the benchmarks need."""
+    owner_id: int
+    owner_username: str
+    board_id: int
+    user_ids: list[int] = field(default_factory=list)
+    usernames: list[str] = field(default_factory=list)
+    task_ids: list[int] = field(default_factory=list)
+    sprint_ids: list[int] = field(default_factory=list)
+    statuses: list[str] = field(default_factory=lambda: list(STATUSES))
+
+
+def _insert_chunked(table, rows: list[dict]) -> None:
+    """Insert rows with multi-row INSERTs of CHUNK_SIZE."""
+    for start in range(0, len(rows), CHUNK_SIZE):
+        db.session.execute(insert(table), rows[start:start + CHUNK_SIZE])
+
+
+def generate(tasks: int, seed: int = 42, extra_boards: int = 5) -> GeneratedData:  # pylint: disable=too-many-locals
+    """Generate one large board with `tasks` tasks plus a few small boards.
+
+    Must be called inside an app context on an empty schema. Member, sprint,
+    dependency and activity counts scale with the task count.
+    """
+    rng = random.Random(seed)
+    password_hash: str = generate_password_hash(BENCH_PASSWORD)
+    now = datetime(2024, 1, 1, 9, 0, 0)
+    user_count: int = max(10, min(tasks // 20, 5000))
+
+    usernames: list[str] = [f"bench_user_{i}" for i in range(user_count)]
+    _insert_chunked(User.__table__, [
+        {'username': name, 'password': password_hash, 'email': f"{name}@bench.local", 'created_at': now}
+        for name in usernames
+    ])
+    user_ids: list[int] = list(db.session.scalars(select(User.id).order_by(User.id)))
+    owner_id: int = user_ids[0]
+
+    board_names: list[str] = ['Bench Large Board'] + [f"Bench Board {i}" for i in range(extra_boards)]
+    _insert_chunked(Board.__table__, [
+        {'name': name, 'description': 'synthetic', 'owner_id': owner_id, 'created_at': now, 'updated_at': now}
+        for name in board_names
+    ])
+    board_ids: list[int] = list(db.session.scalars(select(Board.id).order_by(Board.id)))
+    board_id: int = board_ids[0]
+
+    member_rows: list[dict] = []
+    for bid in board_ids:
+        member_rows.append({'board_id': bid, 'user_id': owner_id, 'role': 'owner', 'joined_at': now})
+        for uid in (user_ids[1:] if bid == board_id else rng.sample(user_ids[1:], min(10, len(user_ids) - 1))):
+            member_rows.append({'board_id': bid, 'user_id': uid, 'role': 'member', 'joined_at': now})
+    _insert_chunked(BoardMember.__table__, member_rows)
+    _insert_chunked(BoardStatus.__table__, [
+        {'board_id': bid, 'name': name, 'position': idx} for bid in board_ids for idx, name in enumerate(STATUSES)
+    ])
+    status_ids: dict[tuple[int, str], int] = {
+        (bid, name): sid for sid, bid, name in db.session.execute(select(BoardStatus.id, BoardStatus.board_id, BoardStatus.name))
+    }
+    _insert_chunked(BoardPriority.__table__, [
+        {'board_id': bid, 'name': name, 'position': idx} for bid in board_ids for idx, name in enumerate(PRIORITIES)
+    ])
+
+    sprint_count: int = max(1, tasks // 200)
+    sprint_start = date(2023, 1, 2)
+    _insert_chunked(BoardSprint.__table__, [
+        {
+            'board_id': board_id,
+            'name': f"Sprint {i + 1}",
+            'start_date': sprint_start + timedelta(days=14 * i),
+            'end_date': sprint_start + timedelta(days=14 * i + 13),
+            'goal': None,
+            'is_active': 1 if i == sprint_count - 1 else 0,
+            'created_at': now
+        } for i in range(sprint_count)
+    ])
+    sprint_ids: list[int] = list(db.session.scalars(select(BoardSprint.id).where(BoardSprint.board_id == board_id).order_by(BoardSprint.id)))
+
+    def task_rows(bid: int, count: int) -> list[dict]:
+        positions: dict[str, int] = {name: 0 for name in STATUSES}
+        rows: list[dict] = []
+        for i in range(count):
+            status: str = rng.choice(STATUSES)
+            rows.append({
+                'board_id': bid,
+                'title': f"Task {i}",
+                'description': f"Synthetic task {i} " + ' '.join(rng.choices(LABELS, k=8)),
+                'status_id': status_ids[(bid, status)],
+                'priority': rng.choice(PRIORITIES),
+                'assigned_to': rng.choice(user_ids),
+                'created_by': owner_id,
+                'due_date': sprint_start + timedelta(days=rng.randint(0, 28 * sprint_count)) if rng.random() < 0.6 else None,
+                'position': positions[status],
+                'estimate': rng.choice([1, 2, 3, 5, 8, 13]),
+                'effort_used': rng.randint(0, 8),
+                'labels': ','.join(rng.sample(LABELS, rng.randint(0, 3))) or None,
+                'sprint_id': rng.choice(sprint_ids) if bid == board_id and rng.random() < 0.8 else None,
+                'created_at': now,
+                'updated_at': now
+            })
+            positions[status] += 1
+        return rows
+
+    _insert_chunked(BoardTask.__table__, task_rows(board_id, tasks))
+    for bid in board_ids[1:]:
+        _insert_chunked(BoardTask.__table__, task_rows(bid, 50))
+    task_ids: list[int] = list(db.session.scalars(select(BoardTask.id).where(BoardTask.board_id == board_id).order_by(BoardTask.id)))
+
+    edges: set[tuple[int, int]] = set()
+    while len(edges) < tasks // 10:
+        blocker, blocked = rng.sample(task_ids, 2)
+        if (blocked, blocker) not in edges:
+            edges.add((blocker, blocked))
+    _insert_chunked(TaskDependency.__table__, [
+        {'board_id': board_id, 'blocker_task_id': blocker, 'blocked_task_id': blocked, 'created_at': now}
+        for blocker, blocked in edges
+    ])
+
+    _insert_chunked(ActivityLog.__table__, [
+        {
+            'board_id': board_id,
+            'user_id': rng.choice(user_ids),
+            'action': rng.choice(['create', 'update', 'reorder']),
+            'entity_type': 'task',
+            'entity_id': rng.choice(task_ids),
+            'before': None,
+            'after': json.dumps({'title': f"Task {i}"}),
+            'created_at': now + timedelta(minutes=i)
+        } for i in range(tasks)
+    ])
+    db.session.commit()
+
+    return GeneratedData(
+        owner_id=owner_id,
+        owner_username=usernames[0],
+        board_id=board_id,
+        user_ids=user_ids,
+        usernames=usernames,
+        task_ids=task_ids,
+        sprint_ids=sprint_ids
+    )
@@ -0,0 +1,106 @@
+"""Shared Flask app and database fixtures for the route tests."""
+import os
+import sys
+import unittest
+from typing import Optional, Sequence
+
+import sqlalchemy
+from flask import Blueprint, Flask
+
+CURRENT_DIR = os.path.dirname(__file__)
+BACKEND_DIR = os.path.abspath(os.path.join(CURRENT_DIR, ".."))
+# the api modules import each other as top-level modules
+for path in (BACKEND_DIR, os.path.join(BACKEND_DIR, "api")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from models import db, User, Board, BoardMember, BoardStatus, BoardPriority, BoardTask, UserDefaults, BoardSprint, TaskDependency, ActivityLog, BoardTemplate, SprintSummary, TaskSearchTerm, BoardLabel, TaskLabel, RefreshToken, TokenRevocation  # type: ignore  # pylint: disable=wrong-import-position
+from board_vocabulary import vocabulary_cache  # type: ignore  # pylint: disable=wrong-import-position
+from user_defaults import user_defaults_cache  # type: ignore  # pylint: disable=wrong-import-position
+
+# Every table the board, user and auth routes touch
+BOARD_TABLES = [
+    User.__table__,
+    Board.__table__,
+    BoardMember.__table__,
+    BoardStatus.__table__,
+    BoardPriority.__table__,
+    BoardTask.__table__,
+    UserDefaults.__table__,
+    BoardSprint.__table__,
+    TaskDependency.__table__,
+    ActivityLog.__table__,
+    BoardTemplate.__table__,
+    SprintSummary.__table__,
+    TaskSearchTerm.__table__,
+    BoardLabel.__table__,
+    TaskLabel.__table__,
+    RefreshToken.__table__,
+    TokenRevocation.__table__,
+]
+
+
+def create_test_app(blueprints: Sequence[Blueprint], database: Optional[str] = None) -> Flask:
+    """Create a Flask test application with the given blueprints.
+
+    `database` names a sqlite file in this directory; without it the database is in memory.
+    TEST_DATABASE_URI overrides both.
+    """
+    os.environ.setdefault("JWT_SECRET_KEY", "test-secret")
+    app = Flask(__name__)
+    app.config.update(
+        TESTING=True,
+        SQLALCHEMY_DATABASE_URI=os.getenv(
+            "TEST_DATABASE_URI",
+            ("sqlite:///" + os.path.join(CURRENT_DIR, database)) if database else "sqlite://",
+        ),
+        SQLALCHEMY_TRACK_MODIFICATIONS=False,
+    )
+    db.init_app(app)
+    for blueprint in blueprints:
+        app.register_blueprint(blueprint)
+    return app
+
+
+class AppTestCase(unittest.TestCase):
+    """TestCase with one app and app context per class and freshly created TABLES for every test.
+
+    Subclasses set BLUEPRINTS, TABLES and optionally DATABASE (see create_test_app).
+    """
+    BLUEPRINTS: Sequence[Blueprint] = ()
+    TABLES: Sequence[sqlalchemy.Table] = ()
+    DATABASE: Optional[str] = None
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """Create the app and push its context."""
+        cls.app = create_test_app(cls.BLUEPRINTS, cls.DATABASE)
+        cls.ctx = cls.app.app_context()
+        cls.ctx.push()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """Pop the app context."""
+        cls.ctx.pop()
+
+    def setUp(self) -> None:
+        """Recreate the tables and open a test client."""
+        db.session.remove()
+        # board and user ids restart with every fresh database, so drop entries cached by earlier tests
+        vocabulary_cache.clear()
+        user_defaults_cache.clear()
+        self._drop_tables()
+        db.Model.metadata.create_all(bind=db.engine, tables=list(self.TABLES))
+        self.client = self.app.test_client()
+
+    def tearDown(self) -> None:
+        """Drop the tables."""
+        db.session.remove()
+        self._drop_tables()
+
+    def _drop_tables(self) -> None:
+        """Drop TABLES, ignoring a database that does not have them yet."""
+        try:
+            db.Model.metadata.drop_all(bind=db.engine, tables=list(self.TABLES))
+        except sqlalchemy.exc.SQLAlchemyError:
+            db.session.rollback()
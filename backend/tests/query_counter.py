@@ -0,0 +1,57 @@
+"""SQL statement counting helpers for query-budget tests."""
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class QueryCounter:
+    """Context manager that records every SQL statement executed on an engine."""
+    def __init__(self, engine: Engine) -> None:
+        self.engine = engine
+        self.statements: list[str] = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany) -> None:  # pylint: disable=unused-argument,too-many-arguments
+        """Engine event hook appending the statement text."""
+        self.statements.append(statement)
+
+    @property
+    def count(self) -> int:
+        """Number of statements recorded so far."""
+        return len(self.statements)
+
+    def __enter__(self) -> "QueryCounter":
+        event.listen(self.engine, 'before_cursor_execute', self._record)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        event.remove(self.engine, 'before_cursor_execute', self._record)
+
+
+class QueryBudgetMixin(ABC):
+    """unittest.TestCase mixin asserting per-request SQL statement budgets.
+
+    Subclasses implement `self.query_engine()` returning the engine to watch
+    and `self.reset_session()` to clear ORM state so identity-map hits from
+    earlier requests do not hide queries; a test case missing either cannot be
+    instantiated.
+    """
+    @abstractmethod
+    def query_engine(self) -> Engine:
+        """Engine whose statements are counted."""
+
+    @abstractmethod
+    def reset_session(self) -> None:
+        """Discard ORM session state before a measured request."""
+
+    @contextmanager
+    def assertMaxQueries(self, budget: int) -> Iterator[QueryCounter]:  # pylint: disable=invalid-name
+        """Fail if the wrapped block issues more than `budget` statements."""
+        self.reset_session()
+        with QueryCounter(self.query_engine()) as counter:
+            yield counter
+        if counter.count > budget:
+            listing = "\n".join(f"  {i + 1}. {s}" for i, s in enumerate(counter.statements))
+            self.fail(f"Expected at most {budget} queries, got {counter.count}:\n{listing}")  # type: ignore[attr-defined]
@@ -1,11 +1,15 @@
 """Tests for the authentication routes in the Flask application."""
 import os
 import sys
+import time
 import unittest
+from datetime import datetime, timedelta
 from typing import Optional
 import sqlalchemy.exc
 
+import jwt
 from flask import Flask
+from werkzeug.security import generate_password_hash
 
 # Ensure we can import from the backend/api package
 CURRENT_DIR = os.path.dirname(__file__)
@@ -17,8 +21,13 @@ if API_DIR not in sys.path:
     sys.path.insert(0, API_DIR)
 
 # Now we can import the app modules
-from models import db, User  # type: ignore  # pylint: disable=wrong-import-position
+from models import db, User, RefreshToken, TokenRevocation  # type: ignore  # pylint: disable=wrong-import-position
 from auth_routes import auth_bp  # type: ignore  # pylint: disable=wrong-import-position
+from password_hashing import DEFAULT_HASH_METHOD, PasswordHasher  # type: ignore  # pylint: disable=wrong-import-position
+from rate_limit import TokenBucketLimiter  # type: ignore  # pylint: disable=wrong-import-position
+from auth_tokens import RevocationList, revocation_list  # type: ignore  # pylint: disable=wrong-import-position
+
+AUTH_TABLES = [User.__table__, RefreshToken.__table__, TokenRevocation.__table__]
 
 
 def create_test_app() -> Flask:
@@ -61,22 +70,16 @@ class AuthRouteTests(unittest.TestCase):
         db.session.remove()
         # Drop in case a previous test left state (works for non in-memory DBs)
         try:
-            users_table = User.metadata.tables.get("users")
-            if users_table is not None:
-                db.Model.metadata.drop_all(bind=db.engine, tables=[users_table])
+            db.Model.metadata.drop_all(bind=db.engine, tables=AUTH_TABLES)
         except sqlalchemy.exc.SQLAlchemyError:  # pragma: no cover - best effort drop
             db.session.rollback()
-        users_table = User.metadata.tables.get("users")
-        if users_table is not None:
-            db.Model.metadata.create_all(bind=db.engine, tables=[users_table])
+        db.Model.metadata.create_all(bind=db.engine, tables=AUTH_TABLES)
         self.client = self.app.test_client()
 
     def tearDown(self) -> None:
         db.session.remove()
         try:
-            users_table = User.metadata.tables.get("users")
-            if users_table is not None:
-                db.Model.metadata.drop_all(bind=db.engine, tables=[users_table])
+            db.Model.metadata.drop_all(bind=db.engine, tables=AUTH_TABLES)
         except sqlalchemy.exc.SQLAlchemyError:  # pragma: no cover - best effort drop
             db.session.rollback()
 
@@ -149,6 +152,128 @@ class AuthRouteTests(unittest.TestCase):
         )
         self.assertEqual(resp.status_code, 401)
 
+    def test_login_rehashes_outdated_hash(self) -> None:
+        """ A hash made with older parameters is upgraded on the next successful login """
+        db.session.add(User(username="dave", password=generate_password_hash("pw", "pbkdf2:sha256:1000"), email="dave@example.com"))
+        db.session.commit()
+        self.assertEqual(self.client.post("/login", json={"username": "dave", "password": "wrong"}).status_code, 401)
+        self.assertTrue(db.session.scalar(sqlalchemy.select(User.password)).startswith("pbkdf2:sha256:1000$"))
+        self.assertEqual(self.client.post("/login", json={"username": "dave", "password": "pw"}).status_code, 200)
+        db.session.expire_all()
+        self.assertTrue(db.session.scalar(sqlalchemy.select(User.password)).startswith(DEFAULT_HASH_METHOD + "$"))
+        self.assertEqual(self.client.post("/login", json={"username": "dave", "password": "pw"}).status_code, 200)
+
+    def test_short_method_spec_not_rehashed(self) -> None:
+        """ A method configured without its parameters matches the expanded form werkzeug stores """
+        hasher = PasswordHasher(method="pbkdf2:sha256")
+        self.app.extensions["password_hasher"] = hasher
+        self.addCleanup(self.app.extensions.pop, "password_hasher")
+        self.client.post("/register", json={"username": "olga", "password": "pw", "email": "olga@example.com"})
+        stored = db.session.scalar(sqlalchemy.select(User.password))
+        self.assertTrue(stored.startswith("pbkdf2:sha256:"))
+        self.assertFalse(hasher.needs_rehash(stored))
+        self.assertEqual(self.client.post("/login", json={"username": "olga", "password": "pw"}).status_code, 200)
+        db.session.expire_all()
+        self.assertEqual(db.session.scalar(sqlalchemy.select(User.password)), stored)
+        self.assertTrue(hasher.needs_rehash(stored.replace(stored.split("$", 1)[0], "pbkdf2:sha256:1000", 1)))
+
+    def test_hashing_pool(self) -> None:
+        """ Register and log in with hashing on the bounded pool """
+        hasher = PasswordHasher(method="pbkdf2:sha256:1000", workers=2, max_pending=4)
+        self.app.extensions["password_hasher"] = hasher
+        self.addCleanup(self.app.extensions.pop, "password_hasher")
+        self.addCleanup(hasher.shutdown)
+        reg = self.client.post("/register", json={"username": "erin", "password": "pw", "email": "erin@example.com"})
+        self.assertEqual(reg.status_code, 201)
+        self.assertEqual(self.client.post("/login", json={"username": "erin", "password": "pw"}).status_code, 200)
+        self.assertEqual(self.client.post("/login", json={"username": "erin", "password": "nope"}).status_code, 401)
+
+    def test_login_rate_limited_per_username(self) -> None:
+        """ Repeated attempts for one username are refused with 429 and Retry-After """
+        self.app.extensions["auth_rate_limits"] = {"username": TokenBucketLimiter(per_minute=2)}
+        self.addCleanup(self.app.extensions.pop, "auth_rate_limits")
+        codes = [self.client.post("/login", json={"username": "Frank", "password": "x"}).status_code for _ in range(2)]
+        self.assertEqual(codes, [401, 401])
+        limited = self.client.post("/login", json={"username": "frank", "password": "x"})
+        self.assertEqual(limited.status_code, 429)
+        self.assertGreaterEqual(int(limited.headers["Retry-After"]), 1)
+        # other usernames have their own bucket
+        self.assertEqual(self.client.post("/login", json={"username": "grace", "password": "x"}).status_code, 401)
+
+    def test_token_bucket_refills(self) -> None:
+        """ A drained bucket allows one attempt again after 60/rate seconds """
+        limiter = TokenBucketLimiter(per_minute=6, burst=1)
+        self.assertEqual(limiter.acquire("ip", now=100.0), 0)
+        self.assertAlmostEqual(limiter.acquire("ip", now=101.0), 9.0)
+        self.assertEqual(limiter.acquire("ip", now=111.0), 0)
+
+    def _login(self, username: str) -> dict:
+        """ Register a user and return the login response body """
+        self.client.post("/register", json={"username": username, "password": "pw", "email": f"{username}@example.com"})
+        return self.client.post("/login", json={"username": username, "password": "pw"}).get_json() or {}
+
+    def test_access_token_expires(self) -> None:
+        """ Access tokens carry an expiry; tokens without one are rejected """
+        body = self._login("heidi")
+        claims = jwt.decode(body["token"], options={"verify_signature": False})
+        self.assertEqual(claims["exp"] - int(claims["iat"]), body["expires_in"])
+        legacy = jwt.encode({"user_id": claims["user_id"]}, os.environ["JWT_SECRET_KEY"], algorithm="HS256")
+        self.assertEqual(self.client.get("/validate", headers={"Authorization": f"Bearer {legacy}"}).status_code, 401)
+
+    def test_refresh_rotates_and_detects_reuse(self) -> None:
+        """ A refresh token works once; replaying it revokes the whole session """
+        body = self._login("ivan")
+        first = self.client.post("/refresh", json={"refresh_token": body["refresh_token"]})
+        self.assertEqual(first.status_code, 200)
+        rotated = first.get_json() or {}
+        self.assertNotEqual(rotated["refresh_token"], body["refresh_token"])
+        self.assertEqual(self.client.get("/validate", headers={"Authorization": f"Bearer {rotated['token']}"}).status_code, 200)
+        # replaying the used token ends the session, including the newer tokens
+        self.assertEqual(self.client.post("/refresh", json={"refresh_token": body["refresh_token"]}).status_code, 401)
+        self.assertEqual(self.client.post("/refresh", json={"refresh_token": rotated["refresh_token"]}).status_code, 401)
+        self.assertEqual(self.client.get("/validate", headers={"Authorization": f"Bearer {rotated['token']}"}).status_code, 401)
+
+    def test_logout_revokes_session_only(self) -> None:
+        """ Logging out ends that session's tokens; other sessions keep working """
+        phone = self._login("judy")
+        laptop = self.client.post("/login", json={"username": "judy", "password": "pw"}).get_json() or {}
+        self.assertEqual(self.client.post("/logout", headers={"Authorization": f"Bearer {phone['token']}"}).status_code, 200)
+        self.assertEqual(self.client.get("/validate", headers={"Authorization": f"Bearer {phone['token']}"}).status_code, 401)
+        self.assertEqual(self.client.post("/refresh", json={"refresh_token": phone["refresh_token"]}).status_code, 401)
+        self.assertEqual(self.client.get("/validate", headers={"Authorization": f"Bearer {laptop['token']}"}).status_code, 200)
+
+    def test_revocations_sync_from_database(self) -> None:
+        """ Revocations recorded by another process are picked up by the periodic sync """
+        body = self._login("ken")
+        sid = jwt.decode(body["token"], options={"verify_signature": False})["sid"]
+        db.session.add(TokenRevocation(revoked_at=datetime.utcnow(), session_id=sid))
+        db.session.commit()
+        self.assertEqual(self.client.get("/validate", headers={"Authorization": f"Bearer {body['token']}"}).status_code, 200)
+        self.app.config["TOKEN_REVOCATION_SYNC_SECONDS"] = 0
+        self.app.extensions["token_revocation_sync"] = True
+        self.addCleanup(self.app.extensions.pop, "token_revocation_sync")
+        self.addCleanup(revocation_list.clear)
+        revocation_list.clear()
+        self.assertEqual(self.client.get("/validate", headers={"Authorization": f"Bearer {body['token']}"}).status_code, 401)
+
+    def test_revocation_sync_catches_late_commits(self) -> None:
+        """ A revocation committed after a later-numbered one was synced is still loaded """
+        revocations = RevocationList()
+        now = datetime.utcnow()
+        first = TokenRevocation(revoked_at=now, session_id=1)
+        first.id = 1000
+        db.session.add(first)
+        db.session.commit()
+        revocations.sync(0, 900)
+        self.assertTrue(revocations.is_revoked(None, 1, time.time() - 10))
+        # a transaction that took a lower id and an earlier timestamp commits only now
+        late = TokenRevocation(revoked_at=now - timedelta(seconds=5), session_id=2)
+        late.id = 5
+        db.session.add(late)
+        db.session.commit()
+        revocations.sync(0, 900)
+        self.assertTrue(revocations.is_revoked(None, 2, time.time() - 10))
+
 
 if __name__ == "__main__":
     unittest.main(verbosity=2)
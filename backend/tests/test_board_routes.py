@@ -1,97 +1,27 @@
 """Tests for the board routes in the Planarc application."""
+import json
 import os
 import sys
 import unittest
 from typing import Optional
 import sqlalchemy
 
-from flask import Flask
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-CURRENT_DIR = os.path.dirname(__file__)
-BACKEND_DIR = os.path.abspath(os.path.join(CURRENT_DIR, ".."))
-if BACKEND_DIR not in sys.path:
-    sys.path.insert(0, BACKEND_DIR)
-API_DIR = os.path.join(BACKEND_DIR, "api")
-if API_DIR not in sys.path:
-    sys.path.insert(0, API_DIR)
-
-from models import db, User, Board, BoardMember, BoardStatus, BoardPriority, BoardTask, UserDefaults  # type: ignore  # pylint: disable=wrong-import-position
+from tests.fixtures import BOARD_TABLES, AppTestCase  # pylint: disable=wrong-import-position
+from models import db, Board, BoardStatus, BoardTask, TaskSearchTerm, BoardLabel  # type: ignore  # pylint: disable=wrong-import-position
 from auth_routes import auth_bp  # type: ignore  # pylint: disable=wrong-import-position
 from board_routes import board_bp  # type: ignore  # pylint: disable=wrong-import-position
+from task_labels import backfill_labels  # type: ignore  # pylint: disable=wrong-import-position
+from user_routes import user_bp  # type: ignore  # pylint: disable=wrong-import-position
+from response_formats import msgpack  # type: ignore  # pylint: disable=wrong-import-position
 
 
-def create_test_app() -> Flask:
-    """Create a Flask test application with the necessary configurations."""
-    os.environ.setdefault("JWT_SECRET_KEY", "test-secret")
-    app = Flask(__name__)
-    app.config.update(
-        TESTING=True,
-        SQLALCHEMY_DATABASE_URI=os.getenv(
-            "TEST_DATABASE_URI",
-            "sqlite:///" + os.path.join(BACKEND_DIR, "tests", "test_board.sqlite3"),
-        ),
-        SQLALCHEMY_TRACK_MODIFICATIONS=False,
-    )
-    db.init_app(app)
-    app.register_blueprint(auth_bp)
-    app.register_blueprint(board_bp)
-    return app
-
-
-class BoardRouteTests(unittest.TestCase):
+class BoardRouteTests(AppTestCase):
     """Tests for the board routes."""
-    @classmethod
-    def setUpClass(cls) -> None:
-        """Set up the test class."""
-        cls.app = create_test_app()
-        cls.ctx = cls.app.app_context()
-        cls.ctx.push()
-
-    @classmethod
-    def tearDownClass(cls) -> None:
-        """Tear down the test class."""
-        cls.ctx.pop()
-
-    def setUp(self) -> None:
-        """Set up the test database."""
-        db.session.remove()
-        # Create only the tables these tests require
-        meta = db.Model.metadata
-        tables = [
-            User.metadata.tables.get("users"),
-            Board.metadata.tables.get("boards"),
-            BoardMember.metadata.tables.get("board_members"),
-            BoardStatus.metadata.tables.get("board_statuses"),
-            BoardPriority.metadata.tables.get("board_priorities"),
-            BoardTask.metadata.tables.get("board_tasks"),
-            UserDefaults.metadata.tables.get("user_defaults"),
-        ]
-        tables = [t for t in tables if t is not None]
-        try:
-            meta.drop_all(bind=db.engine, tables=tables)
-        except sqlalchemy.exc.SQLAlchemyError:
-            db.session.rollback()
-        meta.create_all(bind=db.engine, tables=tables)
-        self.client = self.app.test_client()
-
-    def tearDown(self) -> None:
-        """Tear down the test database."""
-        db.session.remove()
-        meta = db.Model.metadata
-        tables = [
-            User.metadata.tables.get("users"),
-            Board.metadata.tables.get("boards"),
-            BoardMember.metadata.tables.get("board_members"),
-            BoardStatus.metadata.tables.get("board_statuses"),
-            BoardPriority.metadata.tables.get("board_priorities"),
-            BoardTask.metadata.tables.get("board_tasks"),
-            UserDefaults.metadata.tables.get("user_defaults"),
-        ]
-        tables = [t for t in tables if t is not None]
-        try:
-            meta.drop_all(bind=db.engine, tables=tables)
-        except sqlalchemy.exc.SQLAlchemyError:
-            db.session.rollback()
+    BLUEPRINTS = (auth_bp, board_bp, user_bp)
+    TABLES = BOARD_TABLES
+    DATABASE = "test_board.sqlite3"
 
     def _register(self, username: str, email: str, password: str = "pw") -> tuple[str, int]:
         """Register a new user and return the token and user ID."""
@@ -196,7 +126,8 @@ class BoardRouteTests(unittest.TestCase):
         r4b = self.client.get(f"/boards/{board_id}/tasks", headers=self._auth(token))
         self.assertEqual(r4b.status_code, 200)
         listed2 = r4b.get_json() or []
-        self.assertTrue(any(t.get("id") == task_id and t.get("effort_used") == 5 for t in listed2))
+        self.assertTrue(any(t.get("id") == task_id and t.get("effort_used") == 5 and t.get("status") == "in_progress"
+                            and t.get("priority") == "high" for t in listed2))
         # delete task
         r5 = self.client.delete(
             f"/boards/{board_id}/tasks/{task_id}",
@@ -204,6 +135,472 @@ class BoardRouteTests(unittest.TestCase):
         )
         self.assertIn(r5.status_code, (200, 204))
 
+    def test_list_members_search_filter_and_pagination(self) -> None:
+        """Test member prefix search, role filter, pagination and compact mode."""
+        token, owner_id = self._register("lead", "lead@example.com")
+        _, alpha_id = self._register("alpha", "alpha@example.com")
+        _, alpine_id = self._register("alpine", "alpine@example.com")
+        self._register("beta", "beta@example.com")
+        r = self.client.post(
+            "/boards",
+            json={"name": "Members", "invite_usernames": ["alpha", "alpine", "beta"]},
+            headers=self._auth(token),
+        )
+        board_id = (r.get_json() or {}).get("id")
+        # prefix search
+        r2 = self.client.get(f"/boards/{board_id}/members?q=alp", headers=self._auth(token))
+        self.assertEqual(r2.status_code, 200)
+        self.assertEqual(sorted(m["user_id"] for m in r2.get_json()), sorted([alpha_id, alpine_id]))
+        # role filter
+        r3 = self.client.get(f"/boards/{board_id}/members?role=owner", headers=self._auth(token))
+        self.assertEqual([m["user_id"] for m in r3.get_json()], [owner_id])
+        # pagination reports the total
+        r4 = self.client.get(f"/boards/{board_id}/members?limit=2&offset=2", headers=self._auth(token))
+        self.assertEqual(r4.headers.get("X-Total-Count"), "4")
+        self.assertEqual(len(r4.get_json()), 2)
+        # compact mode only carries ids and roles
+        r5 = self.client.get(f"/boards/{board_id}/members?compact=1", headers=self._auth(token))
+        self.assertTrue(all(set(m.keys()) == {"user_id", "role"} for m in r5.get_json()))
+
+    def test_bulk_add_members(self) -> None:
+        """Test adding several members at once, skipping existing and unknown users."""
+        token, _ = self._register("boss", "boss@example.com")
+        _, u1 = self._register("u1", "u1@example.com")
+        _, u2 = self._register("u2", "u2@example.com")
+        r = self.client.post("/boards", json={"name": "Team", "invite_user_ids": [u1]}, headers=self._auth(token))
+        board_id = (r.get_json() or {}).get("id")
+        r2 = self.client.post(
+            f"/boards/{board_id}/members",
+            json={"user_ids": [u1, 9999], "usernames": ["u2", "nobody"]},
+            headers=self._auth(token),
+        )
+        self.assertEqual(r2.status_code, 201)
+        self.assertEqual((r2.get_json() or {}).get("added_user_ids"), [u2])
+        r3 = self.client.get(f"/boards/{board_id}/members", headers=self._auth(token))
+        self.assertEqual(len(r3.get_json() or []), 3)
+
+    def test_create_board_from_template(self) -> None:
+        """Test seeding statuses and priorities from a built-in template."""
+        token, _ = self._register("tmpl", "tmpl@example.com")
+        r = self.client.post(
+            "/boards",
+            json={"name": "Scrum", "template_id": "scrum-sprint", "priorities": ["p1", "p2", "p1"]},
+            headers=self._auth(token),
+        )
+        self.assertEqual(r.status_code, 201)
+        board_id = (r.get_json() or {}).get("id")
+        statuses = self.client.get(f"/boards/{board_id}/statuses", headers=self._auth(token)).get_json() or []
+        self.assertEqual([s["name"] for s in statuses], ["backlog", "selected", "in_progress", "review", "done"])
+        priorities = self.client.get(f"/boards/{board_id}/priorities", headers=self._auth(token)).get_json() or []
+        self.assertEqual([p["name"] for p in priorities], ["p1", "p2"])
+
+    def test_create_board_from_user_defaults(self) -> None:
+        """Test that new boards use the owner's saved defaults and pick up changes at once."""
+        token, _ = self._register("dflt", "dflt@example.com")
+        for statuses in (["open", "closed"], ["new", "doing", "done"]):
+            r = self.client.put("/users/defaults", json={"statuses": statuses, "priorities": [" p1 ", "", 7]}, headers=self._auth(token))
+            self.assertEqual(r.status_code, 200)
+            r = self.client.get("/users/defaults", headers=self._auth(token))
+            self.assertEqual(r.get_json(), {"statuses": statuses, "priorities": ["p1"]})
+            r = self.client.post("/boards", json={"name": "Defaults"}, headers=self._auth(token))
+            board_id = (r.get_json() or {}).get("id")
+            names = self.client.get(f"/boards/{board_id}/statuses", headers=self._auth(token)).get_json() or []
+            self.assertEqual([s["name"] for s in names], statuses)
+
+    def test_saved_template(self) -> None:
+        """Test saving a template from a board and creating a board from it."""
+        token, _ = self._register("saver", "saver@example.com")
+        r = self.client.post("/boards", json={"name": "Src", "statuses": ["a", "b"], "priorities": ["p"]}, headers=self._auth(token))
+        board_id = (r.get_json() or {}).get("id")
+        r2 = self.client.post("/boards/templates", json={"name": "Mine", "board_id": board_id}, headers=self._auth(token))
+        self.assertEqual(r2.status_code, 201)
+        template = r2.get_json() or {}
+        self.assertEqual(template.get("statuses"), ["a", "b"])
+        listed = self.client.get("/boards/templates", headers=self._auth(token)).get_json() or []
+        self.assertIn(template["id"], [t["id"] for t in listed])
+        self.assertIn("kanban-basic", [t["id"] for t in listed])
+        r3 = self.client.post("/boards", json={"name": "From saved", "template_id": template["id"]}, headers=self._auth(token))
+        new_id = (r3.get_json() or {}).get("id")
+        statuses = self.client.get(f"/boards/{new_id}/statuses", headers=self._auth(token)).get_json() or []
+        self.assertEqual([s["name"] for s in statuses], ["a", "b"])
+
+    def test_clone_board(self) -> None:
+        """Test cloning a board remaps sprint and dependency ids to the copies."""
+        token, _ = self._register("cloner", "cloner@example.com")
+        r = self.client.post("/boards", json={"name": "Release"}, headers=self._auth(token))
+        board_id = (r.get_json() or {}).get("id")
+        sprint = self.client.post(
+            f"/boards/{board_id}/sprints",
+            json={"start_date": "2024-01-01", "end_date": "2024-01-14", "name": "S1"},
+            headers=self._auth(token),
+        ).get_json() or {}
+        t1 = (self.client.post(f"/boards/{board_id}/tasks", json={"title": "A", "sprint_id": sprint["id"]}, headers=self._auth(token)).get_json() or {})["id"]
+        t2 = (self.client.post(f"/boards/{board_id}/tasks", json={"title": "B", "status": "done"}, headers=self._auth(token)).get_json() or {})["id"]
+        self.client.post(f"/boards/{board_id}/dependencies", json={"blocker_task_id": t1, "blocked_task_id": t2}, headers=self._auth(token))
+        r2 = self.client.post(f"/boards/{board_id}/clone", json={"name": "Release 2"}, headers=self._auth(token))
+        self.assertEqual(r2.status_code, 201)
+        clone_id = (r2.get_json() or {}).get("id")
+        self.assertNotEqual(clone_id, board_id)
+        tasks = {t["title"]: t for t in self.client.get(f"/boards/{clone_id}/tasks", headers=self._auth(token)).get_json() or []}
+        self.assertEqual(set(tasks), {"A", "B"})
+        self.assertEqual(tasks["B"]["status"], "done")
+        sprints = self.client.get(f"/boards/{clone_id}/sprints", headers=self._auth(token)).get_json() or []
+        self.assertEqual(len(sprints), 1)
+        self.assertEqual(tasks["A"]["sprint_id"], sprints[0]["id"])
+        self.assertNotEqual(sprints[0]["id"], sprint["id"])
+        deps = self.client.get(f"/boards/{clone_id}/dependencies", headers=self._auth(token)).get_json() or []
+        self.assertEqual([(d["blocker_task_id"], d["blocked_task_id"]) for d in deps], [(tasks["A"]["id"], tasks["B"]["id"])])
+        found = self.client.get(f"/boards/{clone_id}/tasks/search?q=b", headers=self._auth(token)).get_json() or {}
+        self.assertEqual([t["id"] for t in found["items"]], [tasks["B"]["id"]])
+
+    def test_bulk_update_tasks(self) -> None:
+        """Test bulk updates change every field, append moved tasks to the column end and audit each task."""
+        token, _ = self._register("bulker", "bulker@example.com")
+        r = self.client.post("/boards", json={"name": "Bulk"}, headers=self._auth(token))
+        board_id = (r.get_json() or {}).get("id")
+        sprint = self.client.post(
+            f"/boards/{board_id}/sprints",
+            json={"start_date": "2024-02-01", "end_date": "2024-02-14", "name": "S2"},
+            headers=self._auth(token),
+        ).get_json() or {}
+        ids = [(self.client.post(f"/boards/{board_id}/tasks", json={"title": f"T{i}", "status": "todo"}, headers=self._auth(token)).get_json() or {})["id"] for i in range(3)]
+        self.client.post(f"/boards/{board_id}/tasks", json={"title": "Done already", "status": "done"}, headers=self._auth(token))
+        r2 = self.client.post(
+            f"/boards/{board_id}/tasks/bulk",
+            json={"task_ids": ids + [999999], "changes": {"status": "done", "priority": "high", "sprint_id": sprint["id"], "due_date": "2024-02-10", "effort_used": 2}},
+            headers=self._auth(token),
+        )
+        self.assertEqual(r2.status_code, 200)
+        self.assertEqual((r2.get_json() or {}).get("updated"), 3)
+        tasks = {t["id"]: t for t in self.client.get(f"/boards/{board_id}/tasks", headers=self._auth(token)).get_json() or []}
+        done_positions = sorted(t["position"] for t in tasks.values() if t["status"] == "done")
+        self.assertEqual(len(set(done_positions)), 4)
+        self.assertEqual([tasks[i]["position"] for i in ids], [1, 2, 3])
+        for task_id in ids:
+            self.assertEqual(tasks[task_id]["priority"], "high")
+            self.assertEqual(tasks[task_id]["sprint_id"], sprint["id"])
+            self.assertEqual(tasks[task_id]["effort_used"], 2)
+        logs = [a for a in self.client.get(f"/boards/{board_id}/activity", headers=self._auth(token)).get_json() or [] if a["action"] == "bulk_update"]
+        self.assertEqual(sorted(a["entity_id"] for a in logs), sorted(ids))
+        self.assertTrue(all(json.loads(a["before"])["status"] == "todo" and json.loads(a["after"])["status"] == "done" for a in logs))
+        r3 = self.client.post(f"/boards/{board_id}/tasks/bulk", json={"task_ids": ids, "changes": {"sprint_id": 424242}}, headers=self._auth(token))
+        self.assertEqual(r3.status_code, 404)
+
+    def test_complete_sprint(self) -> None:
+        """Test completing a sprint carries unfinished tasks into a new active sprint and records velocity."""
+        token, _ = self._register("scrum", "scrum@example.com")
+        r = self.client.post("/boards", json={"name": "Sprints"}, headers=self._auth(token))
+        board_id = (r.get_json() or {}).get("id")
+        sprint = self.client.post(
+            f"/boards/{board_id}/sprints",
+            json={"start_date": "2024-03-01", "end_date": "2024-03-14", "name": "Sprint 4", "is_active": True},
+            headers=self._auth(token),
+        ).get_json() or {}
+        for title, status, estimate in (("A", "done", 3), ("B", "done", 5), ("C", "todo", 2), ("D", "review", 8)):
+            self.client.post(f"/boards/{board_id}/tasks", json={"title": title, "status": status, "estimate": estimate, "sprint_id": sprint["id"]}, headers=self._auth(token))
+        r2 = self.client.post(f"/boards/{board_id}/sprints/{sprint['id']}/complete", json={}, headers=self._auth(token))
+        self.assertEqual(r2.status_code, 200)
+        body = r2.get_json() or {}
+        summary, next_sprint = body["summary"], body["next_sprint"]
+        self.assertEqual((summary["committed_points"], summary["completed_points"]), (18, 8))
+        self.assertEqual((summary["completed_tasks"], summary["carried_over_tasks"]), (2, 2))
+        self.assertEqual(next_sprint["name"], "Sprint 5")
+        self.assertEqual((next_sprint["start_date"], next_sprint["end_date"]), ("2024-03-15", "2024-03-28"))
+        active = (self.client.get(f"/boards/{board_id}/sprints/active", headers=self._auth(token)).get_json() or {})["sprint"]
+        self.assertEqual(active["id"], next_sprint["id"])
+        tasks = {t["title"]: t for t in self.client.get(f"/boards/{board_id}/tasks", headers=self._auth(token)).get_json() or []}
+        self.assertEqual(tasks["A"]["sprint_id"], sprint["id"])
+        self.assertEqual(tasks["C"]["sprint_id"], next_sprint["id"])
+        self.assertEqual(tasks["D"]["sprint_id"], next_sprint["id"])
+        summaries = self.client.get(f"/boards/{board_id}/sprints/summaries", headers=self._auth(token)).get_json() or []
+        self.assertEqual([s["sprint_id"] for s in summaries], [sprint["id"]])
+        r3 = self.client.post(f"/boards/{board_id}/sprints/{sprint['id']}/complete", json={}, headers=self._auth(token))
+        self.assertEqual(r3.status_code, 409)
+
+    def test_velocity_report(self) -> None:
+        """Test velocity per sprint, rolling averages, forecast and invalidation on writes."""
+        token, _ = self._register("pm", "pm@example.com")
+        r = self.client.post("/boards", json={"name": "Velocity"}, headers=self._auth(token))
+        board_id = (r.get_json() or {}).get("id")
+        sprint_ids = []
+        for i, points in enumerate((5, 10, 15)):
+            sprint = self.client.post(
+                f"/boards/{board_id}/sprints",
+                json={"start_date": f"2024-0{i + 1}-01", "end_date": f"2024-0{i + 1}-14", "name": f"S{i + 1}"},
+                headers=self._auth(token),
+            ).get_json() or {}
+            sprint_ids.append(sprint["id"])
+            self.client.post(f"/boards/{board_id}/tasks", json={"title": f"done {i}", "status": "done", "estimate": points, "sprint_id": sprint["id"]}, headers=self._auth(token))
+        self.client.post(f"/boards/{board_id}/tasks", json={"title": "left", "status": "todo", "estimate": 20}, headers=self._auth(token))
+        r2 = self.client.get(f"/boards/{board_id}/reports/velocity?window=2&seed=7", headers=self._auth(token))
+        self.assertEqual(r2.status_code, 200)
+        body = r2.get_json() or {}
+        self.assertEqual([s["completed_points"] for s in body["sprints"]], [5, 10, 15])
+        self.assertEqual([s["rolling_average"] for s in body["sprints"]], [5.0, 7.5, 12.5])
+        self.assertEqual(body["average_velocity"], 10.0)
+        self.assertEqual(body["remaining_points"], 20)
+        forecast = body["forecast"]
+        self.assertTrue(1 <= forecast["sprints"]["p50"] <= forecast["sprints"]["p95"] <= 4)
+        self.assertEqual(forecast["probability_within_horizon"], 1.0)
+        # a write bumps the board version, so the cached report is not reused
+        self.client.post(f"/boards/{board_id}/tasks", json={"title": "more", "status": "todo", "estimate": 10}, headers=self._auth(token))
+        body2 = self.client.get(f"/boards/{board_id}/reports/velocity?window=2&seed=7", headers=self._auth(token)).get_json() or {}
+        self.assertEqual(body2["remaining_points"], 30)
+
+    def test_boards_rollup(self) -> None:
+        """Test per-board counts, points, overdue tasks and active sprint progress across visible boards."""
+        token, _ = self._register("pm", "pm@example.com")
+        other_token, _ = self._register("other", "other@example.com")
+        r = self.client.post("/boards", json={"name": "Mine"}, headers=self._auth(token))
+        board_id = (r.get_json() or {}).get("id")
+        shared = (self.client.post("/boards", json={"name": "Shared", "invite_usernames": ["pm"]}, headers=self._auth(other_token)).get_json() or {}).get("id")
+        hidden = (self.client.post("/boards", json={"name": "Hidden"}, headers=self._auth(other_token)).get_json() or {}).get("id")
+        sprint = self.client.post(f"/boards/{board_id}/sprints", json={"start_date": "2024-01-01", "end_date": "2024-01-14", "name": "S1", "is_active": True},
+                                  headers=self._auth(token)).get_json() or {}
+        for title, status, estimate, due in (("a", "done", 3, "2000-01-01"), ("b", "todo", 5, "2000-01-01"), ("c", "todo", 2, None)):
+            self.client.post(f"/boards/{board_id}/tasks", json={"title": title, "status": status, "estimate": estimate, "due_date": due,
+                                                                "sprint_id": sprint["id"]}, headers=self._auth(token))
+        r2 = self.client.get("/boards/rollup", headers=self._auth(token))
+        self.assertEqual(r2.status_code, 200)
+        rollup = {b["id"]: b for b in r2.get_json() or []}
+        self.assertEqual(set(rollup), {board_id, shared})
+        self.assertNotIn(hidden, rollup)
+        mine = rollup[board_id]
+        self.assertEqual(mine["status_counts"], {"done": 1, "todo": 2})
+        self.assertEqual((mine["total_tasks"], mine["completed_tasks"]), (3, 1))
+        self.assertEqual((mine["total_points"], mine["completed_points"]), (10, 3))
+        self.assertEqual(mine["overdue"], 1)
+        self.assertEqual(mine["active_sprint"]["id"], sprint["id"])
+        self.assertEqual(mine["active_sprint"]["progress"], 0.3)
+        self.assertEqual(rollup[shared]["total_tasks"], 0)
+        self.assertIsNone(rollup[shared]["active_sprint"])
+
+    def test_search_tasks(self) -> None:
+        """Test ranked, paginated search on one board and across boards, kept current by task writes."""
+        token, _ = self._register("pm", "pm@example.com")
+        other_token, _ = self._register("other", "other@example.com")
+        board_id = (self.client.post("/boards", json={"name": "Search"}, headers=self._auth(token)).get_json() or {}).get("id")
+        hidden = (self.client.post("/boards", json={"name": "Hidden"}, headers=self._auth(other_token)).get_json() or {}).get("id")
+        ids = {}
+        for title, description, labels in (("Fix login bug", "Users cannot log in", ["auth"]),
+                                           ("Write docs", "Document the login flow", None),
+                                           ("Refactor billing", None, ["bug", "billing"])):
+            r = self.client.post(f"/boards/{board_id}/tasks", json={"title": title, "description": description, "labels": labels}, headers=self._auth(token))
+            ids[title] = (r.get_json() or {})["id"]
+        self.client.post(f"/boards/{hidden}/tasks", json={"title": "Login secret"}, headers=self._auth(other_token))
+
+        body = self.client.get(f"/boards/{board_id}/tasks/search?q=login", headers=self._auth(token)).get_json() or {}
+        self.assertEqual(body["total"], 2)
+        # a title match outranks a description match
+        self.assertEqual([t["id"] for t in body["items"]], [ids["Fix login bug"], ids["Write docs"]])
+        # every term must match; a partial last word matches by prefix
+        body = self.client.get(f"/boards/{board_id}/tasks/search?q=bug%20logi", headers=self._auth(token)).get_json() or {}
+        self.assertEqual([t["id"] for t in body["items"]], [ids["Fix login bug"]])
+        body = self.client.get(f"/boards/{board_id}/tasks/search?q=bug&limit=1&offset=1", headers=self._auth(token)).get_json() or {}
+        self.assertEqual((body["total"], len(body["items"])), (2, 1))
+
+        self.client.put(f"/boards/{board_id}/tasks/{ids['Write docs']}", json={"title": "Write guide"}, headers=self._auth(token))
+        self.client.post(f"/boards/{board_id}/tasks/bulk", json={"task_ids": [ids["Refactor billing"]], "changes": {"labels": ["invoices"]}},
+                         headers=self._auth(token))
+        self.client.delete(f"/boards/{board_id}/tasks/{ids['Fix login bug']}", headers=self._auth(token))
+        self.assertEqual((self.client.get(f"/boards/{board_id}/tasks/search?q=docs", headers=self._auth(token)).get_json() or {})["total"], 0)
+        self.assertEqual((self.client.get(f"/boards/{board_id}/tasks/search?q=guide", headers=self._auth(token)).get_json() or {})["total"], 1)
+        self.assertEqual((self.client.get(f"/boards/{board_id}/tasks/search?q=invoices", headers=self._auth(token)).get_json() or {})["total"], 1)
+        self.assertEqual(self._count_terms(ids["Fix login bug"]), 0)
+
+        r = self.client.get("/tasks/search?q=login", headers=self._auth(token))
+        self.assertEqual([t["id"] for t in (r.get_json() or {})["items"]], [ids["Write docs"]])
+        self.assertEqual(self.client.get("/tasks/search?q=%20", headers=self._auth(token)).status_code, 400)
+
+    def test_list_tasks_columnar(self) -> None:
+        """Test the columnar task list matches the JSON list with vocabulary-encoded statuses, priorities and labels."""
+        token, _ = self._register("cols", "cols@example.com")
+        board_id = (self.client.post("/boards", json={"name": "Columns"}, headers=self._auth(token)).get_json() or {}).get("id")
+        for title, status, labels in (("a", "done", ["bug", "ui"]), ("b", "todo", None), ("c", "todo", ["ui"])):
+            self.client.post(f"/boards/{board_id}/tasks", json={"title": title, "status": status, "priority": "high", "labels": labels},
+                             headers=self._auth(token))
+        rows = self.client.get(f"/boards/{board_id}/tasks", headers=self._auth(token)).get_json() or []
+        body = self.client.get(f"/boards/{board_id}/tasks?format=columnar", headers=self._auth(token)).get_json() or {}
+        self.assertEqual(body["length"], 3)
+        columns, dictionaries = body["columns"], body["dictionaries"]
+        self.assertEqual(list(columns), list(rows[0]))
+        self.assertEqual(dictionaries["status"], ["todo", "in_progress", "review", "done"])
+        self.assertEqual(columns["title"], [t["title"] for t in rows])
+        self.assertEqual([dictionaries["status"][i] for i in columns["status"]], [t["status"] for t in rows])
+        self.assertEqual([dictionaries["priority"][i] for i in columns["priority"]], ["high"] * 3)
+        self.assertEqual([",".join(dictionaries["labels"][i] for i in ids) or None for ids in columns["labels"]], [t["labels"] for t in rows])
+
+    @unittest.skipUnless(msgpack, "msgpack is not installed")
+    def test_list_tasks_msgpack(self) -> None:
+        """Test clients preferring MessagePack get the same payload msgpack-encoded."""
+        token, _ = self._register("mp", "mp@example.com")
+        board_id = (self.client.post("/boards", json={"name": "Packed"}, headers=self._auth(token)).get_json() or {}).get("id")
+        self.client.post(f"/boards/{board_id}/tasks", json={"title": "a"}, headers=self._auth(token))
+        rows = self.client.get(f"/boards/{board_id}/tasks", headers=self._auth(token)).get_json()
+        r = self.client.get(f"/boards/{board_id}/tasks", headers={**self._auth(token), "Accept": "application/x-msgpack"})
+        self.assertEqual(r.mimetype, "application/x-msgpack")
+        self.assertEqual(msgpack.unpackb(r.data), rows)
+
+    def test_search_folds_case_and_accents(self) -> None:
+        """Test spellings differing only in case or accents index as one term and match each other."""
+        token, _ = self._register("cv", "cv@example.com")
+        board_id = (self.client.post("/boards", json={"name": "Folding"}, headers=self._auth(token)).get_json() or {}).get("id")
+        r = self.client.post(f"/boards/{board_id}/tasks", json={"title": "Update resume", "description": "Résumé and RÉSUMÉ"},
+                             headers=self._auth(token))
+        self.assertEqual(r.status_code, 201)
+        task_id = (r.get_json() or {})["id"]
+        terms = db.session.scalars(sqlalchemy.select(TaskSearchTerm.term).where(TaskSearchTerm.task_id == task_id)).all()
+        self.assertEqual(sorted(terms), ["and", "resume", "update"])
+        body = self.client.get(f"/boards/{board_id}/tasks/search?q=r%C3%A9sum", headers=self._auth(token)).get_json() or {}
+        self.assertEqual([t["id"] for t in body["items"]], [task_id])
+
+    def test_labels_case_insensitive_collation(self) -> None:
+        """Test a label differing only in case from an existing one attaches it, as under MySQL's default collation."""
+        # emulate utf8mb4_0900_ai_ci's case-insensitive uniqueness on SQLite
+        BoardLabel.__table__.drop(db.engine)
+        ddl = str(sqlalchemy.schema.CreateTable(BoardLabel.__table__).compile(db.engine))
+        with db.engine.begin() as conn:
+            conn.execute(sqlalchemy.text(ddl.replace("name VARCHAR(50) NOT NULL", "name VARCHAR(50) NOT NULL COLLATE NOCASE")))
+        token, _ = self._register("ci", "ci@example.com")
+        board_id = (self.client.post("/boards", json={"name": "Case"}, headers=self._auth(token)).get_json() or {}).get("id")
+        for title, labels in (("a", ["bug"]), ("b", ["Bug", "BUG", "ui"])):
+            r = self.client.post(f"/boards/{board_id}/tasks", json={"title": title, "labels": labels}, headers=self._auth(token))
+            self.assertEqual(r.status_code, 201)
+        counts = {lbl["name"]: lbl["task_count"] for lbl in self.client.get(f"/boards/{board_id}/labels", headers=self._auth(token)).get_json() or []}
+        self.assertEqual(counts, {"bug": 2, "ui": 1})
+        tasks = self.client.get(f"/boards/{board_id}/tasks?labels=bug", headers=self._auth(token)).get_json() or []
+        self.assertEqual(sorted(t["title"] for t in tasks), ["a", "b"])
+
+    def test_labels_filter_and_counts(self) -> None:
+        """Test label filters and counts come from the label tables and follow task writes, in list or CSV form."""
+        token, _ = self._register("pm", "pm@example.com")
+        board_id = (self.client.post("/boards", json={"name": "Labels"}, headers=self._auth(token)).get_json() or {}).get("id")
+        ids = {}
+        for title, labels in (("a", ["bug", "ui"]), ("b", "bug, api ,bug"), ("c", None)):
+            r = self.client.post(f"/boards/{board_id}/tasks", json={"title": title, "labels": labels}, headers=self._auth(token))
+            ids[title] = (r.get_json() or {})["id"]
+            if title == "b":
+                self.assertEqual((r.get_json() or {})["labels"], "bug,api")
+        counts = {lbl["name"]: lbl["task_count"] for lbl in self.client.get(f"/boards/{board_id}/labels", headers=self._auth(token)).get_json() or []}
+        self.assertEqual(counts, {"api": 1, "bug": 2, "ui": 1})
+        tasks = self.client.get(f"/boards/{board_id}/tasks?labels=ui,api", headers=self._auth(token)).get_json() or []
+        self.assertEqual(sorted(t["title"] for t in tasks), ["a", "b"])
+
+        self.client.put(f"/boards/{board_id}/tasks/{ids['a']}", json={"labels": ["ui"]}, headers=self._auth(token))
+        self.client.post(f"/boards/{board_id}/tasks/bulk", json={"task_ids": [ids["b"], ids["c"]], "changes": {"labels": "api"}}, headers=self._auth(token))
+        self.client.delete(f"/boards/{board_id}/tasks/{ids['a']}", headers=self._auth(token))
+        counts = {lbl["name"]: lbl["task_count"] for lbl in self.client.get(f"/boards/{board_id}/labels", headers=self._auth(token)).get_json() or []}
+        self.assertEqual(counts, {"api": 2, "bug": 0, "ui": 0})
+        tasks = self.client.get(f"/boards/{board_id}/tasks?labels=api", headers=self._auth(token)).get_json() or []
+        self.assertEqual({t["title"]: t["labels"] for t in tasks}, {"b": "api", "c": "api"})
+
+        clone_id = (self.client.post(f"/boards/{board_id}/clone", json={}, headers=self._auth(token)).get_json() or {}).get("id")
+        counts = {lbl["name"]: lbl["task_count"] for lbl in self.client.get(f"/boards/{clone_id}/labels", headers=self._auth(token)).get_json() or []}
+        self.assertEqual(counts, {"api": 2, "bug": 0, "ui": 0})
+
+    def test_backfill_labels(self) -> None:
+        """Test CSV labels written before the label tables existed are parsed into them."""
+        token, user_id = self._register("pm", "pm@example.com")
+        board_id = (self.client.post("/boards", json={"name": "Old"}, headers=self._auth(token)).get_json() or {}).get("id")
+        db.session.add(BoardTask(title="old", description=None, assigned_to=None, created_by=user_id, due_date=None, position=0,
+                                 status_id=None, priority="low", board_id=board_id, labels="legacy, bug"))
+        db.session.commit()
+        self.assertEqual(backfill_labels(batch_size=1), 1)
+        counts = {lbl["name"]: lbl["task_count"] for lbl in self.client.get(f"/boards/{board_id}/labels", headers=self._auth(token)).get_json() or []}
+        self.assertEqual(counts, {"bug": 1, "legacy": 1})
+
+    def test_auto_created_status_is_upserted(self) -> None:
+        """Test a status added behind the cached vocabulary (e.g. by a concurrent request) does not fail task creation."""
+        token, _ = self._register("pm", "pm@example.com")
+        board_id = (self.client.post("/boards", json={"name": "Race"}, headers=self._auth(token)).get_json() or {}).get("id")
+        self.assertEqual(self.client.get(f"/boards/{board_id}/tasks", headers=self._auth(token)).status_code, 200)
+        # another worker adds the column without this process seeing a version change
+        db.session.add(BoardStatus(board_id=board_id, name="qa", position=9))
+        db.session.commit()
+        r = self.client.post(f"/boards/{board_id}/tasks", json={"title": "t", "status": "qa", "priority": "urgent"}, headers=self._auth(token))
+        self.assertEqual(r.status_code, 201)
+        statuses = [s["name"] for s in self.client.get(f"/boards/{board_id}/statuses", headers=self._auth(token)).get_json() or []]
+        self.assertEqual(statuses.count("qa"), 1)
+        priorities = [p["name"] for p in self.client.get(f"/boards/{board_id}/priorities", headers=self._auth(token)).get_json() or []]
+        self.assertEqual(priorities[-1], "urgent")
+        r = self.client.post(f"/boards/{board_id}/tasks/reorder", json={"moves": [{"task_id": (r.get_json() or {})["id"], "to_status": "blocked", "to_position": 0}]},
+                             headers=self._auth(token))
+        self.assertEqual(r.status_code, 200)
+        statuses = [s["name"] for s in self.client.get(f"/boards/{board_id}/statuses", headers=self._auth(token)).get_json() or []]
+        self.assertEqual(statuses[-1], "blocked")
+
+    def test_invalid_status_and_priority_names(self) -> None:
+        """Test null, blank and over-long status or priority names are rejected instead of creating broken columns."""
+        token, _ = self._register("pm", "pm@example.com")
+        board_id = (self.client.post("/boards", json={"name": "Names"}, headers=self._auth(token)).get_json() or {}).get("id")
+        before = self.client.get(f"/boards/{board_id}/statuses", headers=self._auth(token)).get_json()
+        for body in ({"status": None}, {"status": " "}, {"status": "x" * 51}, {"priority": None}, {"priority": 3}):
+            r = self.client.post(f"/boards/{board_id}/tasks", json={"title": "t", **body}, headers=self._auth(token))
+            self.assertEqual(r.status_code, 400, body)
+        task_id = (self.client.post(f"/boards/{board_id}/tasks", json={"title": "t", "status": "x" * 50}, headers=self._auth(token)).get_json() or {})["id"]
+        r = self.client.put(f"/boards/{board_id}/tasks/{task_id}", json={"status": None}, headers=self._auth(token))
+        self.assertEqual(r.status_code, 400)
+        r = self.client.post(f"/boards/{board_id}/tasks/reorder", json={"moves": [{"task_id": task_id, "to_status": "", "to_position": 0}]}, headers=self._auth(token))
+        self.assertEqual(r.status_code, 400)
+        r = self.client.post(f"/boards/{board_id}/tasks/bulk", json={"task_ids": [task_id], "changes": {"priority": "p" * 51}}, headers=self._auth(token))
+        self.assertEqual(r.status_code, 400)
+        statuses = [s["name"] for s in self.client.get(f"/boards/{board_id}/statuses", headers=self._auth(token)).get_json() or []]
+        self.assertEqual(statuses, [s["name"] for s in before] + ["x" * 50])
+        tasks = self.client.get(f"/boards/{board_id}/tasks", headers=self._auth(token)).get_json() or []
+        self.assertEqual([(t["status"], t["priority"]) for t in tasks], [("x" * 50, "medium")])
+
+    def test_rename_and_delete_status(self) -> None:
+        """Test a renamed status shows on its tasks and a deleted status's tasks are appended to the first remaining column."""
+        token, _ = self._register("pm", "pm@example.com")
+        board_id = (self.client.post("/boards", json={"name": "Cols", "statuses": ["todo", "doing", "done"]}, headers=self._auth(token)).get_json() or {}).get("id")
+        for title, status in (("a", "todo"), ("b", "todo"), ("c", "doing"), ("d", "doing")):
+            self.client.post(f"/boards/{board_id}/tasks", json={"title": title, "status": status}, headers=self._auth(token))
+        statuses = {s["name"]: s["id"] for s in self.client.get(f"/boards/{board_id}/statuses", headers=self._auth(token)).get_json() or []}
+
+        r = self.client.put(f"/boards/{board_id}/statuses/{statuses['doing']}", json={"name": "in review"}, headers=self._auth(token))
+        self.assertEqual(r.status_code, 200)
+        tasks = {t["title"]: t for t in self.client.get(f"/boards/{board_id}/tasks", headers=self._auth(token)).get_json() or []}
+        self.assertEqual(tasks["c"]["status"], "in review")
+
+        # gaps in the deleted column's positions do not carry over to the fallback column
+        for title, position in (("c", 7), ("d", 3)):
+            db.session.execute(sqlalchemy.update(BoardTask).where(BoardTask.id == tasks[title]["id"]).values(position=position))
+        db.session.commit()
+        r = self.client.delete(f"/boards/{board_id}/statuses/{statuses['doing']}", headers=self._auth(token))
+        self.assertEqual(r.status_code, 200)
+        tasks = self.client.get(f"/boards/{board_id}/tasks", headers=self._auth(token)).get_json() or []
+        self.assertEqual([(t["title"], t["status"], t["position"]) for t in tasks if t["status"] == "todo"],
+                         [("a", "todo", 0), ("b", "todo", 1), ("d", "todo", 2), ("c", "todo", 3)])
+        for name in ("todo", "done"):
+            self.client.delete(f"/boards/{board_id}/statuses/{statuses[name]}", headers=self._auth(token))
+        remaining = self.client.get(f"/boards/{board_id}/statuses", headers=self._auth(token)).get_json() or []
+        self.assertEqual([s["name"] for s in remaining], ["done"])
+
+    def test_reorder_statuses_and_priorities(self) -> None:
+        """Test columns are reordered from one full id list and the new board version is returned."""
+        token, _ = self._register("pm", "pm@example.com")
+        board_id = (self.client.post("/boards", json={"name": "Cols", "statuses": ["a", "b", "c"], "priorities": ["x", "y"]}, headers=self._auth(token)).get_json() or {}).get("id")
+        ids = {s["name"]: s["id"] for s in self.client.get(f"/boards/{board_id}/statuses", headers=self._auth(token)).get_json() or []}
+        version = Board.query.get(board_id).version
+        r = self.client.put(f"/boards/{board_id}/statuses/order", json={"ids": [ids["c"], ids["a"], ids["b"]]}, headers=self._auth(token))
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual((r.get_json() or {}).get("version"), version + 1)
+        statuses = self.client.get(f"/boards/{board_id}/statuses", headers=self._auth(token)).get_json() or []
+        self.assertEqual([(s["name"], s["position"]) for s in statuses], [("c", 0), ("a", 1), ("b", 2)])
+        # partial, duplicated or foreign lists are rejected without changes
+        for bad in ([ids["a"], ids["b"]], [ids["a"], ids["a"], ids["b"]], [ids["a"], ids["b"], 999999], "a,b"):
+            r = self.client.put(f"/boards/{board_id}/statuses/order", json={"ids": bad}, headers=self._auth(token))
+            self.assertEqual(r.status_code, 400)
+        priorities = {p["name"]: p["id"] for p in self.client.get(f"/boards/{board_id}/priorities", headers=self._auth(token)).get_json() or []}
+        r = self.client.put(f"/boards/{board_id}/priorities/order", json={"ids": [priorities["y"], priorities["x"]]}, headers=self._auth(token))
+        self.assertEqual(r.status_code, 200)
+        names = [p["name"] for p in self.client.get(f"/boards/{board_id}/priorities", headers=self._auth(token)).get_json() or []]
+        self.assertEqual(names, ["y", "x"])
+
+    def _count_terms(self, task_id: int) -> int:
+        """Count search index rows for a task."""
+        return TaskSearchTerm.query.filter_by(task_id=task_id).count()
+
 
 if __name__ == "__main__":
     unittest.main(verbosity=2)
@@ -0,0 +1,108 @@
+"""Tests for the response compression hook in the Planarc application."""
+import gzip
+import os
+import sys
+import unittest
+
+from flask import Flask, Response, jsonify, request, stream_with_context
+
+CURRENT_DIR = os.path.dirname(__file__)
+BACKEND_DIR = os.path.abspath(os.path.join(CURRENT_DIR, ".."))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+API_DIR = os.path.join(BACKEND_DIR, "api")
+if API_DIR not in sys.path:
+    sys.path.insert(0, API_DIR)
+
+import compression  # type: ignore  # pylint: disable=wrong-import-position
+from compression import init_compression  # type: ignore  # pylint: disable=wrong-import-position
+
+ROWS = [{"id": i, "title": f"Task {i}", "status": "todo"} for i in range(200)]
+
+
+def create_test_app() -> Flask:
+    """Create a Flask test application with a few payloads and compression enabled."""
+    app = Flask(__name__)
+    app.config.update(TESTING=True, COMPRESS_ENABLED=True, COMPRESS_MIN_SIZE=500)
+
+    @app.route("/tasks")
+    def tasks():
+        response = jsonify(ROWS)
+        response.add_etag()
+        return response.make_conditional(request)
+
+    @app.route("/small")
+    def small():
+        return jsonify({"ok": True})
+
+    @app.route("/export")
+    def export():
+        def rows():
+            for row in ROWS:
+                yield f"{row['id']},{row['title']}\n"
+        return Response(stream_with_context(rows()), mimetype="text/csv")
+
+    init_compression(app)
+    return app
+
+
+class CompressionTests(unittest.TestCase):
+    """Tests for negotiation, thresholds and streaming compression."""
+    def setUp(self) -> None:
+        """Create a fresh app and client."""
+        self.app = create_test_app()
+        self.client = self.app.test_client()
+
+    def test_gzip_large_json(self) -> None:
+        """Large JSON is gzipped when accepted and decodes to the original body."""
+        plain = self.client.get("/tasks")
+        r = self.client.get("/tasks", headers={"Accept-Encoding": "gzip, deflate"})
+        self.assertEqual(r.headers.get("Content-Encoding"), "gzip")
+        self.assertIn("Accept-Encoding", r.headers.get("Vary", ""))
+        self.assertEqual(gzip.decompress(r.data), plain.data)
+        self.assertLess(int(r.headers["Content-Length"]), len(plain.data) // 4)
+        # the compressed representation's ETag is weak but still revalidates
+        etag = r.headers["ETag"]
+        self.assertTrue(etag.startswith("W/"))
+        again = self.client.get("/tasks", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+        self.assertEqual(again.status_code, 304)
+
+    def test_skips_small_and_unaccepted(self) -> None:
+        """Bodies under the threshold and clients without gzip get the identity encoding."""
+        r = self.client.get("/small", headers={"Accept-Encoding": "gzip"})
+        self.assertNotIn("Content-Encoding", r.headers)
+        r = self.client.get("/tasks", headers={"Accept-Encoding": "identity"})
+        self.assertNotIn("Content-Encoding", r.headers)
+        r = self.client.get("/tasks", headers={"Accept-Encoding": "gzip;q=0"})
+        self.assertNotIn("Content-Encoding", r.headers)
+
+    def test_streamed_response(self) -> None:
+        """Streamed exports are compressed incrementally without a Content-Length."""
+        r = self.client.get("/export", headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(r.headers.get("Content-Encoding"), "gzip")
+        self.assertNotIn("Content-Length", r.headers)
+        body = gzip.decompress(r.data).decode()
+        self.assertEqual(body.count("\n"), len(ROWS))
+        self.assertTrue(body.startswith("0,Task 0\n"))
+
+    @unittest.skipUnless(compression.brotli, "brotli is not installed")
+    def test_prefers_brotli(self) -> None:
+        """br is chosen when the client prefers it at least as much as gzip."""
+        plain = self.client.get("/tasks")
+        r = self.client.get("/tasks", headers={"Accept-Encoding": "gzip, br"})
+        self.assertEqual(r.headers.get("Content-Encoding"), "br")
+        self.assertEqual(compression.brotli.decompress(r.data), plain.data)
+        r = self.client.get("/tasks", headers={"Accept-Encoding": "gzip, br;q=0.5"})
+        self.assertEqual(r.headers.get("Content-Encoding"), "gzip")
+
+    @unittest.skipIf(compression.brotli, "brotli is installed")
+    def test_gzip_only_without_brotli(self) -> None:
+        """Without the brotli package, br-only clients get the identity encoding."""
+        r = self.client.get("/tasks", headers={"Accept-Encoding": "br"})
+        self.assertNotIn("Content-Encoding", r.headers)
+        r = self.client.get("/tasks", headers={"Accept-Encoding": "br, gzip"})
+        self.assertEqual(r.headers.get("Content-Encoding"), "gzip")
+
+
+if __name__ == "__main__":
+    unittest.main()
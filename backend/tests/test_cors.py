@@ -0,0 +1,91 @@
+"""Tests for the CORS middleware in the Planarc application."""
+import os
+import sys
+import unittest
+
+from flask import Flask, jsonify
+
+CURRENT_DIR = os.path.dirname(__file__)
+BACKEND_DIR = os.path.abspath(os.path.join(CURRENT_DIR, ".."))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+API_DIR = os.path.join(BACKEND_DIR, "api")
+if API_DIR not in sys.path:
+    sys.path.insert(0, API_DIR)
+
+from cors import init_cors  # type: ignore  # pylint: disable=wrong-import-position
+
+FRONTEND = "http://localhost:3000"
+
+
+def create_test_app() -> Flask:
+    """Create a Flask test application with one route, a request counter and CORS."""
+    app = Flask(__name__)
+    app.config.update(TESTING=True, CORS_ORIGINS=f"{FRONTEND}, https://planarc.example.com/", CORS_MAX_AGE=600)
+    app.config["SEEN"] = 0
+
+    @app.before_request
+    def count():
+        app.config["SEEN"] += 1
+
+    @app.route("/boards/<int:board_id>", methods=["GET", "PUT"])
+    def board(board_id):
+        response = jsonify({"id": board_id})
+        response.vary.add("Accept")
+        return response
+
+    init_cors(app)
+    return app
+
+
+class CorsTests(unittest.TestCase):
+    """Tests for preflight handling and CORS headers on actual responses."""
+    def setUp(self) -> None:
+        """Create a fresh app and client."""
+        self.app = create_test_app()
+        self.client = self.app.test_client()
+
+    def _preflight(self, origin: str):
+        return self.client.options("/boards/1", headers={
+            "Origin": origin, "Access-Control-Request-Method": "PUT", "Access-Control-Request-Headers": "content-type,authorization"
+        })
+
+    def test_preflight_answered_before_the_app(self) -> None:
+        """Preflights from allowed origins get cacheable CORS headers without reaching Flask."""
+        r = self._preflight(FRONTEND)
+        self.assertEqual(r.status_code, 204)
+        self.assertEqual(r.headers["Access-Control-Allow-Origin"], FRONTEND)
+        self.assertEqual(r.headers["Access-Control-Allow-Credentials"], "true")
+        self.assertEqual(r.headers["Access-Control-Max-Age"], "600")
+        self.assertIn("PUT", r.headers["Access-Control-Allow-Methods"])
+        self.assertIn("Authorization", r.headers["Access-Control-Allow-Headers"])
+        self.assertEqual(self._preflight("https://planarc.example.com").headers["Access-Control-Allow-Origin"], "https://planarc.example.com")
+        self.assertEqual(self.app.config["SEEN"], 0)
+
+    def test_disallowed_origin(self) -> None:
+        """Other origins get no CORS grants, on preflights or responses."""
+        r = self._preflight("https://evil.example.com")
+        self.assertEqual(r.status_code, 204)
+        self.assertNotIn("Access-Control-Allow-Origin", r.headers)
+        r = self.client.get("/boards/1", headers={"Origin": "https://evil.example.com"})
+        self.assertEqual(r.status_code, 200)
+        self.assertNotIn("Access-Control-Allow-Origin", r.headers)
+        self.assertEqual(r.headers["Vary"], "Accept, Origin")
+
+    def test_actual_response_headers(self) -> None:
+        """Responses to allowed origins carry the origin, credentials and exposed headers; plain OPTIONS reaches Flask."""
+        r = self.client.put("/boards/7", headers={"Origin": FRONTEND})
+        self.assertEqual(r.get_json(), {"id": 7})
+        self.assertEqual(r.headers["Access-Control-Allow-Origin"], FRONTEND)
+        exposed = [name.strip() for name in r.headers["Access-Control-Expose-Headers"].split(",")]
+        self.assertIn("Retry-After", exposed)
+        self.assertIn("X-Total-Count", exposed)
+        self.assertEqual(r.headers["Vary"], "Accept, Origin")
+        r = self.client.get("/boards/7")
+        self.assertNotIn("Access-Control-Allow-Origin", r.headers)
+        r = self.client.options("/boards/7")
+        self.assertIn("PUT", r.headers["Allow"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+"""Tests for the background board and user deletion pipeline."""
+import os
+import sys
+import unittest
+from typing import Optional
+
+from sqlalchemy import func, insert, select
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from tests.fixtures import BOARD_TABLES, AppTestCase  # pylint: disable=wrong-import-position
+from models import db, User, Board, BoardMember, BoardStatus, BoardPriority, BoardTask, TaskDependency, ActivityLog, DeletionJob  # type: ignore  # pylint: disable=wrong-import-position
+from auth_routes import auth_bp  # type: ignore  # pylint: disable=wrong-import-position
+from board_routes import board_bp  # type: ignore  # pylint: disable=wrong-import-position
+from user_routes import user_bp  # type: ignore  # pylint: disable=wrong-import-position
+from deletion_jobs import deletion_bp, run_pending_jobs  # type: ignore  # pylint: disable=wrong-import-position
+
+
+class DeletionJobTests(AppTestCase):
+    """Soft delete, batched purge and progress reporting."""
+    BLUEPRINTS = (auth_bp, user_bp, board_bp, deletion_bp)
+    TABLES = BOARD_TABLES + [DeletionJob.__table__]
+
+    def _register(self, username: str) -> tuple[str, int]:
+        """Register a user and return the token and user ID."""
+        r = self.client.post("/register", json={"username": username, "email": f"{username}@example.com", "password": "pw"})
+        self.assertEqual(r.status_code, 201)
+        body = r.get_json() or {}
+        return body["token"], body["user"]["id"]
+
+    def _auth(self, token: Optional[str]) -> dict:
+        """Return the Authorization header for a request."""
+        return {"Authorization": f"Bearer {token}"}
+
+    def _board_with_tasks(self, token: str, owner_id: int, tasks: int) -> int:
+        """Create a board with `tasks` tasks, a dependency and activity rows."""
+        r = self.client.post("/boards", json={"name": "Big"}, headers=self._auth(token))
+        board_id = (r.get_json() or {})["id"]
+        db.session.execute(insert(BoardTask.__table__), [
+            {"board_id": board_id, "title": f"T{i}", "status_id": None, "priority": "low", "created_by": owner_id, "position": i}
+            for i in range(tasks)
+        ])
+        task_ids = db.session.scalars(select(BoardTask.id).where(BoardTask.board_id == board_id).order_by(BoardTask.id)).all()
+        db.session.add(TaskDependency(board_id=board_id, blocker_task_id=task_ids[0], blocked_task_id=task_ids[1]))
+        db.session.add(ActivityLog(board_id=board_id, user_id=owner_id, action="create", entity_type="task"))
+        db.session.commit()
+        return board_id
+
+    def _count(self, model, **filters) -> int:
+        """Count rows of a model matching the filters."""
+        db.session.remove()
+        return db.session.scalar(select(func.count()).select_from(model).filter_by(**filters))
+
+    def test_delete_board_hides_then_purges_in_batches(self) -> None:
+        """The board disappears at once; the worker removes every child row in batches."""
+        token, owner_id = self._register("owner")
+        board_id = self._board_with_tasks(token, owner_id, 7)
+        r = self.client.delete(f"/boards/{board_id}", headers=self._auth(token))
+        self.assertEqual(r.status_code, 202)
+        job_id = (r.get_json() or {}).get("job_id")
+        # hidden immediately, rows still present until the worker runs
+        self.assertEqual(self.client.get(f"/boards/{board_id}", headers=self._auth(token)).status_code, 404)
+        self.assertEqual(self.client.get("/boards", headers=self._auth(token)).get_json(), [])
+        self.assertEqual(self._count(BoardTask, board_id=board_id), 7)
+        r = self.client.get(f"/deletions/{job_id}", headers=self._auth(token))
+        self.assertEqual((r.get_json() or {}).get("status"), "pending")
+
+        self.assertEqual(run_pending_jobs(batch_size=2), 1)
+        for model in (BoardTask, BoardStatus, BoardPriority, BoardMember, TaskDependency, ActivityLog):
+            self.assertEqual(self._count(model, board_id=board_id), 0, model.__tablename__)
+        self.assertEqual(self._count(Board, id=board_id), 0)
+        job = (self.client.get(f"/deletions/{job_id}", headers=self._auth(token)).get_json() or {})
+        self.assertEqual(job.get("status"), "done")
+        # 7 tasks + 4 statuses + 4 priorities + 1 member + 1 dependency + 1 log + the board
+        self.assertEqual(job.get("rows_deleted"), 19)
+
+    def test_deletion_job_visible_only_to_requester(self) -> None:
+        """Other users cannot read a deletion job."""
+        token, owner_id = self._register("owner")
+        other_token, _ = self._register("other")
+        board_id = self._board_with_tasks(token, owner_id, 2)
+        job_id = (self.client.delete(f"/boards/{board_id}", headers=self._auth(token)).get_json() or {}).get("job_id")
+        r = self.client.get(f"/deletions/{job_id}", headers=self._auth(other_token))
+        self.assertEqual(r.status_code, 404)
+
+    def test_delete_user_with_boards(self) -> None:
+        """Deleting a board owner hides them and their boards, then purges and detaches their rows."""
+        token, user_id = self._register("leaving")
+        other_token, other_id = self._register("staying")
+        own_board = self._board_with_tasks(token, user_id, 3)
+        shared_board = self._board_with_tasks(other_token, other_id, 2)
+        db.session.add(BoardMember(board_id=shared_board, user_id=user_id, role="member"))
+        db.session.add(BoardTask(title="by leaver", description=None, assigned_to=user_id, created_by=user_id, due_date=None,
+                                 position=9, status_id=None, priority="low", board_id=shared_board))
+        db.session.commit()
+
+        r = self.client.delete("/users/leaving", headers=self._auth(token))
+        self.assertEqual(r.status_code, 202)
+        self.assertEqual(self.client.post("/login", json={"username": "leaving", "password": "pw"}).status_code, 401)
+        self.assertEqual(self.client.get(f"/boards/{own_board}", headers=self._auth(token)).status_code, 401)
+
+        self.assertEqual(run_pending_jobs(batch_size=2), 1)
+        self.assertEqual(self._count(User, id=user_id), 0)
+        self.assertEqual(self._count(Board, id=own_board), 0)
+        self.assertEqual(self._count(BoardTask, board_id=own_board), 0)
+        self.assertEqual(self._count(BoardMember, user_id=user_id), 0)
+        task = db.session.scalars(select(BoardTask).where(BoardTask.title == "by leaver")).one()
+        self.assertEqual(task.created_by, other_id)
+        self.assertIsNone(task.assigned_to)
+        self.assertEqual(self._count(BoardTask, board_id=shared_board), 3)
+
+    def test_delete_user_without_boards_is_immediate(self) -> None:
+        """Users who own no boards are still deleted in the request."""
+        token, user_id = self._register("plain")
+        r = self.client.delete("/users/plain", headers=self._auth(token))
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(self._count(User, id=user_id), 0)
+        self.assertEqual(run_pending_jobs(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
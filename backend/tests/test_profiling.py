@@ -0,0 +1,112 @@
+"""Tests for the opt-in request profiler in the Planarc application."""
+import os
+import sys
+import tempfile
+import unittest
+
+from flask import Flask
+
+CURRENT_DIR = os.path.dirname(__file__)
+BACKEND_DIR = os.path.abspath(os.path.join(CURRENT_DIR, ".."))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+API_DIR = os.path.join(BACKEND_DIR, "api")
+if API_DIR not in sys.path:
+    sys.path.insert(0, API_DIR)
+
+from models import db, User  # type: ignore  # pylint: disable=wrong-import-position
+from auth_routes import auth_bp  # type: ignore  # pylint: disable=wrong-import-position
+from profiling import profiling_bp, init_profiling  # type: ignore  # pylint: disable=wrong-import-position
+
+ADMIN_TOKEN = "admin-secret"
+
+
+def create_test_app(profile_dir: str) -> Flask:
+    """Create a Flask test application with profiling enabled for forced requests only."""
+    os.environ.setdefault("JWT_SECRET_KEY", "test-secret")
+    app = Flask(__name__)
+    app.config.update(
+        TESTING=True,
+        SQLALCHEMY_DATABASE_URI="sqlite://",
+        SQLALCHEMY_TRACK_MODIFICATIONS=False,
+        PROFILING_ENABLED=False,
+        PROFILING_DIR=profile_dir,
+        PROFILING_MAX_DUMPS=2,
+        ADMIN_TOKEN=ADMIN_TOKEN,
+    )
+    db.init_app(app)
+    app.register_blueprint(auth_bp)
+    app.register_blueprint(profiling_bp)
+    init_profiling(app)
+    return app
+
+
+class ProfilingTests(unittest.TestCase):
+    """Tests for the profiling hooks and admin endpoints."""
+    def setUp(self) -> None:
+        """Create a fresh app, profile directory and users table."""
+        self.tmp = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.app = create_test_app(self.tmp.name)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.Model.metadata.create_all(bind=db.engine, tables=[User.metadata.tables["users"]])
+        self.client = self.app.test_client()
+
+    def tearDown(self) -> None:
+        """Drop the app context and profile directory."""
+        db.session.remove()
+        self.ctx.pop()
+        self.tmp.cleanup()
+
+    def _forced_headers(self) -> dict:
+        """Headers that force a profile for a single request."""
+        return {"X-Profile-Request": "1", "X-Admin-Token": ADMIN_TOKEN}
+
+    def test_unprofiled_request_writes_nothing(self) -> None:
+        """Without sampling or the admin header no dump is written."""
+        r = self.client.post("/login", json={"username": "nobody", "password": "pw"})
+        self.assertEqual(r.status_code, 401)
+        self.assertEqual(os.listdir(self.tmp.name), [])
+
+    def test_forced_profile_is_listed_and_downloadable(self) -> None:
+        """A forced profile records SQL and can be listed and downloaded by an admin."""
+        r = self.client.post("/login", json={"username": "nobody", "password": "pw"}, headers=self._forced_headers())
+        self.assertEqual(r.status_code, 401)
+        listing = self.client.get("/admin/profiles", headers={"X-Admin-Token": ADMIN_TOKEN})
+        self.assertEqual(listing.status_code, 200)
+        dumps = listing.get_json() or []
+        self.assertEqual(len(dumps), 1)
+        self.assertEqual(dumps[0].get("path"), "/login")
+        self.assertGreaterEqual(dumps[0].get("query_count"), 1)
+        prof = self.client.get(f"/admin/profiles/{dumps[0]['files'][0]}", headers={"X-Admin-Token": ADMIN_TOKEN})
+        self.assertEqual(prof.status_code, 200)
+        prof.close()
+
+    def test_failed_request_stops_profiler(self) -> None:
+        """A view raising an exception still disables its profiler, so the next request can profile."""
+        @self.app.route("/boom")
+        def boom():
+            raise RuntimeError("boom")
+
+        with self.assertRaises(RuntimeError):
+            self.client.get("/boom", headers=self._forced_headers())
+        self.assertIsNone(sys.getprofile())
+        r = self.client.post("/login", json={"username": "nobody", "password": "pw"}, headers=self._forced_headers())
+        self.assertEqual(r.status_code, 401)
+        self.assertEqual(len(self.client.get("/admin/profiles", headers={"X-Admin-Token": ADMIN_TOKEN}).get_json() or []), 1)
+
+    def test_admin_endpoints_require_token(self) -> None:
+        """Listing profiles without the admin token is rejected."""
+        r = self.client.get("/admin/profiles", headers={"X-Admin-Token": "wrong"})
+        self.assertEqual(r.status_code, 403)
+
+    def test_dumps_are_rotated(self) -> None:
+        """Only the newest PROFILING_MAX_DUMPS dumps are kept."""
+        for _ in range(4):
+            self.client.post("/login", json={"username": "nobody", "password": "pw"}, headers=self._forced_headers())
+        stems = {os.path.splitext(name)[0] for name in os.listdir(self.tmp.name)}
+        self.assertEqual(len(stems), 2)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
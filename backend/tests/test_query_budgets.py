@@ -0,0 +1,237 @@
+"""Query-count budgets for the hot board endpoints.
+
+Each test measures an endpoint on a small board, grows the data, and measures
+again: the statement count must stay within budget and must not grow with the
+data (an N+1 shows up as a count that scales with rows).
+"""
+import json
+import os
+import sys
+import unittest
+from datetime import date
+from typing import Optional
+
+import sqlalchemy
+from sqlalchemy import insert
+from sqlalchemy.engine import Engine
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from tests.fixtures import BOARD_TABLES, AppTestCase  # pylint: disable=wrong-import-position
+from tests.query_counter import QueryBudgetMixin  # pylint: disable=wrong-import-position
+from models import db, User, Board, BoardMember, BoardStatus, BoardTask, ActivityLog, BoardSprint  # type: ignore  # pylint: disable=wrong-import-position
+from auth_routes import auth_bp  # type: ignore  # pylint: disable=wrong-import-position
+from board_routes import board_bp  # type: ignore  # pylint: disable=wrong-import-position
+from user_routes import user_bp  # type: ignore  # pylint: disable=wrong-import-position
+from board_vocabulary import vocabulary_cache  # type: ignore  # pylint: disable=wrong-import-position
+from task_search import rebuild_index  # type: ignore  # pylint: disable=wrong-import-position
+
+
+class QueryBudgetTests(QueryBudgetMixin, AppTestCase):
+    """Per-endpoint SQL statement budgets that must not grow with data size."""
+    BLUEPRINTS = (auth_bp, board_bp, user_bp)
+    TABLES = BOARD_TABLES
+
+    def setUp(self) -> None:
+        """Create the tables, an owner and a board."""
+        super().setUp()
+        r = self.client.post("/register", json={"username": "owner", "email": "owner@example.com", "password": "pw"})
+        body = r.get_json() or {}
+        self.token: Optional[str] = body.get("token")
+        self.owner_id: int = body.get("user", {}).get("id")
+        r = self.client.post("/boards", json={"name": "Budget"}, headers=self._auth())
+        self.board_id: int = (r.get_json() or {}).get("id")
+        self._next_user = 0
+        self._next_board = 0
+
+    def query_engine(self) -> Engine:
+        """Engine whose statements are counted."""
+        return db.engine
+
+    def reset_session(self) -> None:
+        """Start each measured request from an empty identity map, as in production."""
+        db.session.remove()
+
+    def _auth(self) -> dict:
+        """Return the Authorization header for the owner."""
+        return {"Authorization": f"Bearer {self.token}"}
+
+    def _add_members(self, count: int) -> None:
+        """Insert `count` users and make them members of the board."""
+        users = [
+            {"username": f"m{self._next_user + i}", "email": f"m{self._next_user + i}@example.com", "password": "x"}
+            for i in range(count)
+        ]
+        self._next_user += count
+        db.session.execute(insert(User.__table__), users)
+        ids = db.session.scalars(sqlalchemy.select(User.id).where(User.username.in_([u["username"] for u in users]))).all()
+        db.session.execute(insert(BoardMember.__table__), [
+            {"board_id": self.board_id, "user_id": uid, "role": "member"} for uid in ids
+        ])
+        db.session.commit()
+
+    def _add_tasks(self, count: int) -> None:
+        """Insert `count` tasks spread over the default statuses, plus one activity row each."""
+        statuses = db.session.scalars(
+            sqlalchemy.select(BoardStatus.id).where(BoardStatus.board_id == self.board_id).order_by(BoardStatus.position)
+        ).all()
+        db.session.execute(insert(BoardTask.__table__), [
+            {"board_id": self.board_id, "title": f"T{i}", "status_id": statuses[i % len(statuses)], "priority": "medium",
+             "created_by": self.owner_id, "position": i}
+            for i in range(count)
+        ])
+        db.session.execute(insert(ActivityLog.__table__), [
+            {"board_id": self.board_id, "user_id": self.owner_id, "action": "create", "entity_type": "task",
+             "after": json.dumps({"title": f"T{i}"})}
+            for i in range(count)
+        ])
+        db.session.commit()
+
+    def _add_boards(self, count: int) -> None:
+        """Insert `count` boards owned by the owner, each with an active sprint and two tasks."""
+        db.session.execute(insert(Board.__table__), [
+            {"name": f"Extra {self._next_board + i}", "owner_id": self.owner_id} for i in range(count)
+        ])
+        self._next_board += count
+        ids = db.session.scalars(sqlalchemy.select(Board.id).order_by(Board.id.desc()).limit(count)).all()
+        db.session.execute(insert(BoardSprint.__table__), [
+            {"board_id": bid, "start_date": date(2024, 1, 1), "end_date": date(2024, 1, 14), "is_active": 1} for bid in ids
+        ])
+        db.session.execute(insert(BoardStatus.__table__), [
+            {"board_id": bid, "name": name, "position": i} for bid in ids for i, name in enumerate(("todo", "done"))
+        ])
+        status_ids = db.session.execute(sqlalchemy.select(BoardStatus.id, BoardStatus.board_id).where(BoardStatus.board_id.in_(ids))).all()
+        db.session.execute(insert(BoardTask.__table__), [
+            {"board_id": bid, "title": f"T{i}", "status_id": sid, "priority": "medium", "created_by": self.owner_id,
+             "position": i, "estimate": 2, "due_date": date(2024, 1, 2)}
+            for i, (sid, bid) in enumerate(status_ids)
+        ])
+        db.session.commit()
+
+    def _measure(self, path: str, budget: int) -> int:
+        """Issue a GET with a cold vocabulary cache within budget and return the statement count."""
+        vocabulary_cache.clear()
+        with self.assertMaxQueries(budget) as counter:
+            r = self.client.get(path, headers=self._auth())
+        self.assertEqual(r.status_code, 200)
+        return counter.count
+
+    def _assert_flat(self, path: str, budget: int, grow) -> None:
+        """Measure, grow the data, measure again; counts must match and stay within budget."""
+        grow(2)
+        small = self._measure(path, budget)
+        grow(40)
+        large = self._measure(path, budget)
+        self.assertEqual(small, large, f"{path} query count grew with data: {small} -> {large}")
+
+    def test_list_board_members_budget(self) -> None:
+        """list_board_members issues <=3 queries regardless of member count."""
+        self._assert_flat(f"/boards/{self.board_id}/members", 3, self._add_members)
+
+    def test_list_board_tasks_budget(self) -> None:
+        """list_board_tasks issues <=4 queries regardless of task count."""
+        self._assert_flat(f"/boards/{self.board_id}/tasks", 4, self._add_tasks)
+
+    def test_list_board_tasks_label_filter_budget(self) -> None:
+        """list_board_tasks filtered by label stays within the unfiltered budget."""
+        self._assert_flat(f"/boards/{self.board_id}/tasks?labels=bug,ui", 4, self._add_tasks)
+
+    def test_list_board_tasks_warm_vocabulary(self) -> None:
+        """With the board's vocabulary cached, list_board_tasks skips the status query."""
+        self._add_tasks(2)
+        cold = self._measure(f"/boards/{self.board_id}/tasks", 4)
+        with self.assertMaxQueries(cold - 1):
+            r = self.client.get(f"/boards/{self.board_id}/tasks", headers=self._auth())
+        self.assertEqual(r.status_code, 200)
+
+    def test_vocabulary_survives_task_writes(self) -> None:
+        """Task writes keep the vocabulary cached; adding a status reloads it."""
+        self._add_tasks(2)
+        cold = self._measure(f"/boards/{self.board_id}/tasks", 4)
+        r = self.client.post(f"/boards/{self.board_id}/tasks", json={"title": "new", "status": "todo"}, headers=self._auth())
+        self.assertEqual(r.status_code, 201)
+        with self.assertMaxQueries(cold - 1):
+            r = self.client.get(f"/boards/{self.board_id}/tasks", headers=self._auth())
+        self.assertEqual(r.status_code, 200)
+        r = self.client.post(f"/boards/{self.board_id}/statuses", json={"name": "qa"}, headers=self._auth())
+        self.assertEqual(r.status_code, 201)
+        with self.assertMaxQueries(cold):
+            r = self.client.get(f"/boards/{self.board_id}/tasks?format=columnar", headers=self._auth())
+        self.assertEqual((r.get_json() or {})["dictionaries"]["status"][-1], "qa")
+
+    def test_cfd_data_budget(self) -> None:
+        """cfd_data issues <=4 queries regardless of task or status count."""
+        self._assert_flat(f"/boards/{self.board_id}/reports/cfd", 4, self._add_tasks)
+
+    def test_list_activity_budget(self) -> None:
+        """list_activity issues <=3 queries regardless of log size."""
+        self._assert_flat(f"/boards/{self.board_id}/activity", 3, self._add_tasks)
+
+    def test_boards_rollup_budget(self) -> None:
+        """boards_rollup issues <=4 queries regardless of board, sprint or task count."""
+        self._assert_flat("/boards/rollup", 4, self._add_boards)
+
+    def test_search_tasks_budget(self) -> None:
+        """search_board_tasks issues <=6 queries regardless of task or match count."""
+        def grow(count: int) -> None:
+            self._add_tasks(count)
+            rebuild_index()
+        self._assert_flat(f"/boards/{self.board_id}/tasks/search?q=t", 6, grow)
+
+    def test_create_board_invite_budget(self) -> None:
+        """create_board resolves and inserts invitees with a constant number of queries."""
+        counts = []
+        for invitees in (2, 40):
+            self._add_members(invitees)
+            names = [f"m{i}" for i in range(self._next_user - invitees, self._next_user)]
+            with self.assertMaxQueries(8) as counter:
+                r = self.client.post("/boards", json={"name": "Invites", "invite_usernames": names}, headers=self._auth())
+            self.assertEqual(r.status_code, 201)
+            counts.append(counter.count)
+        self.assertEqual(counts[0], counts[1])
+
+    def test_bulk_update_tasks_budget(self) -> None:
+        """bulk_update_tasks issues the same number of queries for 2 or 40 tasks."""
+        counts = []
+        for tasks in (2, 40):
+            self._add_tasks(tasks)
+            ids = db.session.scalars(sqlalchemy.select(BoardTask.id).order_by(BoardTask.id.desc()).limit(tasks)).all()
+            # task writes leave the vocabulary cached; start both measurements cold
+            vocabulary_cache.clear()
+            with self.assertMaxQueries(8) as counter:
+                r = self.client.post(f"/boards/{self.board_id}/tasks/bulk",
+                                     json={"task_ids": ids, "changes": {"status": "done", "estimate": 3}}, headers=self._auth())
+            self.assertEqual(r.status_code, 200)
+            counts.append(counter.count)
+        self.assertEqual(counts[0], counts[1])
+
+    def test_lookup_users_budget(self) -> None:
+        """lookup_users resolves 2 or 40 users with the same number of queries."""
+        counts = []
+        for members in (2, 40):
+            self._add_members(members)
+            ids = db.session.scalars(sqlalchemy.select(User.id).order_by(User.id.desc()).limit(members)).all()
+            with self.assertMaxQueries(1) as counter:
+                r = self.client.post("/users/lookup", json={"ids": ids}, headers=self._auth())
+            self.assertEqual(len((r.get_json() or {}).get("users", [])), members)
+            counts.append(counter.count)
+        self.assertEqual(counts[0], counts[1])
+
+    def test_reorder_statuses_budget(self) -> None:
+        """reorder_statuses issues the same number of queries for 5 or 41 columns."""
+        counts = []
+        for extra in (1, 36):
+            db.session.execute(insert(BoardStatus.__table__), [
+                {"board_id": self.board_id, "name": f"col {extra}-{i}", "position": 10 + i} for i in range(extra)
+            ])
+            db.session.commit()
+            ids = db.session.scalars(sqlalchemy.select(BoardStatus.id).where(BoardStatus.board_id == self.board_id)).all()
+            with self.assertMaxQueries(6) as counter:
+                r = self.client.put(f"/boards/{self.board_id}/statuses/order", json={"ids": list(reversed(ids))}, headers=self._auth())
+            self.assertEqual(r.status_code, 200)
+            counts.append(counter.count)
+        self.assertEqual(counts[0], counts[1])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -2,78 +2,24 @@
 import os
 import sys
 import unittest
+from datetime import date
 from typing import Optional
-from flask import Flask
-import sqlalchemy
-
-CURRENT_DIR = os.path.dirname(__file__)
-BACKEND_DIR = os.path.abspath(os.path.join(CURRENT_DIR, ".."))
-if BACKEND_DIR not in sys.path:
-    sys.path.insert(0, BACKEND_DIR)
-API_DIR = os.path.join(BACKEND_DIR, "api")
-if API_DIR not in sys.path:
-    sys.path.insert(0, API_DIR)
-
-from models import db, User  # type: ignore  # pylint: disable=wrong-import-position
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from tests.fixtures import AppTestCase  # pylint: disable=wrong-import-position
+from models import db, User, Board, BoardMember, BoardSprint, BoardStatus, BoardTask, RefreshToken, TokenRevocation  # type: ignore  # pylint: disable=wrong-import-position
 from auth_routes import auth_bp  # type: ignore  # pylint: disable=wrong-import-position
 from user_routes import user_bp  # type: ignore  # pylint: disable=wrong-import-position
 
-def create_test_app() -> Flask:
-    """Create a Flask test application with the necessary configurations."""
-    os.environ.setdefault("JWT_SECRET_KEY", "test-secret")
-    app = Flask(__name__)
-    app.config.update(
-        TESTING=True,
-        SQLALCHEMY_DATABASE_URI=os.getenv(
-            "TEST_DATABASE_URI",
-            "sqlite:///" + os.path.join(BACKEND_DIR, "tests", "test_user.sqlite3"),
-        ),
-        SQLALCHEMY_TRACK_MODIFICATIONS=False,
-    )
-    db.init_app(app)
-    app.register_blueprint(auth_bp)
-    app.register_blueprint(user_bp)
-    return app
-
-
-class UserRouteTests(unittest.TestCase):
+
+class UserRouteTests(AppTestCase):
     """Tests for the user routes in the Flask application."""
-    @classmethod
-    def setUpClass(cls) -> None:
-        """Set up the test application context."""
-        cls.app = create_test_app()
-        cls.ctx = cls.app.app_context()
-        cls.ctx.push()
-
-    @classmethod
-    def tearDownClass(cls) -> None:
-        """Tear down the test application context."""
-        cls.ctx.pop()
-
-    def setUp(self) -> None:
-        """Set up the test database."""
-        db.session.remove()
-        # Only create the users table to keep tests lightweight
-        try:
-            users_table = User.metadata.tables.get("users")
-            if users_table is not None:
-                db.Model.metadata.drop_all(bind=db.engine, tables=[users_table])
-        except sqlalchemy.exc.SQLAlchemyError:
-            db.session.rollback()
-        users_table = User.metadata.tables.get("users")
-        if users_table is not None:
-            db.Model.metadata.create_all(bind=db.engine, tables=[users_table])
-        self.client = self.app.test_client()
-
-    def tearDown(self) -> None:
-        """Tear down the test database."""
-        db.session.remove()
-        try:
-            users_table = User.metadata.tables.get("users")
-            if users_table is not None:
-                db.Model.metadata.drop_all(bind=db.engine, tables=[users_table])
-        except sqlalchemy.exc.SQLAlchemyError:
-            db.session.rollback()
+    BLUEPRINTS = (auth_bp, user_bp)
+    # the users table plus the board tables read by delete_user and /users/me/tasks
+    TABLES = [User.__table__, Board.__table__, BoardMember.__table__, BoardSprint.__table__, BoardStatus.__table__, BoardTask.__table__,
+              RefreshToken.__table__, TokenRevocation.__table__]
+    DATABASE = "test_user.sqlite3"
 
     def _register(self, username: str, email: str, password: str = "pw") -> tuple[int, dict]:
         """Register a new user."""
@@ -105,6 +51,29 @@ class UserRouteTests(unittest.TestCase):
         data = r.get_json() or {}
         self.assertEqual(data.get("username"), "alice")
 
+    def test_lookup_users_batch(self) -> None:
+        """Test resolving several users by id with GET and POST, including missing ids and revalidation."""
+        _, alice = self._register("alice", "alice@example.com")
+        _, bob = self._register("bob", "bob@example.com")
+        token = alice.get("token")
+        alice_id, bob_id = alice["user"]["id"], bob["user"]["id"]
+        r = self.client.get(f"/users?ids={bob_id},{alice_id},999,{bob_id}", headers=self._auth_header(token))
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.get_json(), {
+            "users": [{"id": bob_id, "username": "bob"}, {"id": alice_id, "username": "alice"}],
+            "missing": [999]
+        })
+        self.assertIn("max-age", r.headers.get("Cache-Control", ""))
+        etag = r.headers.get("ETag")
+        self.assertTrue(etag)
+        again = self.client.get(f"/users?ids={bob_id},{alice_id},999,{bob_id}", headers={**self._auth_header(token), "If-None-Match": etag})
+        self.assertEqual(again.status_code, 304)
+        r = self.client.post("/users/lookup", json={"ids": [alice_id]}, headers=self._auth_header(token))
+        self.assertEqual((r.get_json() or {}).get("users"), [{"id": alice_id, "username": "alice"}])
+        for bad in ("/users", "/users?ids=1,x"):
+            self.assertEqual(self.client.get(bad, headers=self._auth_header(token)).status_code, 400)
+        self.assertEqual(self.client.post("/users/lookup", json={"ids": list(range(1, 502))}, headers=self._auth_header(token)).status_code, 400)
+
     def test_edit_username_self(self) -> None:
         """Test editing a user's username by themselves."""
         status, body = self._register("bob", "bob@example.com")
@@ -132,6 +101,71 @@ class UserRouteTests(unittest.TestCase):
         r2 = self.client.get(f"/users/{user_id}", headers=self._auth_header(token))
         self.assertEqual(r2.status_code, 404)
 
+    def test_logged_out_token_rejected_on_user_routes(self) -> None:
+        """Test a logged-out access token gets 401 on user routes; only deleted users fall back to 404 on lookups."""
+        _, body = self._register("lou", "lou@example.com")
+        token, user_id = body.get("token"), body.get("user", {}).get("id")
+        self.assertEqual(self.client.post("/logout", headers=self._auth_header(token)).status_code, 200)
+        for path in ("/users/me/tasks", "/users/defaults", f"/users/{user_id}"):
+            self.assertEqual(self.client.get(path, headers=self._auth_header(token)).status_code, 401, path)
+        _, body = self._register("gone", "gone@example.com")
+        token = body.get("token")
+        self.assertEqual(self.client.delete("/users/gone", headers=self._auth_header(token)).status_code, 200)
+        self.assertEqual(self.client.get("/users/me/tasks", headers=self._auth_header(token)).status_code, 401)
+
+    def test_my_tasks_across_boards(self) -> None:
+        """Test /users/me/tasks filters, orders undated tasks last and pages with a cursor."""
+        _, body = self._register("dana", "dana@example.com")
+        token, user_id = body.get("token"), body.get("user", {}).get("id")
+        _, other = self._register("erin", "erin@example.com")
+        other_id = other.get("user", {}).get("id")
+        own = Board(name="Own", description=None, owner_id=user_id)
+        shared = Board(name="Shared", description=None, owner_id=other_id)
+        private = Board(name="Private", description=None, owner_id=other_id)
+        db.session.add_all([own, shared, private])
+        db.session.flush()
+        db.session.add(BoardMember(board_id=shared.id, user_id=user_id, role="member"))
+        sprint = BoardSprint(board_id=own.id, start_date=date(2024, 1, 1), end_date=date(2024, 1, 14), is_active=1)
+        db.session.add(sprint)
+        db.session.add_all([BoardStatus(board_id=board.id, name=name, position=i)
+                            for board in (own, shared, private) for i, name in enumerate(("todo", "done"))])
+        db.session.flush()
+        status_ids = {(s.board_id, s.name): s.id for s in BoardStatus.query.all()}
+        for title, board, due, status, sprint_id, assignee in (
+            ("late", own, date(2024, 1, 1), "todo", sprint.id, user_id),
+            ("soon", shared, date(2024, 2, 1), "todo", None, user_id),
+            ("same day", own, date(2024, 2, 1), "done", None, user_id),
+            ("someday", shared, None, "todo", None, user_id),
+            ("not mine", own, date(2024, 1, 1), "todo", None, other_id),
+            ("hidden", private, date(2024, 1, 1), "todo", None, user_id),
+        ):
+            db.session.add(BoardTask(title=title, description=None, assigned_to=assignee, created_by=user_id, due_date=due,
+                                     position=0, status_id=status_ids[(board.id, status)], priority="low", board_id=board.id, sprint_id=sprint_id))
+        db.session.commit()
+
+        titles, cursor = [], None
+        while True:
+            r = self.client.get("/users/me/tasks?limit=2" + (f"&cursor={cursor}" if cursor else ""), headers=self._auth_header(token))
+            self.assertEqual(r.status_code, 200)
+            page = r.get_json() or {}
+            titles += [t["title"] for t in page["items"]]
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+        self.assertEqual(titles, ["late", "soon", "same day", "someday"])
+
+        def fetch(query: str) -> list[str]:
+            return [t["title"] for t in (self.client.get(f"/users/me/tasks?{query}", headers=self._auth_header(token)).get_json() or {})["items"]]
+        self.assertEqual(fetch("status=todo&due_before=2024-02-01"), ["late"])
+        self.assertEqual(fetch("active_sprint=true"), ["late"])
+        self.assertEqual(self.client.get("/users/me/tasks?cursor=bogus", headers=self._auth_header(token)).status_code, 400)
+
+        page = self.client.get("/users/me/tasks?format=columnar", headers=self._auth_header(token)).get_json() or {}
+        items, dictionaries = page["items"]["columns"], page["items"]["dictionaries"]
+        self.assertEqual(items["title"], ["late", "soon", "same day", "someday"])
+        self.assertEqual([dictionaries["board_name"][i] for i in items["board_name"]], ["Own", "Shared", "Own", "Shared"])
+        self.assertEqual(dictionaries["status"], ["todo", "done"])
+
 
 if __name__ == "__main__":
     unittest.main(verbosity=2)
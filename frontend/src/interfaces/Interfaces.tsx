@@ -21,6 +21,8 @@ export type RegisterData = {
 export type AuthResponse = {
   user: User;
   token: string;
+  refresh_token?: string;
+  expires_in?: number;
   message?: string;
 }
 
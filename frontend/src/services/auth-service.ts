@@ -3,6 +3,8 @@ import { LoginCredentials, RegisterData, AuthResponse, User } from "../interface
 const API_BASE_URL = process.env.REACT_APP_API_URL;
 
 class AuthService {
+	private refreshing: Promise<boolean> | null = null;
+
 	async login(credentials: LoginCredentials): Promise<AuthResponse> {
 		const response = await fetch(`${API_BASE_URL}/auth/login`, {
 			method: "POST",
@@ -22,8 +24,8 @@ class AuthService {
 		const u = data.user as User;
 		const normalizedUser: User = { ...u, userId: u.userId ?? String(u.id ?? "") };
 		const normalized: AuthResponse = { ...data, user: normalizedUser };
-		// Store token in localStorage
-		localStorage.setItem("token", normalized.token);
+		// Store tokens in localStorage
+		this.storeTokens(normalized);
 		localStorage.setItem("user", JSON.stringify(normalized.user));
 		return normalized;
 	}
@@ -47,15 +49,25 @@ class AuthService {
 		const u = data.user as User;
 		const normalizedUser: User = { ...u, userId: u.userId ?? String(u.id ?? "") };
 		const normalized: AuthResponse = { ...data, user: normalizedUser };
-		// Store token in localStorage
-		localStorage.setItem("token", normalized.token);
+		// Store tokens in localStorage
+		this.storeTokens(normalized);
 		localStorage.setItem("user", JSON.stringify(normalized.user));
 		return normalized;
 	}
 
 	logout(): void {
-		localStorage.removeItem("token");
-		localStorage.removeItem("user");
+		const refreshToken = this.getRefreshToken();
+		if (refreshToken) {
+			// Revoke the session server-side; local state is cleared regardless of the outcome
+			fetch(`${API_BASE_URL}/auth/logout`, {
+				method: "POST",
+				headers: {
+					"Content-Type": "application/json",
+				},
+				body: JSON.stringify({ refresh_token: refreshToken }),
+			}).catch(() => undefined);
+		}
+		this.clearTokens();
 	}
 
 	getCurrentUser(): User | null {
@@ -67,16 +79,85 @@ class AuthService {
 		return localStorage.getItem("token");
 	}
 
-	async validateToken(): Promise<boolean> {
-		const token = this.getToken();
-		if (!token) {return false;}
+	getRefreshToken(): string | null {
+		return localStorage.getItem("refresh_token");
+	}
+
+	private storeTokens(tokens: { token: string; refresh_token?: string }): void {
+		localStorage.setItem("token", tokens.token);
+		if (tokens.refresh_token) {
+			localStorage.setItem("refresh_token", tokens.refresh_token);
+		}
+	}
+
+	private clearTokens(): void {
+		localStorage.removeItem("token");
+		localStorage.removeItem("refresh_token");
+		localStorage.removeItem("user");
+	}
+
+	/**
+	 * Exchange the stored refresh token for a new access token and refresh token.
+	 * Concurrent callers share one request, since each refresh token can be used only once.
+	 */
+	refreshAccessToken(): Promise<boolean> {
+		if (!this.refreshing) {
+			this.refreshing = this.requestRefresh().finally(() => {
+				this.refreshing = null;
+			});
+		}
+		return this.refreshing;
+	}
+
+	private async requestRefresh(): Promise<boolean> {
+		const refreshToken = this.getRefreshToken();
+		if (!refreshToken) {return false;}
 
 		try {
-			const response = await fetch(`${API_BASE_URL}/auth/validate`, {
+			const response = await fetch(`${API_BASE_URL}/auth/refresh`, {
+				method: "POST",
 				headers: {
-					"Authorization": `Bearer ${token}`,
+					"Content-Type": "application/json",
 				},
+				body: JSON.stringify({ refresh_token: refreshToken }),
 			});
+			if (response.status === 401) {
+				// Expired, revoked or reused: the session is over
+				this.clearTokens();
+				return false;
+			}
+			if (!response.ok) {return false;}
+			this.storeTokens(await response.json());
+			return true;
+		} catch {
+			return false;
+		}
+	}
+
+	/**
+	 * fetch with the current access token; on a 401 the token is refreshed once and the request retried.
+	 */
+	async authFetch(input: string, init: RequestInit = {}): Promise<Response> {
+		const send = () => {
+			const headers = new Headers(init.headers);
+			const token = this.getToken();
+			if (token) {
+				headers.set("Authorization", `Bearer ${token}`);
+			}
+			return fetch(input, { ...init, headers });
+		};
+		const response = await send();
+		if (response.status !== 401 || !(await this.refreshAccessToken())) {
+			return response;
+		}
+		return send();
+	}
+
+	async validateToken(): Promise<boolean> {
+		if (!this.getToken()) {return false;}
+
+		try {
+			const response = await this.authFetch(`${API_BASE_URL}/auth/validate`);
 			return response.ok;
 		} catch {
 			return false;
@@ -13,7 +13,7 @@ class BoardService {
 	}
 
 	async listBoards(): Promise<Board[]> {
-		const res = await fetch(`${API_BASE_URL}/boards`, { headers: this.authHeaders() });
+		const res = await authService.authFetch(`${API_BASE_URL}/boards`, { headers: this.authHeaders() });
 		if (!res.ok) {
 			throw new Error((await res.json()).message || "Failed to fetch boards");
 		}
@@ -21,7 +21,7 @@ class BoardService {
 	}
 
 	async createBoard(payload: Pick<Board, "name" | "description"> & { invite_usernames?: string[]; invite_user_ids?: number[]; background_color?: string; statuses?: string[]; priorities?: string[] }): Promise<Board> {
-		const res = await fetch(`${API_BASE_URL}/boards`, {
+		const res = await authService.authFetch(`${API_BASE_URL}/boards`, {
 			method: "POST",
 			headers: this.authHeaders(),
 			body: JSON.stringify(payload),
@@ -33,7 +33,7 @@ class BoardService {
 	}
 
 	async getBoard(boardId: number): Promise<Board> {
-		const res = await fetch(`${API_BASE_URL}/boards/${boardId}`, { headers: this.authHeaders() });
+		const res = await authService.authFetch(`${API_BASE_URL}/boards/${boardId}`, { headers: this.authHeaders() });
 		if (!res.ok) {
 			throw new Error((await res.json()).message || "Failed to fetch board");
 		}
@@ -41,7 +41,7 @@ class BoardService {
 	}
 
 	async updateBoard(boardId: number, payload: Partial<Pick<Board, "name" | "description" | "background_color">> & { add_usernames?: string[]; add_user_ids?: number[]; remove_user_ids?: number[] }): Promise<void> {
-		const res = await fetch(`${API_BASE_URL}/boards/${boardId}`, {
+		const res = await authService.authFetch(`${API_BASE_URL}/boards/${boardId}`, {
 			method: "PUT",
 			headers: this.authHeaders(),
 			body: JSON.stringify(payload),
@@ -53,7 +53,7 @@ class BoardService {
 
 	// Members
 	async listMembers(boardId: number): Promise<Array<{ id: number; board_id: number; user_id: number; username?: string; role: string; joined_at: string }>> {
-		const res = await fetch(`${API_BASE_URL}/boards/${boardId}/members`, { headers: this.authHeaders() });
+		const res = await authService.authFetch(`${API_BASE_URL}/boards/${boardId}/members`, { headers: this.authHeaders() });
 		if (!res.ok) {
 			throw new Error((await res.json()).message || "Failed to fetch members");
 		}
@@ -61,7 +61,7 @@ class BoardService {
 	}
 
 	async addMember(boardId: number, user_id: number, role = "member"): Promise<void> {
-		const res = await fetch(`${API_BASE_URL}/boards/${boardId}/members`, {
+		const res = await authService.authFetch(`${API_BASE_URL}/boards/${boardId}/members`, {
 			method: "POST",
 			headers: this.authHeaders(),
 			body: JSON.stringify({ user_id, role }),
@@ -72,7 +72,7 @@ class BoardService {
 	}
 
 	async addMemberByUsername(boardId: number, username: string, role = "member"): Promise<void> {
-		const res = await fetch(`${API_BASE_URL}/boards/${boardId}/members`, {
+		const res = await authService.authFetch(`${API_BASE_URL}/boards/${boardId}/members`, {
 			method: "POST",
 			headers: this.authHeaders(),
 			body: JSON.stringify({ username, role }),
@@ -83,7 +83,7 @@ class BoardService {
 	}
 
 	async removeMember(boardId: number, user_id: number): Promise<void> {
-		const res = await fetch(`${API_BASE_URL}/boards/${boardId}/members/${user_id}`, {
+		const res = await authService.authFetch(`${API_BASE_URL}/boards/${boardId}/members/${user_id}`, {
 			method: "DELETE",
 			headers: this.authHeaders(),
 		});
@@ -93,7 +93,7 @@ class BoardService {
 	}
 
 	async deleteBoard(boardId: number): Promise<void> {
-		const res = await fetch(`${API_BASE_URL}/boards/${boardId}`, {
+		const res = await authService.authFetch(`${API_BASE_URL}/boards/${boardId}`, {
 			method: "DELETE",
 			headers: this.authHeaders(),
 		});
@@ -103,7 +103,7 @@ class BoardService {
 	}
 
 	async listTasks(boardId: number): Promise<BoardTask[]> {
-		const res = await fetch(`${API_BASE_URL}/boards/${boardId}/tasks`, { headers: this.authHeaders() });
+		const res = await authService.authFetch(`${API_BASE_URL}/boards/${boardId}/tasks`, { headers: this.authHeaders() });
 		if (!res.ok) {
 			throw new Error((await res.json()).message || "Failed to fetch tasks");
 		}
@@ -111,7 +111,7 @@ class BoardService {
 	}
 
 	async createTask(boardId: number, payload: Pick<BoardTask, "title" | "description" | "status" | "priority" | "assigned_to" | "due_date" | "estimate" | "effort_used"> & { sprint_id?: number | null; labels?: string[] | string | null }): Promise<BoardTask> {
-		const res = await fetch(`${API_BASE_URL}/boards/${boardId}/tasks`, {
+		const res = await authService.authFetch(`${API_BASE_URL}/boards/${boardId}/tasks`, {
 			method: "POST",
 			headers: this.authHeaders(),
 			body: JSON.stringify(payload),
@@ -127,7 +127,7 @@ class BoardService {
 		taskId: number,
 		payload: Partial<Pick<BoardTask, "title" | "description" | "status" | "priority" | "assigned_to" | "due_date" | "position"> & { estimate?: number | null; effort_used?: number; sprint_id?: number | null; labels?: string[] | string | null }>,
 	): Promise<void> {
-		const res = await fetch(`${API_BASE_URL}/boards/${boardId}/tasks/${taskId}`, {
+		const res = await authService.authFetch(`${API_BASE_URL}/boards/${boardId}/tasks/${taskId}`, {
 			method: "PUT",
 			headers: this.authHeaders(),
 			body: JSON.stringify(payload),
@@ -138,7 +138,7 @@ class BoardService {
 	}
 
 	async deleteTask(boardId: number, taskId: number): Promise<void> {
-		const res = await fetch(`${API_BASE_URL}/boards/${boardId}/tasks/${taskId}`, {
+		const res = await authService.authFetch(`${API_BASE_URL}/boards/${boardId}/tasks/${taskId}`, {
 			method: "DELETE",
 			headers: this.authHeaders(),
 		});
@@ -148,7 +148,7 @@ class BoardService {
 	}
 
 	async reorderTasks(boardId: number, moves: Array<{ task_id: number; to_status: string; to_position: number }>): Promise<void> {
-		const res = await fetch(`${API_BASE_URL}/boards/${boardId}/tasks/reorder`, {
+		const res = await authService.authFetch(`${API_BASE_URL}/boards/${boardId}/tasks/reorder`, {
 			method: "POST",
 			headers: this.authHeaders(),
 			body: JSON.stringify({ moves }),
@@ -159,8 +159,8 @@ class BoardService {
 	}
 
 	// Bulk updates
-	async bulkUpdateTasks(boardId: number, task_ids: number[], changes: { status?: string; assigned_to?: number | null; labels?: string[] | string | null; estimate?: number | null }): Promise<void> {
-		const res = await fetch(`${API_BASE_URL}/boards/${boardId}/tasks/bulk`, {
+	async bulkUpdateTasks(boardId: number, task_ids: number[], changes: { title?: string; description?: string | null; status?: string; priority?: string; assigned_to?: number | null; sprint_id?: number | null; due_date?: string | null; labels?: string[] | string | null; estimate?: number | null; effort_used?: number }): Promise<void> {
+		const res = await authService.authFetch(`${API_BASE_URL}/boards/${boardId}/tasks/bulk`, {
 			method: "POST",
 			headers: this.authHeaders(),
 			body: JSON.stringify({ task_ids, changes }),
@@ -172,7 +172,7 @@ class BoardService {
 
 	// Dependencies
 	async listDependencies(boardId: number): Promise<Array<{ id: number; board_id: number; blocker_task_id: number; blocked_task_id: number; created_at?: string }>> {
-		const res = await fetch(`${API_BASE_URL}/boards/${boardId}/dependencies`, { headers: this.authHeaders() });
+		const res = await authService.authFetch(`${API_BASE_URL}/boards/${boardId}/dependencies`, { headers: this.authHeaders() });
 		if (!res.ok) {
 			throw new Error((await res.json()).message || "Failed to fetch dependencies");
 		}
@@ -180,7 +180,7 @@ class BoardService {
 	}
 
 	async createDependency(boardId: number, blocker_task_id: number, blocked_task_id: number): Promise<{ id: number }> {
-		const res = await fetch(`${API_BASE_URL}/boards/${boardId}/dependencies`, {
+		const res = await authService.authFetch(`${API_BASE_URL}/boards/${boardId}/dependencies`, {
 			method: "POST",
 			headers: this.authHeaders(),
 			body: JSON.stringify({ blocker_task_id, blocked_task_id }),
@@ -192,7 +192,7 @@ class BoardService {
 	}
 
 	async deleteDependency(boardId: number, depId: number): Promise<void> {
-		const res = await fetch(`${API_BASE_URL}/boards/${boardId}/dependencies/${depId}`, { method: "DELETE", headers: this.authHeaders() });
+		const res = await authService.authFetch(`${API_BASE_URL}/boards/${boardId}/dependencies/${depId}`, { method: "DELETE", headers: this.authHeaders() });
 		if (!res.ok) {
 			throw new Error((await res.json()).message || "Failed to delete dependency");
 		}
@@ -200,7 +200,7 @@ class BoardService {
 
 	// Templates
 	async listBoardTemplates(): Promise<Array<{ id: string; name: string; statuses: string[]; priorities: string[] }>> {
-		const res = await fetch(`${API_BASE_URL}/boards/templates`, { headers: this.authHeaders() });
+		const res = await authService.authFetch(`${API_BASE_URL}/boards/templates`, { headers: this.authHeaders() });
 		if (!res.ok) {
 			throw new Error((await res.json()).message || "Failed to load templates");
 		}
@@ -209,19 +209,19 @@ class BoardService {
 
 	// Sprints (multiple per board)
 	async listSprints(boardId: number): Promise<Array<{ id: number; name?: string; start_date: string; end_date: string; goal?: string; is_active: boolean }>> {
-		const res = await fetch(`${API_BASE_URL}/boards/${boardId}/sprints`, { headers: this.authHeaders() });
+		const res = await authService.authFetch(`${API_BASE_URL}/boards/${boardId}/sprints`, { headers: this.authHeaders() });
 		if (!res.ok) { throw new Error((await res.json()).message || "Failed to fetch sprints"); }
 		return res.json();
 	}
 
 	async getActiveSprint(boardId: number): Promise<{ sprint: { id: number; name?: string; start_date: string; end_date: string; goal?: string; is_active: boolean } | null }> {
-		const res = await fetch(`${API_BASE_URL}/boards/${boardId}/sprints/active`, { headers: this.authHeaders() });
+		const res = await authService.authFetch(`${API_BASE_URL}/boards/${boardId}/sprints/active`, { headers: this.authHeaders() });
 		if (!res.ok) { throw new Error((await res.json()).message || "Failed to fetch active sprint"); }
 		return res.json();
 	}
 
 	async createSprint(boardId: number, payload: { name?: string; start_date: string; end_date: string; goal?: string; is_active?: boolean }): Promise<{ id: number }> {
-		const res = await fetch(`${API_BASE_URL}/boards/${boardId}/sprints`, {
+		const res = await authService.authFetch(`${API_BASE_URL}/boards/${boardId}/sprints`, {
 			method: "POST",
 			headers: this.authHeaders(),
 			body: JSON.stringify(payload),
@@ -231,7 +231,7 @@ class BoardService {
 	}
 
 	async updateSprint(boardId: number, sprintId: number, payload: Partial<{ name: string; start_date: string; end_date: string; goal: string; is_active: boolean }>): Promise<void> {
-		const res = await fetch(`${API_BASE_URL}/boards/${boardId}/sprints/${sprintId}`, {
+		const res = await authService.authFetch(`${API_BASE_URL}/boards/${boardId}/sprints/${sprintId}`, {
 			method: "PUT",
 			headers: this.authHeaders(),
 			body: JSON.stringify(payload),
@@ -240,19 +240,19 @@ class BoardService {
 	}
 
 	async deleteSprint(boardId: number, sprintId: number): Promise<void> {
-		const res = await fetch(`${API_BASE_URL}/boards/${boardId}/sprints/${sprintId}`, { method: "DELETE", headers: this.authHeaders() });
+		const res = await authService.authFetch(`${API_BASE_URL}/boards/${boardId}/sprints/${sprintId}`, { method: "DELETE", headers: this.authHeaders() });
 		if (!res.ok) { throw new Error((await res.json()).message || "Failed to delete sprint"); }
 	}
 
 	// Reports
 	async getBurnup(boardId: number): Promise<{ scope_total: number; completed_total: number; sprint_start?: string | null; sprint_end?: string | null }> {
-		const res = await fetch(`${API_BASE_URL}/boards/${boardId}/reports/burnup`, { headers: this.authHeaders() });
+		const res = await authService.authFetch(`${API_BASE_URL}/boards/${boardId}/reports/burnup`, { headers: this.authHeaders() });
 		if (!res.ok) { throw new Error((await res.json()).message || "Failed to load burn-up"); }
 		return res.json();
 	}
 
 	async getCFD(boardId: number): Promise<{ counts: Record<string, number> }> {
-		const res = await fetch(`${API_BASE_URL}/boards/${boardId}/reports/cfd`, { headers: this.authHeaders() });
+		const res = await authService.authFetch(`${API_BASE_URL}/boards/${boardId}/reports/cfd`, { headers: this.authHeaders() });
 		if (!res.ok) { throw new Error((await res.json()).message || "Failed to load CFD"); }
 		return res.json();
 	}
@@ -262,14 +262,14 @@ class BoardService {
 		const params = new URLSearchParams();
 		if (filters?.action) {params.append("action", filters.action);}
 		if (filters?.entity_type) {params.append("entity_type", filters.entity_type);}
-		const res = await fetch(`${API_BASE_URL}/boards/${boardId}/activity?${params.toString()}`, { headers: this.authHeaders() });
+		const res = await authService.authFetch(`${API_BASE_URL}/boards/${boardId}/activity?${params.toString()}`, { headers: this.authHeaders() });
 		if (!res.ok) { throw new Error((await res.json()).message || "Failed to load activity"); }
 		return res.json();
 	}
 
 	// Statuses
 	async listStatuses(boardId: number): Promise<BoardStatus[]> {
-		const res = await fetch(`${API_BASE_URL}/boards/${boardId}/statuses`, { headers: this.authHeaders() });
+		const res = await authService.authFetch(`${API_BASE_URL}/boards/${boardId}/statuses`, { headers: this.authHeaders() });
 		if (!res.ok) {
 			throw new Error((await res.json()).message || "Failed to fetch statuses");
 		}
@@ -277,7 +277,7 @@ class BoardService {
 	}
 
 	async createStatus(boardId: number, name: string, color?: string): Promise<BoardStatus> {
-		const res = await fetch(`${API_BASE_URL}/boards/${boardId}/statuses`, {
+		const res = await authService.authFetch(`${API_BASE_URL}/boards/${boardId}/statuses`, {
 			method: "POST",
 			headers: this.authHeaders(),
 			body: JSON.stringify({ name, color }),
@@ -289,7 +289,7 @@ class BoardService {
 	}
 
 	async updateStatus(boardId: number, statusId: number, payload: Partial<Pick<BoardStatus, "name" | "position" | "color">>): Promise<void> {
-		const res = await fetch(`${API_BASE_URL}/boards/${boardId}/statuses/${statusId}`, {
+		const res = await authService.authFetch(`${API_BASE_URL}/boards/${boardId}/statuses/${statusId}`, {
 			method: "PUT",
 			headers: this.authHeaders(),
 			body: JSON.stringify(payload),
@@ -300,7 +300,7 @@ class BoardService {
 	}
 
 	async deleteStatus(boardId: number, statusId: number): Promise<void> {
-		const res = await fetch(`${API_BASE_URL}/boards/${boardId}/statuses/${statusId}`, {
+		const res = await authService.authFetch(`${API_BASE_URL}/boards/${boardId}/statuses/${statusId}`, {
 			method: "DELETE",
 			headers: this.authHeaders(),
 		});
@@ -311,7 +311,7 @@ class BoardService {
 
 	// Priorities
 	async listPriorities(boardId: number): Promise<BoardPriority[]> {
-		const res = await fetch(`${API_BASE_URL}/boards/${boardId}/priorities`, { headers: this.authHeaders() });
+		const res = await authService.authFetch(`${API_BASE_URL}/boards/${boardId}/priorities`, { headers: this.authHeaders() });
 		if (!res.ok) {
 			throw new Error((await res.json()).message || "Failed to fetch priorities");
 		}
@@ -319,7 +319,7 @@ class BoardService {
 	}
 
 	async createPriority(boardId: number, name: string): Promise<BoardPriority> {
-		const res = await fetch(`${API_BASE_URL}/boards/${boardId}/priorities`, {
+		const res = await authService.authFetch(`${API_BASE_URL}/boards/${boardId}/priorities`, {
 			method: "POST",
 			headers: this.authHeaders(),
 			body: JSON.stringify({ name }),
@@ -331,7 +331,7 @@ class BoardService {
 	}
 
 	async updatePriority(boardId: number, priorityId: number, payload: Partial<Pick<BoardPriority, "name" | "position">>): Promise<void> {
-		const res = await fetch(`${API_BASE_URL}/boards/${boardId}/priorities/${priorityId}`, {
+		const res = await authService.authFetch(`${API_BASE_URL}/boards/${boardId}/priorities/${priorityId}`, {
 			method: "PUT",
 			headers: this.authHeaders(),
 			body: JSON.stringify(payload),
@@ -342,7 +342,7 @@ class BoardService {
 	}
 
 	async deletePriority(boardId: number, priorityId: number): Promise<void> {
-		const res = await fetch(`${API_BASE_URL}/boards/${boardId}/priorities/${priorityId}`, {
+		const res = await authService.authFetch(`${API_BASE_URL}/boards/${boardId}/priorities/${priorityId}`, {
 			method: "DELETE",
 			headers: this.authHeaders(),
 		});
@@ -17,7 +17,7 @@ class UserSettingsService {
 	}
 
 	async getDefaults(): Promise<UserDefaultsDTO> {
-		const res = await fetch(`${API_BASE_URL}/users/defaults`, { headers: this.authHeaders() });
+		const res = await authService.authFetch(`${API_BASE_URL}/users/defaults`, { headers: this.authHeaders() });
 		if (!res.ok) {
 			throw new Error((await res.json()).message || "Failed to fetch defaults");
 		}
@@ -25,7 +25,7 @@ class UserSettingsService {
 	}
 
 	async setDefaults(payload: UserDefaultsDTO): Promise<void> {
-		const res = await fetch(`${API_BASE_URL}/users/defaults`, {
+		const res = await authService.authFetch(`${API_BASE_URL}/users/defaults`, {
 			method: "PUT",
 			headers: this.authHeaders(),
 			body: JSON.stringify(payload),
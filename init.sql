@@ -7,7 +7,32 @@ CREATE TABLE IF NOT EXISTS users (
     username VARCHAR(50) NOT NULL UNIQUE,
     password VARCHAR(255) NOT NULL,
     email VARCHAR(255) NOT NULL UNIQUE,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    deleted_at DATETIME NULL
+);
+
+-- Rotating refresh tokens (SHA-256 of the token only); session_id groups the rotations of one login
+CREATE TABLE IF NOT EXISTS refresh_tokens (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    user_id INT NOT NULL,
+    session_id INT NULL,
+    token_hash VARCHAR(64) NOT NULL UNIQUE,
+    expires_at DATETIME NOT NULL,
+    used_at DATETIME NULL,
+    revoked_at DATETIME NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    INDEX ix_refresh_tokens_user_id (user_id),
+    INDEX ix_refresh_tokens_session_id (session_id),
+    CONSTRAINT fk_refresh_tokens_user FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
+
+-- Revoked sessions/users, polled by every API process (no FK: outlives deleted users)
+CREATE TABLE IF NOT EXISTS token_revocations (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    user_id INT NULL,
+    session_id INT NULL,
+    revoked_at DATETIME NOT NULL,
+    INDEX ix_token_revocations_revoked_at (revoked_at)
 );
 
 -- Boards table
@@ -19,8 +44,11 @@ CREATE TABLE IF NOT EXISTS boards (
     background_color VARCHAR(20) NULL,
     sprint_start DATE NULL,
     sprint_end DATE NULL,
+    version INT NOT NULL DEFAULT 0,
+    vocabulary_version INT NOT NULL DEFAULT 0,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    deleted_at DATETIME NULL,
     FOREIGN KEY (owner_id) REFERENCES users(id)
 );
 
@@ -43,7 +71,7 @@ CREATE TABLE IF NOT EXISTS board_tasks (
     id INT AUTO_INCREMENT PRIMARY KEY,
     title VARCHAR(255) NOT NULL,
     description TEXT,
-    status VARCHAR(50) DEFAULT 'todo',
+    status_id INT NULL,
     priority VARCHAR(50) DEFAULT 'medium',
     board_id INT,
     sprint_id INT NULL,
@@ -52,7 +80,7 @@ CREATE TABLE IF NOT EXISTS board_tasks (
     due_date DATE,
     estimate INT NULL,
     effort_used INT NULL DEFAULT 0,
-    labels VARCHAR(255) NULL,
+    labels TEXT NULL,
     position INT DEFAULT 0,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
@@ -60,11 +88,12 @@ CREATE TABLE IF NOT EXISTS board_tasks (
     CONSTRAINT fk_task_sprint FOREIGN KEY (sprint_id) REFERENCES board_sprints(id) ON DELETE SET NULL,
     FOREIGN KEY (assigned_to) REFERENCES users(id),
     FOREIGN KEY (created_by) REFERENCES users(id),
-    INDEX idx_board_column (board_id, status, position)
+    INDEX idx_board_column (board_id, status_id, position)
 );
 
 -- Optional index for ordering queries by status/position (script runs once on fresh DB)
-CREATE INDEX idx_board_tasks_board_status_position ON board_tasks (board_id, status, position);
+CREATE INDEX idx_board_tasks_board_status_id_position ON board_tasks (board_id, status_id, position);
+CREATE INDEX idx_board_tasks_assignee_due ON board_tasks (assigned_to, due_date, id);
 
 -- Board statuses table (custom per board)
 CREATE TABLE IF NOT EXISTS board_statuses (
@@ -77,6 +106,9 @@ CREATE TABLE IF NOT EXISTS board_statuses (
     CONSTRAINT fk_status_board FOREIGN KEY (board_id) REFERENCES boards(id) ON DELETE CASCADE
 );
 
+-- Tasks reference their status column by id (board_statuses is created after board_tasks)
+ALTER TABLE board_tasks ADD CONSTRAINT fk_task_status FOREIGN KEY (status_id) REFERENCES board_statuses(id) ON DELETE SET NULL;
+
 -- Board priorities table (custom per board)
 CREATE TABLE IF NOT EXISTS board_priorities (
     id INT AUTO_INCREMENT PRIMARY KEY,
@@ -103,8 +135,8 @@ CREATE TABLE IF NOT EXISTS board_members (
 CREATE TABLE IF NOT EXISTS user_defaults (
     id INT AUTO_INCREMENT PRIMARY KEY,
     user_id INT NOT NULL UNIQUE,
-    default_statuses TEXT,
-    default_priorities TEXT,
+    default_statuses JSON,
+    default_priorities JSON,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     CONSTRAINT fk_user_defaults_user FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
 );
@@ -129,6 +161,41 @@ CREATE INDEX idx_task_deps_board ON task_dependencies (board_id);
 CREATE INDEX idx_task_deps_blocker ON task_dependencies (blocker_task_id);
 CREATE INDEX idx_task_deps_blocked ON task_dependencies (blocked_task_id);
 
+-- Normalised labels; board_tasks.labels keeps the CSV form returned by the API
+CREATE TABLE IF NOT EXISTS board_labels (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    board_id INT NOT NULL,
+    name VARCHAR(50) NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE KEY uq_board_label_name (board_id, name),
+    CONSTRAINT fk_label_board FOREIGN KEY (board_id) REFERENCES boards(id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS task_labels (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    board_id INT NOT NULL,
+    task_id INT NOT NULL,
+    label_id INT NOT NULL,
+    UNIQUE KEY uq_task_label (task_id, label_id),
+    INDEX idx_task_labels_board_label_task (board_id, label_id, task_id),
+    CONSTRAINT fk_task_label_board FOREIGN KEY (board_id) REFERENCES boards(id) ON DELETE CASCADE,
+    CONSTRAINT fk_task_label_task FOREIGN KEY (task_id) REFERENCES board_tasks(id) ON DELETE CASCADE,
+    CONSTRAINT fk_task_label_label FOREIGN KEY (label_id) REFERENCES board_labels(id) ON DELETE CASCADE
+);
+
+-- Task search index: one row per distinct term of a task's title, description and labels
+CREATE TABLE IF NOT EXISTS task_search_terms (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    task_id INT NOT NULL,
+    board_id INT NOT NULL,
+    term VARCHAR(64) NOT NULL,
+    weight INT NOT NULL DEFAULT 1,
+    UNIQUE KEY uq_task_search_term (task_id, term),
+    INDEX idx_task_search_board_term (board_id, term),
+    CONSTRAINT fk_search_task FOREIGN KEY (task_id) REFERENCES board_tasks(id) ON DELETE CASCADE,
+    CONSTRAINT fk_search_board FOREIGN KEY (board_id) REFERENCES boards(id) ON DELETE CASCADE
+);
+
 -- Activity / Audit logs
 CREATE TABLE IF NOT EXISTS activity_logs (
     id INT AUTO_INCREMENT PRIMARY KEY,
@@ -142,4 +209,45 @@ CREATE TABLE IF NOT EXISTS activity_logs (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     CONSTRAINT fk_act_board FOREIGN KEY (board_id) REFERENCES boards(id) ON DELETE CASCADE,
     CONSTRAINT fk_act_user FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE SET NULL
-);
\ No newline at end of file
+);
+
+-- Velocity summary recorded when a sprint is completed
+CREATE TABLE IF NOT EXISTS sprint_summaries (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    board_id INT NOT NULL,
+    sprint_id INT NULL UNIQUE,
+    name VARCHAR(100) NULL,
+    start_date DATE NOT NULL,
+    end_date DATE NOT NULL,
+    committed_tasks INT NOT NULL DEFAULT 0,
+    completed_tasks INT NOT NULL DEFAULT 0,
+    carried_over_tasks INT NOT NULL DEFAULT 0,
+    committed_points INT NOT NULL DEFAULT 0,
+    completed_points INT NOT NULL DEFAULT 0,
+    effort_used INT NOT NULL DEFAULT 0,
+    next_sprint_id INT NULL,
+    completed_by INT NULL,
+    completed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT fk_summary_board FOREIGN KEY (board_id) REFERENCES boards(id) ON DELETE CASCADE,
+    CONSTRAINT fk_summary_sprint FOREIGN KEY (sprint_id) REFERENCES board_sprints(id) ON DELETE SET NULL,
+    CONSTRAINT fk_summary_next_sprint FOREIGN KEY (next_sprint_id) REFERENCES board_sprints(id) ON DELETE SET NULL,
+    CONSTRAINT fk_summary_user FOREIGN KEY (completed_by) REFERENCES users(id) ON DELETE SET NULL
+);
+CREATE INDEX idx_sprint_summaries_board_end ON sprint_summaries (board_id, end_date);
+
+-- Background purge jobs for soft-deleted boards and users
+CREATE TABLE IF NOT EXISTS deletion_jobs (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    entity_type VARCHAR(20) NOT NULL,
+    entity_id INT NOT NULL,
+    requested_by INT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'pending',
+    current_step VARCHAR(50) NULL,
+    rows_deleted INT NOT NULL DEFAULT 0,
+    attempts INT NOT NULL DEFAULT 0,
+    error TEXT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    finished_at DATETIME NULL
+);
+CREATE INDEX idx_deletion_jobs_status ON deletion_jobs (status, id);